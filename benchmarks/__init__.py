@@ -0,0 +1 @@
+"""Micro-benchmarks for the engine hot paths (not part of the installed package)."""
@@ -0,0 +1,127 @@
+"""Three-leg order cycles/second against a local HTTP stand-in for the Binance order endpoint.
+
+Compares the ccxt-style path (fresh connection, urlencode and a new HMAC per request,
+legs one after another) with ``BinanceRestClient`` (warm keep-alive pool, precomputed
+HMAC, cached quantity formats, legs sent concurrently).
+
+Run with ``python -m benchmarks.rest_orders [--cycles N] [--delay-ms MS]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+import urllib.parse
+from typing import Awaitable, Callable, Dict, List
+
+import aiohttp
+from aiohttp import web
+
+from triarb.exchange.binance_rest import BinanceRestClient
+from triarb.exchange.markets import MarketInfo, MarketRegistry
+
+KEY = "bench-key"
+SECRET = "bench-secret"
+LEGS = [
+    {"symbol": "BTC/USDT", "side": "buy", "type": "market", "amount": 0.0123456},
+    {"symbol": "ETH/BTC", "side": "sell", "type": "market", "amount": 0.31415926},
+    {"symbol": "ETH/USDT", "side": "sell", "type": "market", "amount": 0.31415926},
+]
+REGISTRY = MarketRegistry(
+    [
+        MarketInfo("BTC/USDT", "BTC", "USDT", 0.001, 0.01, 0.00001),
+        MarketInfo("ETH/BTC", "ETH", "BTC", 0.001, 0.00001, 0.0001),
+        MarketInfo("ETH/USDT", "ETH", "USDT", 0.001, 0.01, 0.0001),
+    ]
+)
+
+
+def stand_in_app(delay_ms: float = 0.0) -> web.Application:
+    """Answers ping and signed order requests the way Binance does with ``newOrderRespType=ACK``."""
+    order_ids = iter(range(1, 1 << 62))
+
+    async def ping(request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    async def order(request: web.Request) -> web.Response:
+        form = await request.post()
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        return web.json_response(
+            {"symbol": form.get("symbol"), "orderId": next(order_ids), "transactTime": int(time.time() * 1000)}
+        )
+
+    app = web.Application()
+    app.router.add_get("/api/v3/ping", ping)
+    app.router.add_post("/api/v3/order", order)
+    return app
+
+
+async def legacy_cycle(base_url: str) -> List[Dict]:
+    # One connection per request, params encoded and signed from scratch, legs in sequence.
+    results = []
+    for leg in LEGS:
+        params = {
+            "symbol": leg["symbol"].replace("/", ""),
+            "side": leg["side"].upper(),
+            "type": "MARKET",
+            "quantity": REGISTRY.round_qty(leg["symbol"], leg["amount"]),
+            "timestamp": int(time.time() * 1000),
+            "recvWindow": 5000,
+        }
+        query = urllib.parse.urlencode(params)
+        signature = hmac.new(SECRET.encode(), query.encode(), hashlib.sha256).hexdigest()
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(force_close=True)) as session:
+            async with session.post(
+                base_url + "/api/v3/order",
+                data=f"{query}&signature={signature}",
+                headers={"X-MBX-APIKEY": KEY, "Content-Type": "application/x-www-form-urlencoded"},
+            ) as resp:
+                results.append(json.loads(await resp.read()))
+    return results
+
+
+async def measure(cycle: Callable[[], Awaitable], cycles: int) -> float:
+    await cycle()  # warm-up
+    start = time.perf_counter()
+    for _ in range(cycles):
+        await cycle()
+    return cycles / (time.perf_counter() - start)
+
+
+async def run(cycles: int, delay_ms: float) -> dict:
+    runner = web.AppRunner(stand_in_app(delay_ms))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    base_url = f"http://127.0.0.1:{port}"
+    client = BinanceRestClient(KEY, SECRET, base_url, REGISTRY)
+    try:
+        await client.warm(len(LEGS))
+        results = {"legacy": await measure(lambda: legacy_cycle(base_url), cycles)}
+        results["rest_client"] = await measure(lambda: client.create_orders(LEGS), cycles)
+    finally:
+        await client.close()
+        await runner.cleanup()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cycles", type=int, default=500)
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="simulated matching time per order")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.cycles, args.delay_ms))
+    baseline = results["legacy"]
+    for name, rate in results.items():
+        print(f"{name:<14} {rate:>10,.0f} cycles/s  x{rate / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
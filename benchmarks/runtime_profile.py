@@ -0,0 +1,163 @@
+"""Evaluation-latency percentiles with ``PERFORMANCE_PROFILE=off`` vs ``latency``.
+
+Each profile runs in a fresh interpreter: GC state and the event loop are process-wide.
+The worker builds a ``SyntheticMarket`` universe, keeps a large long-lived heap around
+(standing in for ccxt market metadata), then feeds wire-format frames in bursts through
+``FrameDecoder`` and ``OrderBookStore.upsert`` into an event-driven ``SignalEngine``. The
+latency of one update is decode + store + re-scoring its triangles; automatic collections
+triggered by its allocations land inside it. Every update also leaves a small reference
+cycle behind (as futures and exception tracebacks do) and a small record that stays
+alive (as journals and caches do), so the old generation keeps growing and full
+collections come due. ``burst lag`` is how late a burst started, which is where
+collections moved out of the hot path show up.
+
+Run with ``python -m benchmarks.runtime_profile [--seconds N] [--rate N] [--bases N]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from array import array
+from typing import Dict, List
+
+PROFILES = ("off", "latency")
+
+
+def percentile(sorted_values: List[int], q: float) -> float:
+    return float(sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))])
+
+
+async def feed(args: argparse.Namespace) -> Dict[str, float]:
+    from triarb.engine.signals import SignalEngine
+    from triarb.marketdata.decoder import FrameDecoder
+    from triarb.marketdata.orderbook import OrderBookStore
+    from triarb.marketdata.synthetic import SyntheticMarket
+    from triarb.metrics import METRICS
+    from triarb.runtime import IdleCollector, apply_profile, track_gc_pauses
+    from triarb.utils.ring import RingBuffer
+
+    market = SyntheticMarket(args.bases, seed=args.bases)
+    store = market.populate(OrderBookStore())
+    engine = SignalEngine(market.triangles, store)
+    engine.journal = RingBuffer(1024)
+    engine.listen()
+    decoder = FrameDecoder(market.symbols)
+    heap = [{"id": idx, "limits": {"amount": [idx, None]}, "info": [str(idx)]} for idx in range(args.heap)]
+    burst = max(1, int(args.rate * args.burst_ms / 1000))
+    total = int(args.rate * args.seconds)
+    frames = list(market.frames(total))
+
+    applied = apply_profile(args.worker, args.cpus)
+    track_gc_pauses()  # after the startup collection in apply_profile
+    collector = None
+    if args.worker == "latency":
+        collector = IdleCollector(activity=lambda: store.updates, interval_ms=2)
+        collector.start()
+
+    samples = array("q", bytes(8 * total))
+    lags: List[float] = []
+    history: List[object] = []
+    perf = time.perf_counter_ns
+    upsert, decode = store.upsert, decoder.decode
+    pending: Dict[str, object] = {}
+    next_burst = time.perf_counter()
+    for start in range(0, total, burst):
+        lags.append(time.perf_counter() - next_burst)
+        for idx in range(start, min(start + burst, total)):
+            t0 = perf()
+            update = decode(frames[idx])
+            upsert(update.symbol, update.bids, update.asks)
+            samples[idx] = perf() - t0
+            churn: Dict[str, object] = {"frame": idx}
+            churn["self"] = churn
+            pending[update.symbol] = churn
+            history.append([idx, update.symbol])
+        next_burst += args.burst_ms / 1000
+        await asyncio.sleep(max(0.0, next_burst - time.perf_counter()))
+        pending.clear()
+    if collector is not None:
+        await collector.close()
+    engine.close()
+
+    ordered = sorted(samples)
+    lags.sort()
+    pauses = METRICS.stages["gc_pause"]
+    return {
+        "runtime": applied,
+        "heap_objects": len(heap),
+        "updates": total,
+        "p50_us": percentile(ordered, 0.5) / 1e3,
+        "p99_us": percentile(ordered, 0.99) / 1e3,
+        "p999_us": percentile(ordered, 0.999) / 1e3,
+        "max_us": ordered[-1] / 1e3,
+        "lag_p99_ms": lags[int(0.99 * len(lags))] * 1e3,
+        "lag_max_ms": lags[-1] * 1e3,
+        "gc_runs": pauses.count,
+        "gc_pause_max_us": _max_bucket_us(pauses),
+    }
+
+
+def _max_bucket_us(hist) -> float:
+    from triarb.metrics import BUCKETS_NS
+
+    for bound, count in reversed(list(zip(BUCKETS_NS + (float("inf"),), hist.counts))):
+        if count:
+            return bound / 1e3
+    return 0.0
+
+
+def worker(args: argparse.Namespace) -> None:
+    from triarb.runtime import run_engine
+
+    result: Dict[str, float] = {}
+
+    async def main() -> None:
+        result.update(await feed(args))
+
+    run_engine(main(), args.worker)
+    print(json.dumps(result))
+
+
+def run(args: argparse.Namespace) -> Dict[str, dict]:
+    results = {}
+    for profile in PROFILES:
+        command = [sys.executable, "-m", "benchmarks.runtime_profile", "--worker", profile]
+        for name in ("seconds", "rate", "burst_ms", "bases", "heap", "cpus"):
+            command += [f"--{name.replace('_', '-')}", str(getattr(args, name))]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        results[profile] = json.loads(output.strip().splitlines()[-1])
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--rate", type=int, default=20_000, help="book updates per second")
+    parser.add_argument("--burst-ms", type=float, default=10)
+    parser.add_argument("--bases", type=int, default=100)
+    parser.add_argument("--heap", type=int, default=100_000, help="long-lived objects held from startup")
+    parser.add_argument("--cpus", default="", help="CPU_AFFINITY for the latency profile")
+    parser.add_argument("--worker", choices=PROFILES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+    results = run(args)
+    header = f"{'profile':<9} {'p50':>8} {'p99':>8} {'p99.9':>8} {'max':>9} {'gc runs':>8} {'gc max':>9}"
+    print(f"{header} {'burst lag p99/max':>18}  runtime")
+    for profile, row in results.items():
+        print(
+            f"{profile:<9} {row['p50_us']:>6.1f}us {row['p99_us']:>6.1f}us {row['p999_us']:>6.1f}us "
+            f"{row['max_us']:>7.0f}us {row['gc_runs']:>8} {row['gc_pause_max_us']:>7.0f}us "
+            f"{row['lag_p99_ms']:>8.1f}/{row['lag_max_ms']:.1f}ms  {' '.join(row['runtime'])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
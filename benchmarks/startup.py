@@ -0,0 +1,64 @@
+"""Cold import times of the engine entry points, each measured in a fresh interpreter.
+
+Prints the median wall time per module, then the slowest imports under ``triarb.main``
+from ``python -X importtime``. Phase timings of a running engine are logged separately as
+``engine.startup`` and exported as ``triarb_startup_seconds``.
+
+Run with ``python -m benchmarks.startup [--runs N] [--top N]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Sequence, Tuple
+
+MODULES = ["triarb", "triarb.config", "triarb.metrics", "triarb.marketdata.aggregator", "triarb.main"]
+
+
+def cold_import_seconds(module: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def import_profile(module: str) -> List[Tuple[str, int]]:
+    """(module, cumulative microseconds) for every import ``module`` triggers, slowest first."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], check=True, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        rows.append((name.strip(), int(cumulative)))
+    return sorted(rows, key=lambda row: row[1], reverse=True)
+
+
+def run(modules: Sequence[str], runs: int) -> Dict[str, float]:
+    baseline = cold_import_seconds("sys", runs)  # interpreter start-up alone
+    return {module: cold_import_seconds(module, runs) - baseline for module in modules}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for module, seconds in run(MODULES, args.runs).items():
+        print(f"{module:<32} {seconds * 1e3:>8.1f} ms")
+    print()
+    for name, micros in import_profile("triarb.main")[: args.top]:
+        print(f"{name:<48} {micros / 1e3:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Hot-path benchmark suite driven by the deterministic ``SyntheticMarket`` generator.
+
+Run ``python -m benchmarks.suite run --output bench.json`` and compare two runs with
+``python -m benchmarks.suite compare before.json after.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+from triarb.engine.batch import BatchSignalEngine
+from triarb.engine.executor import Executor
+from triarb.engine.risk import RiskManager
+from triarb.engine.signals import Opportunity, SignalEngine
+from triarb.marketdata.decoder import FrameDecoder
+from triarb.marketdata.orderbook import OrderBook, OrderBookStore
+from triarb.marketdata.synthetic import SyntheticMarket
+
+DEFAULT_SIZES = (3, 20, 100, 300)
+LEVELS = 5
+
+
+class NullAdapter:
+    def fee_rate(self, symbol: str) -> float:
+        return 0.0004
+
+    async def create_bulk_orders(self, orders):
+        return orders
+
+
+def measure(fn: Callable[[Any], Any], items: Sequence[Any], repeat: int) -> Dict[str, float]:
+    """Time ``fn`` over ``items`` ``repeat`` times and report nanoseconds per call."""
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for item in items:
+            fn(item)
+        samples.append((time.perf_counter_ns() - start) / len(items))
+    best = min(samples)
+    return {
+        "ns_per_op": round(best, 1),
+        "ns_per_op_median": round(statistics.median(samples), 1),
+        "ops_per_sec": round(1e9 / best, 1) if best else 0.0,
+        "calls": len(items),
+        "repeat": repeat,
+    }
+
+
+def bench_universe(bases: int, repeat: int, updates: int) -> List[Dict[str, Any]]:
+    market = SyntheticMarket(bases, levels=LEVELS, seed=bases)
+    store = market.populate(OrderBookStore(depth=LEVELS))
+    triangles = market.triangles
+    results: List[Dict[str, Any]] = []
+
+    def record(name: str, stats: Dict[str, float], **extra: Any) -> None:
+        results.append({"name": name, "bases": bases, **extra, **stats})
+
+    sample = list(market.updates(updates))
+    books = {symbol: OrderBook(symbol, LEVELS) for symbol in market.symbols}
+    record(
+        "orderbook.update",
+        measure(lambda u: books[u[0]].update(u[1], u[2]), sample, repeat),
+        symbols=len(market.symbols),
+    )
+    record("store.best_bid_ask", measure(store.best_bid_ask, market.symbols, repeat), symbols=len(market.symbols))
+
+    passes = [None] * max(1, min(200, 20_000 // len(triangles)))
+    scalar = SignalEngine(triangles, store)
+    record("signal.evaluate[scalar]", measure(lambda _: scalar.evaluate(), passes, repeat), triangles=len(triangles))
+    batch = BatchSignalEngine(triangles, store)
+    record("signal.evaluate[numpy]", measure(lambda _: batch.evaluate(), passes, repeat), triangles=len(triangles))
+    touched = [symbol for symbol, _, _ in sample[:1000]]
+    record(
+        "signal.evaluate_symbol[scalar]",
+        measure(scalar.evaluate_symbol, touched, repeat),
+        triangles=len(triangles),
+    )
+
+    executor = Executor(NullAdapter(), store, RiskManager())
+    opportunities = [
+        Opportunity(triangle=triangle, gross_bps=50.0, net_bps=35.0, notional_quote=1_000.0)
+        for triangle in triangles[:1000]
+    ]
+    record("executor.build_instructions", measure(executor._build_instructions, opportunities, repeat))
+
+    frames = list(market.frames(updates))
+    decoder = FrameDecoder(market.symbols, depth=LEVELS)
+    record("ws.decode", measure(decoder.decode, frames, repeat))
+    return results
+
+
+def run(args: argparse.Namespace) -> None:
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results: List[Dict[str, Any]] = []
+    for bases in sizes:
+        results.extend(bench_universe(bases, args.repeat, args.updates))
+        print(f"bases={bases} done", file=sys.stderr)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "timestamp": int(time.time()),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+
+def compare(args: argparse.Namespace) -> None:
+    def load(path: str) -> Dict[tuple, Dict[str, Any]]:
+        with open(path) as fh:
+            return {(row["name"], row["bases"]): row for row in json.load(fh)["results"]}
+
+    before, after = load(args.before), load(args.after)
+    print(f"{'benchmark':<34} {'bases':>5} {'before ns':>12} {'after ns':>12} {'change':>8}")
+    for key in sorted(before.keys() & after.keys(), key=lambda k: (k[1], k[0])):
+        old, new = before[key]["ns_per_op"], after[key]["ns_per_op"]
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"{key[0]:<34} {key[1]:>5} {old:>12,.0f} {new:>12,.0f} {change:>+7.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="run the suite and emit JSON results")
+    run_parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES))
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--updates", type=int, default=5_000)
+    run_parser.add_argument("--output", help="write results to this file instead of stdout")
+    run_parser.set_defaults(func=run)
+    compare_parser = sub.add_parser("compare", help="diff two result files")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.set_defaults(func=compare)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Messages/second of WebSocket frame decoding: legacy inline path vs ``FrameDecoder``.
+
+Run with ``python -m benchmarks.ws_decode [--frames N] [--levels N]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Callable, List
+
+from triarb.marketdata.decoder import FrameDecoder, resolve_loads, symbol_map
+
+SYMBOLS = ["BTC/USDT", "ETH/USDT", "BNB/USDT", "ETH/BTC", "BNB/BTC", "BNB/ETH"]
+
+
+def make_frames(count: int, levels: int, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    frames = []
+    for idx in range(count):
+        symbol = SYMBOLS[idx % len(SYMBOLS)]
+        mid = rng.uniform(10, 1000)
+        raw = symbol.replace("/", "")
+        payload = {
+            "e": "depthUpdate",
+            "E": 1_700_000_000_000 + idx,
+            "s": raw,
+            "U": idx * 10,
+            "u": idx * 10 + 9,
+            "b": [[f"{mid - i * 0.01:.8f}", f"{rng.uniform(0, 5):.8f}"] for i in range(levels)],
+            "a": [[f"{mid + 0.01 + i * 0.01:.8f}", f"{rng.uniform(0, 5):.8f}"] for i in range(levels)],
+        }
+        frames.append(json.dumps({"stream": f"{raw.lower()}@depth@100ms", "data": payload}))
+    return frames
+
+
+def legacy_decode(message: str):
+    data = json.loads(message)
+    payload = data.get("data", {})
+    symbol = payload.get("s")
+    if not symbol:
+        return None
+    bids = [(float(p), float(q)) for p, q in payload.get("b", [])]
+    asks = [(float(p), float(q)) for p, q in payload.get("a", [])]
+    return symbol_map(symbol), bids, asks
+
+
+def measure(decode: Callable, frames: List[str], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            decode(frame)
+        best = min(best, time.perf_counter() - start)
+    return len(frames) / best
+
+
+def run(frames: int, levels: int) -> dict:
+    data = make_frames(frames, levels)
+    results = {"legacy": measure(legacy_decode, data)}
+    results["decoder[json]"] = measure(FrameDecoder(SYMBOLS, loads=json.loads).decode, data)
+    try:
+        results["decoder[orjson]"] = measure(FrameDecoder(SYMBOLS, loads=resolve_loads("orjson")).decode, data)
+    except ImportError:
+        pass
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=50_000)
+    parser.add_argument("--levels", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run(args.frames, args.levels)
+    baseline = results["legacy"]
+    for name, rate in results.items():
+        print(f"{name:<18} {rate:>12,.0f} msg/s  x{rate / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ setlocal enabledelayedexpansion
 
 if "%~1"=="" (
   echo Usage: make ^<target^>
-  echo Available targets: install format lint test run api migrate
+  echo Available targets: install format lint test bench run api migrate retention mock
   exit /b 1
 )
 
@@ -40,6 +40,11 @@ if /I "%TARGET%"=="test" (
   exit /b !errorlevel!
 )
 
+if /I "%TARGET%"=="bench" (
+  call %POETRY_CMD% run python -m benchmarks.suite run --output bench.json %*
+  exit /b !errorlevel!
+)
+
 if /I "%TARGET%"=="run" (
   call %POETRY_CMD% run python -m triarb.main %*
   exit /b !errorlevel!
@@ -57,5 +62,15 @@ if /I "%TARGET%"=="migrate" (
   exit /b !errorlevel!
 )
 
+if /I "%TARGET%"=="retention" (
+  call %POETRY_CMD% run python -m triarb.data.retention %*
+  exit /b !errorlevel!
+)
+
+if /I "%TARGET%"=="mock" (
+  call %POETRY_CMD% run python -m triarb.exchange.mock %*
+  exit /b !errorlevel!
+)
+
 echo Unknown target "%TARGET%"
 exit /b 1
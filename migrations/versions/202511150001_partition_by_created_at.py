@@ -0,0 +1,96 @@
+"""range-partition opportunities and trades by created_at
+
+Revision ID: 202511150001
+Revises: 202510260001
+Create Date: 2025-11-15 09:12:00.000000
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from alembic import op
+
+
+revision = "202511150001"
+down_revision = "202510260001"
+branch_labels = None
+depends_on = None
+
+PREMAKE_DAYS = 7
+
+COLUMNS = {
+    "opportunities": """
+        id BIGINT NOT NULL DEFAULT nextval('opportunities_id_seq_p'),
+        triangle_hash VARCHAR(128) NOT NULL,
+        gross_bps DOUBLE PRECISION NOT NULL,
+        net_bps DOUBLE PRECISION NOT NULL,
+        notional_quote DOUBLE PRECISION NOT NULL,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+    """,
+    "trades": """
+        id BIGINT NOT NULL DEFAULT nextval('trades_id_seq_p'),
+        opportunity_id BIGINT NOT NULL,
+        details JSON NOT NULL,
+        pnl_quote DOUBLE PRECISION NOT NULL DEFAULT 0,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+    """,
+}
+LOOKUP_INDEXES = {
+    "opportunities": ("ix_opportunities_triangle_hash", "triangle_hash"),
+    "trades": ("ix_trades_opportunity_id", "opportunity_id"),
+}
+
+
+def upgrade() -> None:
+    today = datetime.utcnow().date()
+    for table, columns in COLUMNS.items():
+        index, column = LOOKUP_INDEXES[table]
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+        op.execute(f"ALTER INDEX {index} RENAME TO {index}_legacy")
+        op.execute(f"ALTER INDEX {table}_pkey RENAME TO {table}_pkey_legacy")
+        op.execute(f"CREATE SEQUENCE {table}_id_seq_p AS BIGINT")
+        op.execute(
+            f"CREATE TABLE {table} ({columns}, "
+            f"PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"
+        )
+        op.execute(f"ALTER SEQUENCE {table}_id_seq_p OWNED BY {table}.id")
+        # Block-range index: a few pages per partition instead of one entry per row.
+        op.execute(f"CREATE INDEX ix_{table}_created_at ON {table} USING brin (created_at)")
+        op.execute(f"CREATE INDEX {index} ON {table} ({column})")
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        for offset in range(-1, PREMAKE_DAYS + 1):
+            day = today + timedelta(days=offset)
+            op.execute(
+                f"CREATE TABLE {table}_p{day:%Y%m%d} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+            )
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_legacy")
+        op.execute(
+            f"SELECT setval('{table}_id_seq_p', COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)"
+        )
+        op.execute(f"DROP TABLE {table}_legacy")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq_p RENAME TO {table}_id_seq")
+
+
+def downgrade() -> None:
+    for table in COLUMNS:
+        index, column = LOOKUP_INDEXES[table]
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+        op.execute(f"ALTER INDEX {index} RENAME TO {index}_partitioned")
+        op.execute(f"ALTER INDEX {table}_pkey RENAME TO {table}_pkey_partitioned")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq RENAME TO {table}_id_seq_p")
+        op.execute(f"CREATE TABLE {table} (LIKE {table}_partitioned)")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_partitioned")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id TYPE INTEGER")
+        op.execute(f"CREATE SEQUENCE {table}_id_seq AS INTEGER OWNED BY {table}.id")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')")
+        op.execute(
+            f"SELECT setval('{table}_id_seq', COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)"
+        )
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET DEFAULT now()")
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+        op.execute(f"CREATE INDEX {index} ON {table} ({column})")
+        op.execute(f"DROP TABLE {table}_partitioned CASCADE")
+    op.execute("ALTER TABLE trades ALTER COLUMN opportunity_id TYPE INTEGER")
+    op.execute("ALTER TABLE trades ALTER COLUMN pnl_quote SET DEFAULT 0")
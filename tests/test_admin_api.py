@@ -0,0 +1,131 @@
+import asyncio
+
+import httpx
+
+from triarb.api.server import EmbeddedAdminServer, create_app
+from triarb.api.state import EngineState
+from triarb.engine.executor import Executor
+from triarb.engine.risk import RiskManager
+from triarb.engine.signals import Opportunity
+from triarb.engine.triangle import Triangle, TriangleLeg
+from triarb.marketdata.orderbook import OrderBookStore
+from triarb.utils.ring import RingBuffer
+
+TRIANGLE = Triangle(
+    (
+        TriangleLeg("BTC/USDT", "USDT", "BTC"),
+        TriangleLeg("ETH/BTC", "BTC", "ETH"),
+        TriangleLeg("ETH/USDT", "ETH", "USDT"),
+    )
+)
+
+
+def _opp(net: float) -> Opportunity:
+    return Opportunity(triangle=TRIANGLE, gross_bps=net + 15, net_bps=net, notional_quote=1000)
+
+
+def _client(state):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(state)), base_url="http://admin")
+
+
+def test_ring_buffer_overwrites_oldest_and_tracks_cursor():
+    ring = RingBuffer(3)
+    for value in range(5):
+        ring.append(value)
+    assert ring.latest() == [4, 3, 2]
+    assert ring.latest(2) == [4, 3]
+    assert ring.since(0) == (5, [2, 3, 4])
+    assert ring.since(4) == (5, [4])
+
+
+async def test_endpoints_read_engine_state():
+    store = OrderBookStore()
+    store.upsert("BTC/USDT", [(100.0, 1.0), (99.0, 2.0)], [(101.0, 1.0)])
+    store.symbol_id("ETH/USDT")
+    state = EngineState.create(store, 8)
+    state.add_stats("open_cycles", lambda: 0)
+    state.opportunities.append(_opp(10))
+    state.opportunities.append(_opp(20))
+
+    async with _client(state) as client:
+        tops = (await client.get("/books")).json()
+        book = (await client.get("/books/btc/usdt", params={"depth": 1})).json()
+        recent = (await client.get("/opportunities/recent", params={"limit": 1})).json()
+        stats = (await client.get("/stats")).json()
+        missing = await client.get("/books/XRP/USDT")
+
+    assert tops == {"BTC/USDT": {"bid": 100.0, "ask": 101.0}, "ETH/USDT": {"bid": None, "ask": None}}
+    assert book == {"symbol": "BTC/USDT", "bids": [[100.0, 1.0]], "asks": [[101.0, 1.0]]}
+    assert [opp["net_bps"] for opp in recent] == [20]
+    assert stats["opportunities_seen"] == 2 and stats["open_cycles"] == 0
+    assert missing.status_code == 404
+
+
+async def test_engine_endpoints_unavailable_without_state():
+    async with _client(None) as client:
+        assert (await client.get("/health")).status_code == 200
+        assert (await client.get("/books")).status_code == 503
+
+
+async def test_executor_journals_cycles():
+    class Adapter:
+        def fee_rate(self, symbol):
+            return 0.0
+
+        async def create_bulk_orders(self, orders):
+            return [{"id": "x"} for _ in orders]
+
+    store = OrderBookStore()
+    executor = Executor(Adapter(), store, RiskManager())
+    executor.journal = RingBuffer(4)
+    await executor.execute(_opp(20))  # no books: rejected while building
+    for symbol, price in (("BTC/USDT", 100.0), ("ETH/BTC", 0.05), ("ETH/USDT", 5.1)):
+        store.upsert(symbol, [(price, 100.0)], [(price * 1.001, 100.0)])
+    await executor.execute(_opp(20))
+    assert [record.status for record in executor.journal.latest()] == ["executed", "invalid"]
+
+
+async def test_embedded_server_streams_new_opportunities():
+    state = EngineState.create(OrderBookStore(), 8)
+    state.opportunities.append(_opp(1))  # before connecting: not replayed
+    admin = EmbeddedAdminServer(state, "127.0.0.1", 0)
+    admin.start()
+    while not admin.server.started:
+        await asyncio.sleep(0.01)
+    port = admin.server.servers[0].sockets[0].getsockname()[1]
+
+    async def publish():
+        await asyncio.sleep(0.05)
+        state.opportunities.append(_opp(30))
+
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            task = asyncio.create_task(publish())
+            async with client.stream("GET", "/opportunities/stream") as response:
+                assert response.headers["content-type"].startswith("text/event-stream")
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        break
+            await task
+    finally:
+        await asyncio.wait_for(admin.close(), 5)
+    assert '"net_bps": 30' in line
+
+
+async def test_idle_stream_sends_keepalive_comments(monkeypatch):
+    monkeypatch.setattr("triarb.api.routes.SSE_KEEPALIVE_S", 0.01)
+    state = EngineState.create(OrderBookStore(), 8)
+    admin = EmbeddedAdminServer(state, "127.0.0.1", 0)
+    admin.start()
+    while not admin.server.started:
+        await asyncio.sleep(0.01)
+    port = admin.server.servers[0].sockets[0].getsockname()[1]
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            async with client.stream("GET", "/opportunities/stream") as response:
+                async for line in response.aiter_lines():
+                    if line:
+                        break
+    finally:
+        await asyncio.wait_for(admin.close(), 5)
+    assert line == ": keep-alive"
@@ -0,0 +1,60 @@
+import queue
+
+import pytest
+
+from triarb.marketdata.aggregator import MarketDataAggregator, shard_symbols
+from triarb.marketdata.workers import QueueStore
+
+SYMBOLS = [f"A{idx}/USDT" for idx in range(7)]
+
+
+def test_symbols_are_split_across_shards_sharing_one_store():
+    market = MarketDataAggregator(SYMBOLS, shard_size=3, workers=0)
+    assert [len(shard) for shard in market.shards] == [3, 3, 1]
+    assert all(client.store is market.store for client in market.clients)
+    stats = market.stats()
+    assert [entry["shard"] for entry in stats] == [0, 1, 2]
+    assert stats[0]["streams"] == 3 and stats[0]["messages"] == 0
+
+
+def test_stats_reads_do_not_reset_the_rate_window():
+    market = MarketDataAggregator(SYMBOLS, shard_size=3, workers=0)
+    stats = market.clients[0].stats
+    stats.messages = 50
+    stats._window_start -= 10
+    assert market.stats()[0]["msg_per_sec"] == 0.0
+    assert stats.sample_rate() == pytest.approx(5.0, rel=0.01)
+    assert [market.stats()[0]["msg_per_sec"] for _ in range(3)] == [stats.msg_per_sec] * 3
+
+
+def test_worker_updates_are_applied_to_parent_store():
+    market = MarketDataAggregator(SYMBOLS, shard_size=2, workers=2)
+    assert market.pool is not None and market.clients == []
+    out = queue.Queue()
+    forwarding = QueueStore(out)
+    forwarding.upsert("A1/USDT", [(1.0, 2.0)], [(1.1, 3.0)])
+    market.pool.apply([out.get_nowait(), ("stats", 1, {"shard": 1, "messages": 9})])
+    assert market.store.top_of_book("A1/USDT") == (1.0, 1.1)
+    assert market.stats()[1]["messages"] == 9
+
+
+def test_exited_worker_is_restarted_and_its_books_emptied(monkeypatch):
+    market = MarketDataAggregator(SYMBOLS, shard_size=2, workers=2)
+    pool = market.pool
+    spawned = []
+    monkeypatch.setattr(pool, "_spawn", lambda assignment: spawned.append(assignment) or "new")
+    dead = type("Dead", (), {"exitcode": 1, "is_alive": lambda self: False})()
+    pool._workers = [dead, "alive"]
+    market.store.upsert("A0/USDT", [(1.0, 2.0)], [(1.1, 3.0)])  # shard 0 -> worker 0
+    market.store.upsert("A2/USDT", [(1.0, 2.0)], [(1.1, 3.0)])  # shard 1 -> worker 1
+
+    pool._restart(0)
+
+    assert market.store.top_of_book("A0/USDT") is None
+    assert market.store.top_of_book("A2/USDT") == (1.0, 1.1)
+    assert spawned == [pool._assignments[0]] and pool._workers == ["new", "alive"]
+    assert pool.restarts == 1
+
+
+def test_shard_symbols_round_trip():
+    assert sum(shard_symbols(SYMBOLS, 4), []) == SYMBOLS
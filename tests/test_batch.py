@@ -0,0 +1,87 @@
+import random
+
+from triarb.engine.batch import BatchSignalEngine
+from triarb.engine.signals import SignalEngine
+from triarb.engine.triangle import Triangle, TriangleLeg
+from triarb.marketdata.orderbook import OrderBookStore
+
+BASES = ["BTC", "ETH", "BNB", "SOL"]
+
+
+def make_triangles():
+    triangles = []
+    for a in BASES:
+        for b in BASES:
+            if a == b:
+                continue
+            triangles.append(
+                Triangle(
+                    (
+                        TriangleLeg(f"{a}/USDT", "USDT", a),
+                        TriangleLeg(f"{b}/{a}", a, b),
+                        TriangleLeg(f"{b}/USDT", b, "USDT"),
+                    )
+                )
+            )
+            triangles.append(
+                Triangle(
+                    (
+                        TriangleLeg(f"{b}/USDT", "USDT", b),
+                        TriangleLeg(f"{b}/{a}", b, a),
+                        TriangleLeg(f"{a}/USDT", a, "USDT"),
+                    )
+                )
+            )
+    return triangles
+
+
+def seed_random_books(store, rng, skip=()):
+    usd = {base: rng.uniform(1, 1000) for base in BASES}
+    for base in BASES:
+        mid = usd[base] * rng.uniform(0.97, 1.03)
+        if f"{base}/USDT" not in skip:
+            store.upsert(f"{base}/USDT", [(mid * 0.9999, 1)], [(mid * 1.0001, 1)])
+        for other in BASES:
+            if other != base and f"{base}/{other}" not in skip:
+                cross = usd[base] / usd[other] * rng.uniform(0.97, 1.03)
+                store.upsert(f"{base}/{other}", [(cross * 0.9999, 1)], [(cross * 1.0001, 1)])
+
+
+def test_batch_matches_scalar_exactly():
+    rng = random.Random(7)
+    triangles = make_triangles()
+    for _ in range(20):
+        store = OrderBookStore()
+        seed_random_books(store, rng, skip={"SOL/BTC"})
+        scalar = SignalEngine(triangles, store).evaluate()
+        batch = BatchSignalEngine(triangles, store).evaluate()
+        assert scalar
+        assert batch == scalar
+
+
+def test_batch_evaluate_symbol_matches_scalar():
+    rng = random.Random(11)
+    triangles = make_triangles()
+    store = OrderBookStore()
+    seed_random_books(store, rng)
+    scalar = SignalEngine(triangles, store)
+    batch = BatchSignalEngine(triangles, store)
+    for symbol in ("BTC/USDT", "ETH/BNB", "XRP/USDT"):
+        assert batch.evaluate_symbol(symbol) == scalar.evaluate_symbol(symbol)
+
+
+def test_batch_matches_scalar_with_per_symbol_fees():
+    from triarb.exchange.markets import MarketInfo, MarketRegistry
+
+    rng = random.Random(3)
+    triangles = make_triangles()
+    markets = MarketRegistry(
+        [MarketInfo("ETH/BTC", "ETH", "BTC", taker=0.0), MarketInfo("BNB/USDT", "BNB", "USDT", taker=0.002)],
+        default_taker=0.0004,
+    )
+    for _ in range(10):
+        store = OrderBookStore()
+        seed_random_books(store, rng)
+        scalar = SignalEngine(triangles, store, markets).evaluate()
+        assert BatchSignalEngine(triangles, store, markets).evaluate() == scalar
+        assert scalar != SignalEngine(triangles, store).evaluate()
@@ -0,0 +1,109 @@
+import asyncio
+import hashlib
+import hmac
+
+import pytest
+from aiohttp import web
+
+from triarb.exchange.binance_rest import BinanceRestClient, BinanceRestError, step_decimals
+from triarb.exchange.markets import MarketInfo, MarketRegistry
+
+REGISTRY = MarketRegistry(
+    [
+        MarketInfo("BTC/USDT", "BTC", "USDT", 0.001, 0.01, 0.00001),
+        MarketInfo("ETH/BTC", "ETH", "BTC", 0.001, 0.00001, 0.001),
+    ]
+)
+
+
+async def _serve(handler):
+    app = web.Application()
+    async def ping(request):
+        return web.json_response({})
+
+    app.router.add_get("/api/v3/ping", ping)
+    app.router.add_post("/api/v3/order", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_step_decimals():
+    assert step_decimals(0.001) == 3
+    assert step_decimals(0.00001) == 5
+    assert step_decimals(1.0) == 0
+    assert step_decimals(0.0) == 0
+
+
+def test_unknown_lot_step_truncates_to_eight_decimals():
+    client = BinanceRestClient("key", "secret", "http://unused", REGISTRY)
+    assert "quantity=0.01230000&" in client.order_body("SOL/USDT", "sell", 0.0123, 0)
+    assert "quantity=0.69999999&" in client.order_body("SOL/USDT", "sell", 0.699999999, 0)
+
+
+async def test_orders_are_signed_rounded_and_sent_concurrently():
+    seen = []
+
+    async def order(request):
+        body = (await request.read()).decode()
+        seen.append((request.headers["X-MBX-APIKEY"], body))
+        return web.json_response({"orderId": len(seen)})
+
+    runner, url = await _serve(order)
+    client = BinanceRestClient("key", "secret", url, REGISTRY)
+    try:
+        await client.warm(2)
+        results = await client.create_orders(
+            [
+                {"symbol": "BTC/USDT", "side": "buy", "type": "market", "amount": 0.0123456},
+                {"symbol": "ETH/BTC", "side": "sell", "type": "market", "amount": 0.31415},
+            ]
+        )
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+    assert sorted(result["orderId"] for result in results) == [1, 2]
+    bodies = {body.split("&", 1)[0]: body for _, body in seen}
+    assert all(key == "key" for key, _ in seen)
+    btc = bodies["symbol=BTCUSDT"]
+    assert "side=BUY" in btc and "quantity=0.01234&" in btc
+    assert "quantity=0.314&" in bodies["symbol=ETHBTC"]
+    query, signature = btc.rsplit("&signature=", 1)
+    assert signature == hmac.new(b"secret", query.encode(), hashlib.sha256).hexdigest()
+
+
+async def test_warm_connections_are_pinged_until_close():
+    async def order(request):
+        return web.json_response({})
+
+    runner, url = await _serve(order)
+    client = BinanceRestClient("key", "secret", url, REGISTRY, keep_warm_s=0.01)
+    try:
+        await client.warm(2)
+        await asyncio.sleep(0.05)
+        assert client.pings >= 4
+    finally:
+        await client.close()
+    pings = client.pings
+    await asyncio.sleep(0.03)
+    await runner.cleanup()
+    assert client.pings == pings
+
+
+async def test_error_response_raises():
+    async def order(request):
+        return web.json_response({"code": -2010, "msg": "Account has insufficient balance."}, status=400)
+
+    runner, url = await _serve(order)
+    client = BinanceRestClient("key", "secret", url, REGISTRY)
+    try:
+        with pytest.raises(BinanceRestError) as err:
+            await client.create_order("BTC/USDT", "sell", 1.0)
+    finally:
+        await client.close()
+        await runner.cleanup()
+    assert err.value.code == -2010 and err.value.status == 400
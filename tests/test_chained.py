@@ -0,0 +1,143 @@
+import asyncio
+import json
+
+import pytest
+
+from triarb.engine.chained import ChainedExecutor
+from triarb.engine.risk import RiskManager
+from triarb.engine.signals import Opportunity
+from triarb.engine.triangle import Triangle, TriangleLeg
+from triarb.exchange.binance_rest import BinanceRestClient, BinanceRestError
+from triarb.exchange.markets import MarketInfo, MarketRegistry
+from triarb.exchange.mock import MockExchange
+from triarb.exchange.user_stream import BinanceUserDataStream, UserDataStream
+from triarb.marketdata.orderbook import OrderBookStore
+from triarb.marketdata.synthetic import SyntheticMarket
+from triarb.metrics import METRICS
+from triarb.utils.ring import RingBuffer
+
+TRIANGLE = Triangle(
+    (
+        TriangleLeg("BTC/USDT", "USDT", "BTC"),
+        TriangleLeg("ETH/BTC", "BTC", "ETH"),
+        TriangleLeg("ETH/USDT", "ETH", "USDT"),
+    )
+)
+PRICES = {"BTC/USDT": 100.0, "ETH/BTC": 0.05, "ETH/USDT": 5.0}
+
+
+class LocalVenue:
+    """Acknowledges orders and reports fills on a local stream a few ms later."""
+
+    def __init__(self, stream: UserDataStream, fill_ratio: float = 1.0, reject: str | None = None):
+        self.stream = stream
+        self.fill_ratio = fill_ratio
+        self.reject = reject
+        self.calls = []
+
+    async def create_order(self, symbol, side, amount, client_order_id=None, quote_amount=False):
+        self.calls.append((symbol, side, amount, quote_amount))
+        if symbol == self.reject:
+            raise BinanceRestError(400, -2010, "Account has insufficient balance.")
+        price = PRICES[symbol]
+        ratio = self.fill_ratio if len(self.calls) == 1 else 1.0
+        qty = (amount / price if quote_amount else amount) * ratio
+        base, quote = symbol.split("/")
+        report = {
+            "e": "executionReport",
+            "E": 1,
+            "s": symbol.replace("/", ""),
+            "c": client_order_id,
+            "S": side.upper(),
+            "X": "FILLED" if ratio == 1.0 else "EXPIRED",
+            "z": str(qty),
+            "Z": str(qty * price),
+            "n": str((qty if side == "buy" else qty * price) * 0.001),
+            "N": base if side == "buy" else quote,
+        }
+        asyncio.get_running_loop().call_later(0.002, self.stream.handle_message, json.dumps(report))
+        await asyncio.sleep(0.02)  # the REST reply trails the fill
+        return {"orderId": len(self.calls)}
+
+
+def _executor(venue, stream, store=None):
+    executor = ChainedExecutor(None, store or OrderBookStore(), RiskManager(), MarketRegistry(), venue, stream, 500)
+    executor.journal = RingBuffer(4)
+    return executor
+
+
+async def test_each_leg_is_sized_from_the_previous_fill():
+    stream = UserDataStream()
+    venue = LocalVenue(stream, fill_ratio=0.8)
+    executor = _executor(venue, stream)
+    before = METRICS.stages["fill_to_next_leg"].count
+
+    await executor.execute(Opportunity(triangle=TRIANGLE, gross_bps=50, net_bps=20, notional_quote=1000))
+
+    btc = 8.0 * 0.999
+    eth = btc / 0.05 * 0.999
+    assert venue.calls[0] == ("BTC/USDT", "buy", 1000, True)
+    assert venue.calls[1][:2] == ("ETH/BTC", "buy") and venue.calls[1][2] == pytest.approx(btc)
+    assert venue.calls[2][:2] == ("ETH/USDT", "sell") and venue.calls[2][2] == pytest.approx(eth)
+    assert executor.journal.latest()[0].status == "executed"
+    assert METRICS.stages["fill_to_next_leg"].count == before + 2
+
+
+async def test_rest_rejection_fails_the_cycle_without_waiting_for_a_fill():
+    stream = UserDataStream()
+    venue = LocalVenue(stream, reject="ETH/BTC")
+    executor = _executor(venue, stream)
+
+    await asyncio.wait_for(
+        executor.execute(Opportunity(triangle=TRIANGLE, gross_bps=50, net_bps=20, notional_quote=1000)), 0.4
+    )
+
+    record = executor.journal.latest()[0]
+    assert record.status == "failed" and "insufficient balance" in record.error
+    assert len(venue.calls) == 2
+    assert record.residual_asset == "BTC" and record.residual_amount == pytest.approx(10 * 0.999)
+
+
+async def test_legs_below_min_notional_are_not_sent():
+    stream = UserDataStream()
+    venue = LocalVenue(stream)
+    executor = _executor(venue, stream)
+    opportunity = Opportunity(triangle=TRIANGLE, gross_bps=50, net_bps=20, notional_quote=1000)
+
+    executor.markets = MarketRegistry([MarketInfo("BTC/USDT", "BTC", "USDT", 0.001, min_notional=5_000)])
+    await executor.execute(opportunity)
+    assert executor.journal.latest()[0].status == "invalid" and venue.calls == []
+
+    executor.markets = MarketRegistry([MarketInfo("ETH/BTC", "ETH", "BTC", 0.001, min_notional=20)])
+    await executor.execute(opportunity)
+    record = executor.journal.latest()[0]
+    assert record.status == "failed" and "min notional for ETH/BTC" in record.error
+    assert len(venue.calls) == 1 and record.residual_asset == "BTC"
+
+
+async def test_chains_against_the_mock_exchange_user_stream():
+    market = SyntheticMarket(3, seed=4)
+    exchange = MockExchange(market, rate=1, latency_ms=1)
+    await exchange.start()
+    registry = exchange.registry()
+    rest = BinanceRestClient("key", "secret", exchange.rest_url, registry)
+    stream = BinanceUserDataStream(rest, exchange.ws_url)
+    stream.start()
+    store = OrderBookStore()
+    try:
+        await asyncio.wait_for(stream.connected.wait(), 2)
+        executor = _executor(rest, stream, store)
+        executor.markets = registry
+        triangle = market.triangles[0]
+        await executor.execute(Opportunity(triangle=triangle, gross_bps=50, net_bps=20, notional_quote=100))
+    finally:
+        await stream.close()
+        await rest.close()
+        await exchange.close()
+
+    assert executor.journal.latest()[0].status == "executed"
+    first, second, third = exchange.orders  # buy A000, buy A001 with A000, sell A001
+    keep = 1 - exchange.taker
+    assert (first.side, second.side, third.side) == ("BUY", "BUY", "SELL")
+    assert second.quantity == pytest.approx(first.executed * keep, abs=1e-8)
+    assert third.quantity == pytest.approx(second.executed * keep, abs=1e-6)
@@ -0,0 +1,40 @@
+import json
+
+from triarb.marketdata.decoder import FrameDecoder
+
+SYMBOLS = ["BTC/USDT", "ETH/BTC"]
+
+
+def frame(stream, data):
+    return json.dumps({"stream": stream, "data": data})
+
+
+def test_partial_depth_resolves_symbol_from_stream_name():
+    decoder = FrameDecoder(SYMBOLS, loads=json.loads, depth=1)
+    payload = {"lastUpdateId": 1, "bids": [["0.05", "2"], ["0.04", "1"]], "asks": [["0.06", "3"]]}
+    update = decoder.decode(frame("ethbtc@depth5@100ms", payload))
+    assert update.symbol == "ETH/BTC"
+    assert update.bids == [(0.05, 2.0)]
+    assert update.asks == [(0.06, 3.0)]
+    assert decoder.decode(frame("xrpbtc@depth5@100ms", {"bids": [], "asks": []})) is None
+
+
+def test_diff_depth_and_book_ticker_payloads():
+    decoder = FrameDecoder(SYMBOLS)
+    update = decoder.decode(
+        frame(
+            "btcusdt@depth@100ms",
+            {"e": "depthUpdate", "E": 123, "s": "BTCUSDT", "U": 10, "u": 12, "b": [["100", "1"]], "a": []},
+        )
+    )
+    assert (update.symbol, update.event_time, update.first_update_id, update.final_update_id) == (
+        "BTC/USDT",
+        123,
+        10,
+        12,
+    )
+    ticker = decoder.decode(
+        frame("btcusdt@bookTicker", {"u": 5, "s": "BTCUSDT", "b": "99.5", "B": "2", "a": "100.5", "A": "3"})
+    )
+    assert ticker.bids == [(99.5, 2.0)]
+    assert ticker.asks == [(100.5, 3.0)]
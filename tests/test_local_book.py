@@ -0,0 +1,89 @@
+import asyncio
+
+from triarb.marketdata.decoder import BookUpdate
+from triarb.marketdata.local_book import DepthSnapshot, DiffDepthManager, LocalOrderBook, SnapshotThrottled
+from triarb.marketdata.orderbook import OrderBookStore
+
+
+class StubSnapshotSource:
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.calls = 0
+
+    async def fetch(self, symbol, limit):
+        self.calls += 1
+        return self.snapshots.pop(0)
+
+
+def diff(first, last, bids=(), asks=()):
+    return BookUpdate("BTC/USDT", list(bids), list(asks), 0, first, last)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_local_book_applies_and_removes_levels():
+    book = LocalOrderBook()
+    book.reset([(100, 1), (99, 2)], [(101, 1)])
+    book.apply([(100, 0), (98.5, 4)], [(100.5, 3)])
+    assert book.top(2) == ([(99, 2), (98.5, 4)], [(100.5, 3), (101, 1)])
+
+
+async def test_snapshot_then_buffered_diffs_are_replayed():
+    store = OrderBookStore()
+    source = StubSnapshotSource([DepthSnapshot(10, [(100, 1)], [(101, 1)])])
+    manager = DiffDepthManager(store, source, top_levels=5)
+    manager.on_update(diff(5, 9, bids=[(99, 9)]))  # covered by snapshot, dropped
+    manager.on_update(diff(10, 12, bids=[(100.5, 2)]))
+    await settle()
+    assert manager.is_synced("BTC/USDT")
+    manager.on_update(diff(13, 13, asks=[(101, 0), (102, 5)]))
+    assert store.top_of_book("BTC/USDT") == (100.5, 102)
+    assert store.cumulative_depth("BTC/USDT", "bid", 5) == 3
+
+
+async def test_sequence_gap_triggers_resync():
+    store = OrderBookStore()
+    source = StubSnapshotSource(
+        [DepthSnapshot(10, [(100, 1)], [(101, 1)]), DepthSnapshot(20, [(95, 1)], [(96, 1)])]
+    )
+    manager = DiffDepthManager(store, source, top_levels=5)
+    manager.on_update(diff(11, 11))
+    await settle()
+    manager.on_update(diff(15, 21, bids=[(95.5, 1)]))
+    assert not manager.is_synced("BTC/USDT")
+    await settle()
+    assert source.calls == 2
+    assert manager.is_synced("BTC/USDT")
+    assert store.top_of_book("BTC/USDT") == (95.5, 96)
+
+
+async def test_snapshot_fetches_are_limited_and_honour_retry_after():
+    class ThrottlingSource:
+        def __init__(self):
+            self.in_flight = self.peak = self.calls = 0
+
+        async def fetch(self, symbol, limit):
+            self.calls += 1
+            if self.calls == 1:
+                raise SnapshotThrottled(429, 0.05)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.005)
+            self.in_flight -= 1
+            return DepthSnapshot(10, [(100, 1)], [(101, 1)])
+
+    store = OrderBookStore()
+    source = ThrottlingSource()
+    manager = DiffDepthManager(store, source, top_levels=5, max_concurrent_snapshots=2)
+    symbols = [f"S{idx}/USDT" for idx in range(6)]
+    for symbol in symbols:
+        manager.on_update(BookUpdate(symbol, [], [], 0, 11, 11))
+    await asyncio.sleep(0.03)
+    assert manager.throttled == 1 and source.calls == 1  # everyone waits out Retry-After
+    await asyncio.sleep(0.1)
+    assert all(manager.is_synced(symbol) for symbol in symbols)
+    assert source.peak == 2
+    manager.reset()
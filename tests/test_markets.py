@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from triarb.engine.executor import Executor
+from triarb.engine.risk import RiskManager
+from triarb.engine.signals import Opportunity
+from triarb.engine.triangle import Triangle, TriangleLeg
+from triarb.exchange.markets import MarketInfo, MarketRegistry, load_market_registry
+from triarb.marketdata.orderbook import OrderBookStore
+
+CCXT_MARKETS = {
+    "BTC/USDT": {
+        "symbol": "BTC/USDT",
+        "base": "BTC",
+        "quote": "USDT",
+        "taker": 0.001,
+        "precision": {"price": 0.01, "amount": 0.00001},
+        "limits": {"amount": {"min": 0.00001}, "cost": {"min": 5.0}},
+    },
+    "ETH/BTC": {
+        "symbol": "ETH/BTC",
+        "base": "ETH",
+        "quote": "BTC",
+        "taker": 0.001,
+        "precision": {"price": 0.00001, "amount": 0.0001},
+        "limits": {"amount": {"min": 0.0001}, "cost": {"min": 0.0001}},
+    },
+    "OLD/USDT": {"symbol": "OLD/USDT", "base": "OLD", "quote": "USDT", "active": False},
+}
+
+
+class CountingAdapter:
+    def __init__(self):
+        self.calls = 0
+
+    async def load_markets(self):
+        self.calls += 1
+        return CCXT_MARKETS
+
+
+def test_registry_parses_ccxt_filters_and_skips_inactive_markets():
+    registry = MarketRegistry.from_ccxt(CCXT_MARKETS.values())
+    assert "OLD/USDT" not in registry and len(registry) == 2
+    assert registry.tick_size("BTC/USDT") == 0.01
+    assert registry.lot_step("ETH/BTC") == 0.0001
+    assert registry.min_notional("BTC/USDT") == 5.0
+    # The account-wide fee table rate wins over the listed market fee.
+    assert registry.taker_fee("BTC/USDT") == 0.0004
+    assert registry.taker_fee("UNKNOWN/USDT") == registry.default_taker
+    assert registry.round_qty("ETH/BTC", 0.123456) == 0.1234
+    assert registry.round_qty("UNKNOWN/USDT", 0.123456) == 0.123456
+
+
+async def test_registry_warm_starts_from_cache(tmp_path, monkeypatch):
+    from triarb.config import get_settings
+
+    settings = get_settings().model_copy(update={"market_cache_path": str(tmp_path / "markets.json")})
+    adapter = CountingAdapter()
+    first = await load_market_registry(adapter, settings)
+    second = await load_market_registry(adapter, settings)
+    assert adapter.calls == 1
+    assert second.get("BTC/USDT") == first.get("BTC/USDT")
+
+    stale = MarketRegistry.load(tmp_path / "markets.json", max_age_seconds=-1)
+    assert stale is None
+    monkeypatch.setattr(time, "time", lambda: 0.0)
+    assert MarketRegistry.load(tmp_path / "markets.json", max_age_seconds=60) is not None
+
+
+async def test_executor_uses_per_symbol_fees_and_min_notional():
+    class Adapter:
+        def fee_rate(self, symbol):
+            raise AssertionError("registry should be used")
+
+        async def create_bulk_orders(self, orders):
+            return [{"id": "x"} for _ in orders]
+
+    store = OrderBookStore()
+    store.upsert("BTC/USDT", [(99.0, 5)], [(100.0, 5)])
+    store.upsert("ETH/BTC", [(0.05, 50)], [(0.0501, 50)])
+    store.upsert("ETH/USDT", [(5.2, 50)], [(5.21, 50)])
+    triangle = Triangle(
+        (
+            TriangleLeg("BTC/USDT", "USDT", "BTC"),
+            TriangleLeg("ETH/BTC", "BTC", "ETH"),
+            TriangleLeg("ETH/USDT", "ETH", "USDT"),
+        )
+    )
+    markets = MarketRegistry(
+        [
+            MarketInfo("BTC/USDT", "BTC", "USDT", taker=0.0),
+            MarketInfo("ETH/BTC", "ETH", "BTC", taker=0.5),
+            MarketInfo("ETH/USDT", "ETH", "USDT", taker=0.0, min_notional=10_000.0),
+        ]
+    )
+    executor = Executor(Adapter(), store, RiskManager(), markets)
+    opp = Opportunity(triangle=triangle, gross_bps=50, net_bps=20, notional_quote=1_000)
+    with pytest.raises(ValueError, match="min notional"):
+        executor._build_instructions(opp)
+
+    markets.markets["ETH/USDT"] = MarketInfo("ETH/USDT", "ETH", "USDT", taker=0.0)
+    instructions = executor._build_instructions(opp)
+    btc = instructions[0]["amount"]
+    # Half of the ETH bought on the ETH/BTC leg goes to fees before it is sold.
+    assert abs(instructions[2]["amount"] - instructions[1]["amount"] * 0.5) < 1e-12
+    assert btc > 0
@@ -0,0 +1,81 @@
+import json
+
+from prometheus_client import CollectorRegistry, generate_latest
+
+from triarb.engine.executor import Executor
+from triarb.engine.risk import RiskManager
+from triarb.engine.signals import SignalEngine
+from triarb.engine.triangle import Triangle, TriangleLeg
+from triarb.marketdata.orderbook import OrderBookStore
+from triarb.marketdata.ws_client import BinanceWsClient
+from triarb.metrics import BUCKETS_NS, METRICS, EngineMetrics, LatencyHistogram
+
+TRIANGLE = Triangle(
+    (
+        TriangleLeg("BTC/USDT", "USDT", "BTC"),
+        TriangleLeg("ETH/BTC", "BTC", "ETH"),
+        TriangleLeg("ETH/USDT", "ETH", "USDT"),
+    )
+)
+
+
+class AckAdapter:
+    def fee_rate(self, symbol):
+        return 0.0
+
+    async def create_bulk_orders(self, orders):
+        return [{"id": "ack"} for _ in orders]
+
+
+def depth_frame(raw, bids, asks, event_ms):
+    data = {"e": "depthUpdate", "E": event_ms, "s": raw, "U": 1, "u": 1, "b": bids, "a": asks}
+    return json.dumps({"stream": f"{raw.lower()}@depth@100ms", "data": data})
+
+
+def counts():
+    return {stage: hist.count for stage, hist in METRICS.stages.items()}
+
+
+async def test_tick_stamps_flow_from_socket_to_order_ack():
+    store = OrderBookStore()
+    client = BinanceWsClient(TRIANGLE.symbols, store)
+    engine = SignalEngine([TRIANGLE], store)
+    engine.listen()
+    before = counts()
+
+    recv_ns = 1_700_000_000_000_000_000
+    client.handle_message(depth_frame("BTCUSDT", [["99.9", "5"]], [["100", "5"]], 1_699_999_999_999), recv_ns)
+    client.handle_message(depth_frame("ETHBTC", [["0.0499", "50"]], [["0.05", "50"]], 0), recv_ns)
+    client.handle_message(depth_frame("ETHUSDT", [["5.5", "50"]], [["5.51", "50"]], 0), recv_ns)
+    (opp,) = await engine.wait_opportunities()
+    assert opp.tick is not None and opp.tick.signal_ns >= opp.tick.store_ns
+
+    await Executor(AckAdapter(), store, RiskManager()).execute(opp)
+    after = counts()
+    assert after["receive_to_parse"] - before["receive_to_parse"] == 3
+    assert after["exchange_to_receive"] - before["exchange_to_receive"] == 1
+    assert after["store_to_signal"] - before["store_to_signal"] == 1
+    assert after["submit_to_ack"] - before["submit_to_ack"] == 3
+    assert after["tick_to_trade"] - before["tick_to_trade"] == 3
+    engine.close()
+
+
+def test_histogram_buckets_are_cumulative_and_exported():
+    hist = LatencyHistogram()
+    for value in (500, 1_500, 2_000_000_000_000):
+        hist.observe_ns(value)
+    buckets = hist.cumulative()
+    assert buckets[0] == ("1e-06", 1)
+    assert buckets[-1] == ("+Inf", 3)
+    assert json.dumps(hist.quantile(0.99)) == repr(float(BUCKETS_NS[-1]))  # overflow stays finite
+
+    metrics = EngineMetrics()
+    metrics.stages["receive_to_parse"].observe_ns(2_000)
+    metrics.inc("opportunities", 2)
+    metrics.gauge("opportunities_pending", "Pending.", lambda: 4)
+    registry = CollectorRegistry()
+    registry.register(metrics)
+    text = generate_latest(registry).decode()
+    assert 'triarb_stage_latency_seconds_count{stage="receive_to_parse"} 1.0' in text
+    assert "triarb_opportunities_total 2.0" in text
+    assert "triarb_opportunities_pending 4.0" in text
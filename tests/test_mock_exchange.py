@@ -0,0 +1,66 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from triarb.exchange.binance_rest import BinanceRestClient, BinanceRestError
+from triarb.exchange.mock import MockExchange
+from triarb.marketdata.decoder import FrameDecoder, stream_name
+from triarb.marketdata.synthetic import SyntheticMarket
+
+
+async def test_streams_subscribed_symbols_in_combined_format():
+    market = SyntheticMarket(3, seed=1)
+    exchange = MockExchange(market, rate=2_000)
+    await exchange.start()
+    symbols = market.symbols[:2]
+    decoder = FrameDecoder(symbols)
+    streams = "/".join(stream_name(symbol) for symbol in symbols)
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(f"{exchange.ws_url}/stream?streams={streams}") as ws:
+                updates = [decoder.decode((await ws.receive(timeout=2)).data) for _ in range(20)]
+    finally:
+        await exchange.close()
+    assert {update.symbol for update in updates} <= set(symbols)
+    assert all(update.bids[0][0] < update.asks[0][0] for update in updates)
+
+
+async def test_market_orders_fill_against_the_book_after_latency():
+    market = SyntheticMarket(3, seed=2)
+    exchange = MockExchange(market, rate=1, latency_ms=20, api_secret="secret")
+    await exchange.start()
+    symbol = market.symbols[0]
+    best_ask = exchange._books[symbol][1][0]
+    client = BinanceRestClient("key", "secret", exchange.rest_url, exchange.registry())
+    try:
+        started = asyncio.get_running_loop().time()
+        result = await client.create_order(symbol, "buy", best_ask[1] / 2)
+        elapsed = asyncio.get_running_loop().time() - started
+        bad = BinanceRestClient("key", "wrong", exchange.rest_url, exchange.registry())
+        with pytest.raises(BinanceRestError) as err:
+            await bad.create_order(symbol, "sell", 1.0)
+        await bad.close()
+    finally:
+        await client.close()
+        await exchange.close()
+
+    assert elapsed >= 0.02
+    assert "orderId" in result
+    order = exchange.orders[0]
+    assert order.executed == pytest.approx(best_ask[1] / 2, abs=1e-6)
+    assert order.quote == pytest.approx(order.executed * best_ask[0])
+    assert err.value.code == -1022
+    assert exchange.stats()["orders_filled"] == 1
+
+
+def test_match_walks_levels_and_consumes_depth():
+    market = SyntheticMarket(3, seed=3)
+    exchange = MockExchange(market)
+    symbol = market.symbols[0]
+    bids = exchange._books[symbol][0]
+    wanted = bids[0][1] + bids[1][1] / 2
+    fills = exchange.match(symbol, "SELL", wanted)
+    assert [price for price, _ in fills] == [bids[0][0], bids[1][0]]
+    assert sum(qty for _, qty in fills) == pytest.approx(wanted)
+    assert exchange._books[symbol][0][0] == (bids[1][0], pytest.approx(bids[1][1] / 2))
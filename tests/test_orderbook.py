@@ -7,3 +7,28 @@ def test_best_bid_ask():
     bid, ask = store.best_bid_ask("BTC/USDT")
     assert bid.price == 100
     assert ask.price == 101
+
+
+def test_update_reuses_buffers_and_sorts_unordered_levels():
+    store = OrderBookStore(depth=3)
+    store.upsert("ETH/USDT", [(10, 1), (12, 2), (11, 3), (9, 4)], [(14, 1), (13, 2)])
+    book = store.books["ETH/USDT"]
+    buffer = book.bid_px
+    assert [level.price for level in book.bids] == [12, 11, 10]
+    assert [level.price for level in book.asks] == [13, 14]
+    assert store.cumulative_depth("ETH/USDT", "bid", 2) == 5
+
+    store.upsert("ETH/USDT", [(12.5, 1)], [])
+    assert book.bid_px is buffer
+    assert store.best_bid_ask("ETH/USDT") == (book.bids[0], None)
+    assert store.top_of_book("ETH/USDT") is None
+
+
+def test_store_top_of_book_arrays():
+    store = OrderBookStore()
+    idx = store.symbol_id("BNB/USDT")
+    assert store.best_bid[idx] != store.best_bid[idx]  # NaN until populated
+    store.upsert("BNB/USDT", [(300, 1)], [(301, 1)])
+    assert (store.best_bid[idx], store.best_ask[idx]) == (300, 301)
+    assert store.top_of_book("BNB/USDT") == (300, 301)
+    assert store.updates == 1  # counted with or without a latency tick
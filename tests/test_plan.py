@@ -0,0 +1,38 @@
+from triarb.engine.plan import compile_plan
+from triarb.engine.triangle import Triangle, TriangleLeg
+from triarb.marketdata.orderbook import OrderBookStore
+
+FEES = {"ETH/BTC": 0.0}
+
+
+def fee_rate(symbol):
+    return FEES.get(symbol, 0.001)
+
+
+def test_plan_resolves_ids_directions_and_fee_multipliers():
+    store = OrderBookStore()
+    store.symbol_id("SOL/USDT")
+    triangle = Triangle(
+        (
+            TriangleLeg("ETH/USDT", "USDT", "ETH"),
+            TriangleLeg("ETH/BTC", "ETH", "BTC"),
+            TriangleLeg("BTC/USDT", "BTC", "USDT"),
+        )
+    )
+    plan = compile_plan(triangle, store, "USDT", fee_rate, slip=0.0005)
+    assert plan is not None and plan.triangle is triangle
+    assert plan.ids == tuple(store.symbol_ids[symbol] for symbol in triangle.symbols)
+    assert plan.buys == (True, False, False)
+    assert plan.keeps == (1 - (0.001 + 0.0005), 1 - (0.0 + 0.0005), 1 - (0.001 + 0.0005))
+    assert not hasattr(plan.legs[0], "__dict__")
+
+
+def test_plan_rejects_legs_that_do_not_chain_back_to_quote():
+    broken = Triangle(
+        (
+            TriangleLeg("ETH/USDT", "USDT", "ETH"),
+            TriangleLeg("SOL/BTC", "BTC", "SOL"),
+            TriangleLeg("SOL/USDT", "SOL", "USDT"),
+        )
+    )
+    assert compile_plan(broken, OrderBookStore(), "USDT", fee_rate) is None
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+
+import httpx
+
+from triarb.api.server import create_app
+from triarb.api.state import EngineState
+from triarb.marketdata.orderbook import OrderBookStore
+from triarb.profiling import SectionTimers, StackSampler
+
+
+def busy_leaf(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampler_collapses_the_target_thread_stack():
+    sampler = StackSampler(threading.get_ident(), interval_ms=1)
+    thread = threading.Thread(target=sampler.run, args=(0.1,))
+    thread.start()
+    busy_leaf(0.15)
+    thread.join()
+
+    assert sampler.samples > 10
+    stack, count = sampler.stacks.most_common(1)[0]
+    assert stack.endswith("test_profiling:busy_leaf") and ";" in stack
+    assert sampler.collapsed().splitlines()[0] == f"{stack} {count}"
+
+
+async def test_section_timers_patch_only_while_installed():
+    class Engine:
+        def evaluate(self):
+            busy_leaf(0.002)
+            return 1
+
+        async def execute(self):
+            busy_leaf(0.002)
+            await asyncio.sleep(0.02)
+            return 2
+
+    engine = Engine()
+    timers = SectionTimers()
+    timers.add("evaluate", engine, "evaluate")
+    timers.add("execute", engine, "execute")
+    timers.install()
+    assert engine.evaluate() == 1 and await engine.execute() == 2
+    timers.remove()
+    engine.evaluate()
+
+    report = timers.report()
+    assert report["evaluate"]["calls"] == 1 and report["evaluate"]["cpu_ms"] > 1
+    execute = report["execute"]
+    assert execute["wall_ms"] >= 20 and 1 < execute["cpu_ms"] < execute["wall_ms"]
+    assert "evaluate" not in vars(engine)
+
+
+async def test_profile_endpoint_samples_the_engine_loop():
+    store = OrderBookStore()
+    state = EngineState.create(store, 8)
+    state.add_timing("upsert", store, "upsert")
+
+    done = asyncio.Event()
+
+    async def feed():
+        while not done.is_set():
+            store.upsert("BTC/USDT", [(100.0, 1.0)], [(101.0, 1.0)])
+            await asyncio.sleep(0.005)
+
+    transport = httpx.ASGITransport(app=create_app(state))
+    async with httpx.AsyncClient(transport=transport, base_url="http://admin") as client:
+        task = asyncio.create_task(feed())
+        collapsed = await client.get("/profile", params={"seconds": 0.1, "interval_ms": 2})
+        report = (await client.get("/profile", params={"seconds": 0.1, "timings": True, "format": "json"})).json()
+        done.set()
+        await task
+
+    assert collapsed.headers["content-type"].startswith("text/plain")
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed.text.splitlines())
+    assert report["samples"] > 0 and sum(report["stacks"].values()) == report["samples"]
+    assert report["timings"]["upsert"]["calls"] > 0
+    assert "upsert" not in vars(store)
@@ -0,0 +1,67 @@
+import asyncio
+
+from triarb.data.redis_state import BOOK_KEY_PREFIX, RedisPublisher, decode_book
+from triarb.marketdata.orderbook import OrderBookStore
+
+
+class FakePipeline:
+    def __init__(self, server):
+        self.server = server
+        self.commands = []
+
+    def set(self, key, value):
+        self.commands.append((key, value))
+        return self
+
+    async def execute(self):
+        self.server.round_trips += 1
+        for key, value in self.commands:
+            self.server.data[key] = value
+        return [True] * len(self.commands)
+
+
+class FakeRedis:
+    """In-process stand-in for the subset of ``redis.asyncio.Redis`` the publisher uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+        self.closed = False
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def close(self):
+        self.closed = True
+
+
+async def test_updates_within_window_are_coalesced_into_one_pipeline():
+    store = OrderBookStore()
+    server = FakeRedis()
+    publisher = RedisPublisher(server, store, window_ms=1)
+    publisher.attach()
+    for price in (100.0, 101.0, 102.0):
+        store.upsert("BTC/USDT", [(price - 0.5, 1.0)], [(price, 2.0)])
+    store.upsert("ETH/USDT", [(9.9, 3.0)], [(10.0, 4.0)])
+    publisher.publish("heartbeat", b"1")
+    publisher.publish("heartbeat", b"2")
+    await asyncio.sleep(0.02)
+
+    assert server.round_trips == 1
+    assert publisher.last_batch == 3 and publisher.coalesced == 3
+    _, bid, bid_qty, ask, ask_qty = decode_book(server.data[BOOK_KEY_PREFIX + "BTC/USDT"])
+    assert (bid, bid_qty, ask, ask_qty) == (101.5, 1.0, 102.0, 2.0)
+    assert server.data["heartbeat"] == b"2"
+
+
+async def test_close_flushes_pending_and_detaches():
+    store = OrderBookStore()
+    server = FakeRedis()
+    publisher = RedisPublisher(server, store, window_ms=10_000)
+    publisher.attach()
+    store.upsert("BTC/USDT", [(99.0, 1.0)], [(100.0, 1.0)])
+    await publisher.close()
+
+    assert BOOK_KEY_PREFIX + "BTC/USDT" in server.data and server.closed
+    store.upsert("BTC/USDT", [(98.0, 1.0)], [(99.0, 1.0)])
+    assert publisher.pending() == 0
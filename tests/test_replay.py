@@ -0,0 +1,35 @@
+import pytest
+
+from triarb.engine.simulator import replay
+from triarb.marketdata.recorder import FrameRecorder, iter_frames
+from triarb.marketdata.synthetic import SyntheticMarket
+
+
+async def test_recorded_frames_replay_through_engine(tmp_path):
+    market = SyntheticMarket(4, seed=5)
+    frames = list(market.frames(200))
+    recorders = [FrameRecorder(tmp_path, prefix=f"ws{idx}", segment_bytes=4096) for idx in range(2)]
+    for idx, frame in enumerate(frames):
+        recorders[idx % 2].append(frame, recv_ns=1_000 + idx)
+    for recorder in recorders:
+        recorder.close()
+
+    assert len(list(tmp_path.glob("ws0-*.frames.gz"))) > 1
+    replayed = list(iter_frames(tmp_path))
+    assert [payload.decode() for _, payload in replayed] == frames
+
+    result = await replay(tmp_path, market.triangles)
+    assert result.frames == 200
+    assert result.opportunities > 0
+    assert result.frames_per_second > 0
+
+
+async def test_diff_depth_captures_are_rejected(tmp_path):
+    market = SyntheticMarket(3, seed=5)
+    recorder = FrameRecorder(tmp_path)
+    for frame in market.frames(5, channel="depth@100ms"):
+        recorder.append(frame)
+    recorder.close()
+
+    with pytest.raises(ValueError, match="Diff-depth"):
+        await replay(tmp_path, market.triangles)
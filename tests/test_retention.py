@@ -0,0 +1,25 @@
+from datetime import date
+
+from triarb.data.retention import expired_partitions, missing_partitions, partition_day, partition_name
+
+
+def test_partition_names_round_trip():
+    name = partition_name("trades", date(2025, 11, 3))
+    assert name == "trades_p20251103"
+    assert partition_day("trades", name) == date(2025, 11, 3)
+    assert partition_day("trades", "trades_default") is None
+    assert partition_day("trades", "opportunities_p20251103") is None
+
+
+def test_retention_drops_only_whole_days_past_cutoff():
+    existing = ["opportunities_default"] + [
+        partition_name("opportunities", date(2025, 11, day)) for day in range(1, 11)
+    ]
+    expired = expired_partitions("opportunities", existing, today=date(2025, 11, 10), retain_days=7)
+    assert expired == ["opportunities_p20251101", "opportunities_p20251102"]
+
+
+def test_missing_partitions_premakes_upcoming_days():
+    existing = [partition_name("trades", date(2025, 11, 10)), partition_name("trades", date(2025, 11, 12))]
+    missing = missing_partitions("trades", existing, today=date(2025, 11, 10), premake_days=3)
+    assert missing == [date(2025, 11, 11), date(2025, 11, 13)]
@@ -0,0 +1,68 @@
+import asyncio
+import gc
+
+import pytest
+
+from triarb.runtime import IdleCollector, apply_profile, new_event_loop_factory, parse_cpu_list, run_engine
+
+
+@pytest.fixture
+def thresholds():
+    saved = gc.get_threshold()
+    yield
+    gc.set_threshold(*saved)
+
+
+def test_parse_cpu_list():
+    assert parse_cpu_list("") == set()
+    assert parse_cpu_list("2, 3") == {2, 3}
+    assert parse_cpu_list("0-2,5") == {0, 1, 2, 5}
+
+
+def test_latency_profile_runs_on_uvloop():
+    pytest.importorskip("uvloop")
+    seen = []
+
+    async def main():
+        seen.append(type(asyncio.get_running_loop()).__module__)
+
+    assert new_event_loop_factory("off") is None
+    run_engine(main(), "latency")
+    assert seen[0].startswith("uvloop")
+
+
+async def test_missing_uvloop_is_reported_once_logging_is_up(caplog):
+    try:
+        applied = apply_profile("latency")
+    finally:
+        gc.unfreeze()
+    assert applied[0] == "loop=asyncio"
+    assert "runtime.uvloop_unavailable" in [record.getMessage() for record in caplog.records]
+
+
+async def test_full_collection_waits_for_a_quiet_gap(thresholds):
+    activity = [0]
+    collector = IdleCollector(activity=lambda: activity[0], interval_ms=5, max_defer_s=60)
+    collector.start()
+    try:
+        gc.collect(1)  # leaves a full collection pending
+        for _ in range(15):
+            activity[0] += 1
+            await asyncio.sleep(0.002)
+        busy_runs = collector.idle_collections
+        await asyncio.sleep(0.03)
+    finally:
+        await collector.close()
+    assert busy_runs == 0
+    assert collector.idle_collections == 1 and gc.get_count()[2] == 0
+
+
+async def test_full_collection_is_forced_after_the_deadline(thresholds):
+    collector = IdleCollector(activity=lambda: 0, busy=lambda: True, interval_ms=5, max_defer_s=0.01)
+    collector.start()
+    try:
+        gc.collect(1)
+        await asyncio.sleep(0.05)
+    finally:
+        await collector.close()
+    assert collector.idle_collections == 0 and collector.forced_collections >= 1
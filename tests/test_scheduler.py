@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+from triarb.engine.scheduler import OpportunityScheduler
+from triarb.engine.signals import Opportunity
+from triarb.engine.triangle import Triangle, TriangleLeg
+from triarb.metrics import Tick
+
+
+def opportunity(name, net_bps, signal_ns=0):
+    triangle = Triangle(
+        (
+            TriangleLeg(f"{name}/USDT", "USDT", name),
+            TriangleLeg(f"{name}/BTC", name, "BTC"),
+            TriangleLeg("BTC/USDT", "BTC", "USDT"),
+        )
+    )
+    tick = None
+    if signal_ns:
+        tick = Tick(0, signal_ns, signal_ns)
+        tick.signal_ns = signal_ns
+    return Opportunity(triangle=triangle, gross_bps=net_bps + 15, net_bps=net_bps, notional_quote=100, tick=tick)
+
+
+class RecordingExecutor:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.order = []
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, opp):
+        self.order.append(opp.triangle.legs[0].to_asset)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+
+
+async def drain(scheduler):
+    while scheduler.queued() or scheduler.in_flight():
+        await asyncio.sleep(0.005)
+
+
+async def test_best_net_edge_runs_first_and_stale_or_replaced_signals_are_dropped():
+    executor = RecordingExecutor()
+    scheduler = OpportunityScheduler(executor, max_concurrency=1, ttl_ms=1_000)
+    stale = opportunity("OLD", 90, signal_ns=time.time_ns() - 5_000_000_000)
+    scheduler.submit([opportunity("ETH", 12), opportunity("SOL", 30), opportunity("BNB", 20), stale])
+    scheduler.submit([opportunity("ETH", 25)])  # newer signal for ETH replaces the queued one
+    scheduler.start()
+    await drain(scheduler)
+    await scheduler.close()
+
+    assert executor.order == ["SOL", "ETH", "BNB"]
+    assert scheduler.expired == 1 and scheduler.superseded == 1
+
+
+async def test_dispatches_up_to_max_concurrency():
+    executor = RecordingExecutor(delay=0.02)
+    scheduler = OpportunityScheduler(executor, max_concurrency=2, ttl_ms=1_000)
+    scheduler.start()
+    scheduler.submit([opportunity(name, 20 + idx) for idx, name in enumerate(["A", "B", "C", "D", "E"])])
+    await drain(scheduler)
+    await scheduler.close()
+
+    assert executor.peak == 2
+    assert executor.order == ["E", "D", "C", "B", "A"]
+
+
+async def test_cancelled_opportunity_is_not_dispatched_behind_a_running_cycle():
+    executor = RecordingExecutor(delay=0.03)
+    scheduler = OpportunityScheduler(executor, max_concurrency=1, ttl_ms=1_000)
+    dead = opportunity("DEAD", 10)
+    scheduler.submit([opportunity("RUN", 50), dead])
+    scheduler.start()
+    await asyncio.sleep(0.01)  # RUN executing, DEAD queued behind it
+    scheduler.cancel([dead.triangle])
+    await drain(scheduler)
+    await scheduler.close()
+
+    assert executor.order == ["RUN"]
+    assert scheduler.cancelled == 1
@@ -0,0 +1,99 @@
+import asyncio
+import multiprocessing as mp
+import time
+
+from triarb.marketdata.shm import SharedBookWriter, SharedOrderBookStore
+from triarb.metrics import Tick
+
+SYMBOLS = ["BTC/USDT", "ETH/BTC", "ETH/USDT"]
+
+
+def _write_from_child(name, symbols, doorbell=None):
+    writer = SharedBookWriter(name, symbols, depth=5, doorbell=doorbell)
+    for step in range(100):
+        writer.upsert("ETH/BTC", [(0.05 + step * 1e-5, 1.0)], [(0.0501 + step * 1e-5, 2.0)])
+    writer.close()
+
+
+def test_reader_applies_writer_updates_and_notifies_listeners():
+    store = SharedOrderBookStore.create(SYMBOLS, depth=5)
+    writer = SharedBookWriter(store.name, SYMBOLS, depth=5)
+    seen = []
+    store.subscribe(lambda symbol: seen.append((symbol, store.tick)))
+    try:
+        writer.upsert("ETH/USDT", [(10.0, 1.0), (9.9, 2.0)], [(10.1, 3.0)])
+        writer.tick = Tick(1_700_000_000_000, 1_700_000_000_001_000_000, 1_700_000_000_001_050_000)
+        writer.upsert("ETH/USDT", [(10.2, 1.0)], [(10.3, 3.0)])
+        assert store.poll() == 1
+        assert store.poll() == 0
+        assert store.updates == 1
+
+        assert [symbol for symbol, _ in seen] == ["ETH/USDT"]
+        tick = seen[0][1]
+        assert tick.recv_ns == 1_700_000_000_001_000_000 and tick.store_ns >= tick.parse_ns
+        assert store.tick is None
+        assert store.top_of_book("ETH/USDT") == (10.2, 10.3)
+        assert store.best_bid[store.symbol_ids["ETH/USDT"]] == 10.2
+        assert store.top_of_book("BTC/USDT") is None
+        assert store.cumulative_depth("ETH/USDT", "bid", 5) == 1.0
+    finally:
+        writer.close()
+        store.close()
+
+
+def test_slots_of_a_dead_writer_are_cleared_and_reusable():
+    store = SharedOrderBookStore.create(SYMBOLS, depth=5)
+    writer = SharedBookWriter(store.name, SYMBOLS, depth=5)
+    try:
+        writer.upsert("ETH/BTC", [(0.05, 1.0)], [(0.051, 1.0)])
+        store.poll()
+        store.region.seq[1] += 1  # killed halfway through the next upsert
+        store.clear_slots(["ETH/BTC"])
+        assert store.poll() == 1 and store.top_of_book("ETH/BTC") is None
+        writer.upsert("ETH/BTC", [(0.06, 1.0)], [(0.061, 1.0)])
+        assert store.poll() == 1 and store.top_of_book("ETH/BTC") == (0.06, 0.061)
+    finally:
+        writer.close()
+        store.close()
+
+
+def test_books_written_by_another_process_are_visible():
+    store = SharedOrderBookStore.create(SYMBOLS, depth=5)
+    try:
+        child = mp.get_context("spawn").Process(target=_write_from_child, args=(store.name, SYMBOLS))
+        child.start()
+        child.join(30)
+        assert child.exitcode == 0
+        assert store.poll() == 1
+        bid, ask = store.top_of_book("ETH/BTC")
+        assert abs(bid - (0.05 + 99e-5)) < 1e-12 and abs(ask - (0.0501 + 99e-5)) < 1e-12
+    finally:
+        store.close()
+
+
+async def test_idle_reader_sleeps_until_a_writer_rings():
+    store = SharedOrderBookStore.create(SYMBOLS, depth=5)
+    applied = asyncio.Event()
+    store.subscribe(lambda symbol: applied.set())
+    polls = []
+    poll = store.poll
+    store.poll = lambda: polls.append(1) or poll()
+    task = asyncio.create_task(store.run(interval_ms=10_000))
+    try:
+        await asyncio.sleep(0.05)
+        assert store.region.waiting[0] == 1
+        assert len(polls) == 2  # the empty poll and the re-check after raising the flag
+
+        child = mp.get_context("spawn").Process(
+            target=_write_from_child, args=(store.name, SYMBOLS, store.doorbell)
+        )
+        started = time.monotonic()
+        child.start()
+        await asyncio.wait_for(applied.wait(), 30)
+        await asyncio.to_thread(child.join, 30)
+        assert child.exitcode == 0
+        assert time.monotonic() - started < 10  # woken by the ring, not the 10 s bound
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        store.close()
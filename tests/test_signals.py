@@ -17,3 +17,56 @@ def test_signal_no_data():
     store = OrderBookStore()
     engine = SignalEngine([make_triangle()], store)
     assert engine.evaluate() == []
+
+
+def seed_profitable_books(store):
+    store.upsert("BTC/USDT", [(99.9, 5)], [(100, 5)])
+    store.upsert("ETH/BTC", [(0.0499, 50)], [(0.05, 50)])
+    store.upsert("ETH/USDT", [(5.5, 50)], [(5.51, 50)])
+
+
+def test_evaluate_symbol_only_touches_indexed_triangles():
+    store = OrderBookStore()
+    seed_profitable_books(store)
+    engine = SignalEngine([make_triangle()], store)
+    assert len(engine.evaluate_symbol("ETH/BTC")) == 1
+    assert engine.evaluate_symbol("SOL/USDT") == []
+
+
+async def test_event_mode_coalesces_updates():
+    store = OrderBookStore()
+    engine = SignalEngine([make_triangle()], store)
+    engine.listen()
+    seed_profitable_books(store)
+    store.upsert("ETH/USDT", [(5.6, 50)], [(5.61, 50)])
+    opportunities = await engine.wait_opportunities()
+    assert len(opportunities) == 1
+    assert opportunities[0].gross_bps > 1000
+    engine.close()
+
+
+async def test_event_mode_drops_signals_that_lose_their_edge_before_draining():
+    store = OrderBookStore()
+    engine = SignalEngine([make_triangle()], store)
+    engine.listen()
+    seed_profitable_books(store)
+    assert engine.pending() == 1
+    store.upsert("ETH/USDT", [(5.0, 50)], [(5.01, 50)])  # edge gone before the drain
+    assert engine.pending() == 0
+    engine.close()
+
+
+async def test_invalidations_reach_a_consumer_after_the_drain():
+    store = OrderBookStore()
+    engine = SignalEngine([make_triangle()], store)
+    withdrawn = []
+    engine.on_invalidate = withdrawn.extend
+    engine.listen()
+    seed_profitable_books(store)
+    await engine.wait_opportunities()
+    store.upsert("ETH/USDT", [(5.6, 50)], [(5.61, 50)])  # still profitable
+    assert withdrawn == []
+    store.upsert("ETH/USDT", [(5.0, 50)], [(5.01, 50)])
+    store.upsert("ETH/USDT", [(4.9, 50)], [(4.91, 50)])  # reported once
+    assert withdrawn == [make_triangle()]
+    engine.close()
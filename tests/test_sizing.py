@@ -0,0 +1,52 @@
+import pytest
+
+from triarb.engine.signals import SignalEngine
+from triarb.engine.sizing import LegLadder, optimal_size
+from triarb.engine.triangle import Triangle, TriangleLeg
+from triarb.marketdata.orderbook import OrderBookStore
+
+TRIANGLE = Triangle(
+    (
+        TriangleLeg("BTC/USDT", "USDT", "BTC"),
+        TriangleLeg("ETH/BTC", "BTC", "ETH"),
+        TriangleLeg("ETH/USDT", "ETH", "USDT"),
+    )
+)
+
+
+def make_store():
+    store = OrderBookStore()
+    store.upsert("BTC/USDT", [(99, 5)], [(100, 1), (115, 10)])
+    store.upsert("ETH/BTC", [(0.049, 100)], [(0.05, 100)])
+    store.upsert("ETH/USDT", [(5.5, 100)], [(5.6, 100)])
+    return store
+
+
+def test_ladder_forward_and_inverse_walk_levels():
+    store = make_store()
+    ladder = LegLadder.from_book(store.books["BTC/USDT"], buy=True, keep=1.0)
+    assert ladder.forward(100) == pytest.approx(1.0)
+    assert ladder.forward(215) == pytest.approx(2.0)
+    assert ladder.inverse(2.0) == pytest.approx(215)
+
+
+def test_optimal_size_stops_at_last_profitable_level():
+    store = make_store()
+    ladders = [
+        LegLadder.from_book(store.books["BTC/USDT"], True, 1.0),
+        LegLadder.from_book(store.books["ETH/BTC"], True, 1.0),
+        LegLadder.from_book(store.books["ETH/USDT"], False, 1.0),
+    ]
+    result = optimal_size(ladders, max_notional=20_000)
+    assert result.notional_quote == pytest.approx(100)
+    assert result.profit_quote == pytest.approx(10)
+    assert optimal_size(ladders, max_notional=50).notional_quote == pytest.approx(50)
+
+
+def test_signal_engine_emits_depth_sized_notional():
+    engine = SignalEngine([TRIANGLE], make_store())
+    engine.settings = engine.settings.model_copy(update={"depth_sizing": True})
+    (opp,) = engine.evaluate()
+    keep = 1 - (engine.fee + engine.slip)
+    assert opp.notional_quote == pytest.approx(100)
+    assert opp.expected_profit_quote == pytest.approx(100 * (1.1 * keep**3 - 1))
@@ -0,0 +1,25 @@
+import subprocess
+import sys
+
+from triarb.metrics import StartupReport
+
+
+def _loaded_after(module: str, candidates):
+    code = f"import sys, {module}; print(' '.join(m for m in {list(candidates)!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return result.stdout.split()
+
+
+def test_entry_point_does_not_import_optional_heavy_modules():
+    heavy = ["ccxt", "sqlalchemy", "redis", "numpy", "aiohttp"]
+    assert _loaded_after("triarb.main", heavy) == []
+    assert _loaded_after("triarb", heavy + ["pydantic_settings"]) == []
+
+
+def test_startup_report_keeps_first_mark():
+    report = StartupReport(0)
+    report.mark("imports")
+    first = report.phases["imports"]
+    report.mark("imports")
+    assert report.phases["imports"] == first
+    assert report.values() == [(("imports",), first / 1e3)]
@@ -0,0 +1,21 @@
+from triarb.marketdata.decoder import FrameDecoder
+from triarb.marketdata.orderbook import OrderBookStore
+from triarb.marketdata.synthetic import SyntheticMarket
+
+
+def test_synthetic_market_is_deterministic():
+    first = list(SyntheticMarket(5, seed=3).frames(20))
+    second = list(SyntheticMarket(5, seed=3).frames(20))
+    assert first == second
+    assert len(SyntheticMarket(5).triangles) == 20
+
+
+def test_synthetic_frames_decode_into_store():
+    market = SyntheticMarket(3, levels=4)
+    store = market.populate(OrderBookStore(depth=4))
+    decoder = FrameDecoder(market.symbols)
+    for frame in market.frames(50):
+        update = decoder.decode(frame)
+        store.upsert(update.symbol, update.bids, update.asks)
+    assert all(store.top_of_book(symbol) for symbol in market.symbols)
+    assert store.cumulative_depth(market.symbols[0], "ask", 4) > 0
@@ -1,5 +1,5 @@
 from triarb.engine.signals import Opportunity
-from triarb.engine.triangle import Triangle, TriangleLeg
+from triarb.engine.triangle import Triangle, TriangleLeg, discover_triangles, load_triangle_index
 
 
 def test_triangle_symbols():
@@ -10,3 +10,56 @@ def test_triangle_symbols():
     )
     tri = Triangle(legs)
     assert tri.symbols == ["BTC/USDT", "ETH/BTC", "ETH/USDT"]
+
+
+MARKETS = [
+    {"symbol": "BTC/USDT", "base": "BTC", "quote": "USDT"},
+    {"symbol": "ETH/USDT", "base": "ETH", "quote": "USDT"},
+    {"symbol": "BNB/USDT", "base": "BNB", "quote": "USDT"},
+    {"symbol": "ETH/BTC", "base": "ETH", "quote": "BTC"},
+    {"symbol": "BNB/BTC", "base": "BNB", "quote": "BTC"},
+    {"symbol": "XRP/BTC", "base": "XRP", "quote": "BTC", "active": False},
+]
+
+
+def test_discover_triangles_orients_legs_from_market_symbols():
+    triangles = discover_triangles("USDT", MARKETS)
+    paths = {tuple(leg.from_asset for leg in tri.legs): tri for tri in triangles}
+    assert len(triangles) == 4
+    tri = paths[("USDT", "ETH", "BTC")]
+    assert tri.symbols == ["ETH/USDT", "ETH/BTC", "BTC/USDT"]
+    assert all(leg.symbol != "USDT/BNB" for t in triangles for leg in t.legs)
+
+
+def test_triangle_index_cache_roundtrip_and_invalidation(tmp_path, monkeypatch):
+    from triarb.engine import triangle as triangle_mod
+
+    cache = tmp_path / "triangles.json"
+    first = load_triangle_index("USDT", MARKETS, cache)
+    assert cache.exists()
+
+    calls = []
+    monkeypatch.setattr(triangle_mod, "discover_triangles", lambda *a: calls.append(a) or [])
+    assert load_triangle_index("USDT", MARKETS, cache) == first
+    assert calls == []
+
+    load_triangle_index("USDT", MARKETS[:-2], cache)
+    assert len(calls) == 1
+
+
+def test_damaged_triangle_cache_is_rebuilt(tmp_path):
+    import json
+
+    cache = tmp_path / "triangles.json"
+    first = load_triangle_index("USDT", MARKETS, cache)
+    payload = json.loads(cache.read_text())
+    damaged = [
+        {"fingerprint": payload["fingerprint"]},
+        {**payload, "triangles": [[len(payload["symbols"]) * 2, 0, 1]]},
+        {**payload, "triangles": [[0, 1]]},
+        {**payload, "symbols": ["BTCUSDT"] * len(payload["symbols"])},
+    ]
+    for broken in damaged:
+        cache.write_text(json.dumps(broken))
+        assert load_triangle_index("USDT", MARKETS, cache) == first
+        assert json.loads(cache.read_text()) == payload
@@ -0,0 +1,63 @@
+import asyncio
+
+from triarb.data.writer import OPPORTUNITY_COLUMNS, WriteBehindWriter
+
+
+class RecordingSink:
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, table, columns, rows):
+        self.batches.append((table, tuple(columns), list(rows)))
+
+
+async def test_rows_are_batched_per_table():
+    sink = RecordingSink()
+    writer = WriteBehindWriter(sink, flush_rows=3, flush_interval_ms=10_000)
+    writer.start()
+    for idx in range(3):
+        await writer.record_opportunity(f"t{idx}", 50.0, 20.0, 1_000.0)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert len(sink.batches) == 1
+    table, columns, rows = sink.batches[0]
+    assert table == "opportunities" and columns == OPPORTUNITY_COLUMNS
+    assert [row[0] for row in rows] == ["t0", "t1", "t2"]
+    await writer.close()
+
+
+async def test_close_flushes_partial_batch_and_trades():
+    sink = RecordingSink()
+    writer = WriteBehindWriter(sink, flush_rows=100, flush_interval_ms=10_000)
+    writer.start()
+    await writer.record_opportunity("t", 50.0, 20.0, 1_000.0)
+    await writer.record_trade(1, {"legs": 3}, 1.5)
+    await writer.close()
+
+    assert sorted(table for table, _, _ in sink.batches) == ["opportunities", "trades"]
+    assert writer.written == 2 and writer.queue_depth() == 0
+    assert writer.last_lag_ns > 0
+
+
+async def test_full_queue_sheds_rows_without_blocking():
+    writer = WriteBehindWriter(RecordingSink(), max_queue=2, overflow="drop")
+    accepted = [await writer.record_opportunity("t", 1.0, 1.0, 1.0) for _ in range(3)]
+    assert accepted == [True, True, False]
+    assert writer.dropped == 1
+
+
+async def test_failed_flush_is_counted_and_writer_keeps_running():
+    class FailingSink(RecordingSink):
+        async def __call__(self, table, columns, rows):
+            if table == "trades":
+                raise RuntimeError("db down")
+            await super().__call__(table, columns, rows)
+
+    sink = FailingSink()
+    writer = WriteBehindWriter(sink, flush_interval_ms=1)
+    writer.start()
+    await writer.record_trade(1, {}, 0.0)
+    await writer.record_opportunity("t", 1.0, 1.0, 1.0)
+    await writer.close()
+    assert writer.failed == 1 and writer.written == 1
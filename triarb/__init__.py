@@ -1,5 +1,20 @@
 """Triangular arbitrage package."""
 
-from .config import Settings
+from __future__ import annotations
+
+import time
+from typing import Any
+
+# Origin of the startup report (``triarb.metrics.STARTUP``): the first thing the package does.
+STARTED_NS = time.perf_counter_ns()
 
 __all__ = ["Settings"]
+
+
+def __getattr__(name: str) -> Any:
+    # Settings pulls in pydantic-settings; load it only when asked for.
+    if name == "Settings":
+        from .config import Settings
+
+        return Settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
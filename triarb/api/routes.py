@@ -1,7 +1,26 @@
-from fastapi import APIRouter
+from __future__ import annotations
+
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from triarb.api.state import EngineState, cycle_dict, opportunity_dict
+from triarb.config import get_settings
 
 router = APIRouter()
 
+# Idle SSE streams send a comment this often, which also notices clients that went away.
+SSE_KEEPALIVE_S = 15.0
+
+
+def _engine(request: Request) -> EngineState:
+    state = request.app.state.engine
+    if state is None:
+        raise HTTPException(status_code=503, detail="Engine state is only available in-process (ADMIN_EMBEDDED=true).")
+    return state
+
 
 @router.get("/health")
 async def health():
@@ -10,4 +29,76 @@ async def health():
 
 @router.get("/controls")
 async def controls():
-    return {"paper_mode": True}
+    return {"paper_mode": get_settings().paper_mode}
+
+
+@router.get("/books")
+async def books(request: Request):
+    return _engine(request).tops()
+
+
+@router.get("/books/{base}/{quote}")
+async def book(request: Request, base: str, quote: str, depth: int = Query(default=5, ge=1, le=100)):
+    result = _engine(request).book(f"{base.upper()}/{quote.upper()}", depth)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Unknown symbol.")
+    return result
+
+
+@router.get("/opportunities/recent")
+async def recent_opportunities(request: Request, limit: int = Query(default=50, ge=1, le=10_000)):
+    return [opportunity_dict(opp) for opp in _engine(request).opportunities.latest(limit)]
+
+
+@router.get("/cycles/recent")
+async def recent_cycles(request: Request, limit: int = Query(default=50, ge=1, le=10_000)):
+    return [cycle_dict(record) for record in _engine(request).cycles.latest(limit)]
+
+
+@router.get("/stats")
+async def stats(request: Request):
+    return _engine(request).stats()
+
+
+@router.get("/opportunities/stream")
+async def stream_opportunities(request: Request):
+    """Server-sent events, one ``data:`` line per opportunity from the moment of connection."""
+    ring = _engine(request).opportunities
+
+    async def events():
+        cursor = ring.seq
+        while not await request.is_disconnected():
+            try:
+                await asyncio.wait_for(ring.wait(cursor), SSE_KEEPALIVE_S)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            cursor, batch = ring.since(cursor)
+            yield "".join(f"data: {json.dumps(opportunity_dict(opp))}\n\n" for opp in batch)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/profile")
+async def profile(
+    request: Request,
+    seconds: float = Query(default=5, gt=0, le=60),
+    interval_ms: float = Query(default=5, ge=1, le=1000),
+    timings: bool = False,
+    format: str = Query(default="collapsed", pattern="^(collapsed|json)$"),
+):
+    """Sample the engine loop; collapsed stacks by default, or JSON with section timings."""
+    state = _engine(request)
+    try:
+        sampler, sections = await state.profile(seconds, interval_ms, timings)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if format == "collapsed":
+        return PlainTextResponse(sampler.collapsed())
+    return {
+        "seconds": seconds,
+        "interval_ms": interval_ms,
+        "samples": sampler.samples,
+        "stacks": dict(sampler.stacks.most_common()),
+        "timings": sections,
+    }
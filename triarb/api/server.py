@@ -1,6 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
 from fastapi import FastAPI
 
 from triarb.api.routes import router
+from triarb.api.state import EngineState
+
+log = logging.getLogger(__name__)
+
+
+def create_app(state: EngineState | None = None) -> FastAPI:
+    """Admin app; engine endpoints answer 503 unless ``state`` is given (in-process mode)."""
+    app = FastAPI(title="Triangular Arbitrage Admin")
+    app.state.engine = state
+    app.include_router(router)
+    return app
+
+
+app = create_app()
+
+
+class EmbeddedAdminServer:
+    """Runs the admin app on the engine's own event loop (``ADMIN_EMBEDDED=true``)."""
+
+    def __init__(self, state: EngineState, host: str, port: int):
+        import uvicorn
+
+        class _Server(uvicorn.Server):
+            def install_signal_handlers(self) -> None:
+                pass  # the engine owns SIGINT/SIGTERM
+
+        # Open SSE streams never finish on their own; give them a second at shutdown.
+        config = uvicorn.Config(
+            create_app(state),
+            host=host,
+            port=port,
+            loop="none",
+            log_level="warning",
+            timeout_graceful_shutdown=1,
+        )
+        self.server = _Server(config)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.server.serve())
+            log.info("admin.start", extra={"port": self.server.config.port})
 
-app = FastAPI(title="Triangular Arbitrage Admin")
-app.include_router(router)
+    async def close(self) -> None:
+        if self._task is not None:
+            self.server.should_exit = True
+            await self._task
+            self._task = None
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+from triarb.engine.executor import CycleRecord
+from triarb.engine.signals import Opportunity
+from triarb.marketdata.orderbook import OrderBookStore
+from triarb.metrics import METRICS, STARTUP
+from triarb.profiling import SectionTimers, StackSampler
+from triarb.utils.ring import RingBuffer
+
+
+class EngineState:
+    """What the in-process admin API can see of a running engine.
+
+    The API shares the engine's event loop, so handlers read the store arrays and ring
+    buffers directly: no locks, and only the levels a response needs are copied out.
+    """
+
+    def __init__(
+        self,
+        store: OrderBookStore,
+        opportunities: RingBuffer[Opportunity],
+        cycles: RingBuffer[CycleRecord],
+    ):
+        self.store = store
+        self.opportunities = opportunities
+        self.cycles = cycles
+        self._stats: Dict[str, Callable[[], Any]] = {}
+        self.timers = SectionTimers()
+        self.profiling = False
+
+    @classmethod
+    def create(cls, store: OrderBookStore, capacity: int) -> "EngineState":
+        return cls(store, RingBuffer(capacity), RingBuffer(capacity))
+
+    def add_stats(self, name: str, fn: Callable[[], Any]) -> None:
+        """Include ``fn()`` under ``name`` in ``/stats``."""
+        self._stats[name] = fn
+
+    def add_timing(self, label: str, owner: Any, attribute: str) -> None:
+        """Report wall/CPU time of ``owner.attribute`` in ``/profile?timings=true``."""
+        self.timers.add(label, owner, attribute)
+
+    async def profile(
+        self, seconds: float, interval_ms: float, timings: bool = False
+    ) -> Tuple[StackSampler, Dict[str, Dict[str, float]] | None]:
+        """Sample the loop thread (the caller's) for ``seconds`` without blocking it."""
+        if self.profiling:
+            raise RuntimeError("A profile is already running.")
+        self.profiling = True
+        sampler = StackSampler(threading.get_ident(), interval_ms)
+        if timings:
+            self.timers.install()
+        try:
+            await asyncio.to_thread(sampler.run, seconds)
+        finally:
+            if timings:
+                self.timers.remove()
+            self.profiling = False
+        return sampler, self.timers.report() if timings else None
+
+    def tops(self) -> Dict[str, Dict[str, float | None]]:
+        bids, asks = self.store.best_bid, self.store.best_ask
+        return {
+            symbol: {"bid": _finite(bids[idx]), "ask": _finite(asks[idx])}
+            for symbol, idx in self.store.symbol_ids.items()
+        }
+
+    def book(self, symbol: str, depth: int) -> Dict[str, Any] | None:
+        book = self.store.books.get(symbol)
+        if book is None:
+            return None
+        n_bids, n_asks = min(depth, book.n_bids), min(depth, book.n_asks)
+        return {
+            "symbol": symbol,
+            "bids": [[book.bid_px[i], book.bid_qty[i]] for i in range(n_bids)],
+            "asks": [[book.ask_px[i], book.ask_qty[i]] for i in range(n_asks)],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        stages = {
+            stage: {
+                "count": hist.count,
+                "mean_ms": hist.sum_ns / hist.count / 1e6 if hist.count else 0.0,
+                "p50_ms": hist.quantile(0.5) / 1e6,
+                "p99_ms": hist.quantile(0.99) / 1e6,
+            }
+            for stage, hist in METRICS.stages.items()
+        }
+        stats: Dict[str, Any] = {
+            "counters": dict(METRICS.counters),
+            "stages": stages,
+            "startup_ms": dict(STARTUP.phases),
+            "opportunities_seen": self.opportunities.seq,
+            "cycles_seen": self.cycles.seq,
+        }
+        for name, fn in self._stats.items():
+            stats[name] = fn()
+        return stats
+
+
+def opportunity_dict(opp: Opportunity) -> Dict[str, Any]:
+    return {
+        "triangle": ">".join(opp.triangle.symbols),
+        "gross_bps": opp.gross_bps,
+        "net_bps": opp.net_bps,
+        "notional_quote": opp.notional_quote,
+        "expected_profit_quote": opp.expected_profit_quote,
+        "signal_ns": opp.tick.signal_ns if opp.tick is not None else None,
+    }
+
+
+def cycle_dict(record: CycleRecord) -> Dict[str, Any]:
+    return {
+        "triangle": ">".join(record.triangle.symbols),
+        "net_bps": record.net_bps,
+        "notional_quote": record.notional_quote,
+        "status": record.status,
+        "started_ns": record.started_ns,
+        "duration_ms": (record.finished_ns - record.started_ns) / 1e6,
+        "error": record.error,
+        "residual_asset": record.residual_asset,
+        "residual_amount": record.residual_amount,
+    }
+
+
+def _finite(value: float) -> float | None:
+    return value if math.isfinite(value) else None
+
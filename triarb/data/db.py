@@ -1,7 +1,18 @@
-from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
-from triarb.config import get_settings
+from __future__ import annotations
 
-settings = get_settings()
+from functools import lru_cache
 
-engine: AsyncEngine = create_async_engine(settings.db_url, future=True, echo=False)
-SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from triarb.config import get_db_url
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """The shared async engine, created (and the DB host resolved) on first use."""
+    return create_async_engine(get_db_url(), future=True, echo=False)
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(get_engine(), expire_on_commit=False)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, Float, Integer, String
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Float, Index, String
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -10,22 +10,35 @@ class Base(DeclarativeBase):
     pass
 
 
+# Both tables are range-partitioned by day on ``created_at`` (see migration 202511150001 and
+# ``triarb.data.retention``), so the partition key is part of the primary key.
+PARTITION_OPTIONS = {"postgresql_partition_by": "RANGE (created_at)"}
+
+
 class OpportunityModel(Base):
     __tablename__ = "opportunities"
+    __table_args__ = (
+        Index("ix_opportunities_created_at", "created_at", postgresql_using="brin"),
+        PARTITION_OPTIONS,
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     triangle_hash: Mapped[str] = mapped_column(String(128), index=True)
     gross_bps: Mapped[float] = mapped_column(Float)
     net_bps: Mapped[float] = mapped_column(Float)
     notional_quote: Mapped[float] = mapped_column(Float)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, default=datetime.utcnow)
 
 
 class TradeModel(Base):
     __tablename__ = "trades"
+    __table_args__ = (
+        Index("ix_trades_created_at", "created_at", postgresql_using="brin"),
+        PARTITION_OPTIONS,
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    opportunity_id: Mapped[int] = mapped_column(Integer, index=True)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    opportunity_id: Mapped[int] = mapped_column(BigInteger, index=True)
     details: Mapped[dict] = mapped_column(JSON)
     pnl_quote: Mapped[float] = mapped_column(Float, default=0.0)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, default=datetime.utcnow)
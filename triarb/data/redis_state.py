@@ -1,8 +1,22 @@
-from typing import Any, Dict
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+import time
+from typing import Any, Dict, Tuple
 
 import redis.asyncio as redis
 
 from triarb.config import get_settings
+from triarb.marketdata.orderbook import OrderBookStore
+from triarb.metrics import METRICS
+
+log = logging.getLogger(__name__)
+
+# update time (ns since epoch), best bid, bid qty, best ask, ask qty: 40 bytes per book.
+BOOK_RECORD = struct.Struct("<qdddd")
+BOOK_KEY_PREFIX = "book:"
 
 
 class RedisState:
@@ -18,3 +32,115 @@ class RedisState:
     async def close(self) -> None:
         if isinstance(self.client, redis.Redis):
             await self.client.close()
+
+
+def decode_book(payload: bytes) -> Tuple[int, float, float, float, float]:
+    return BOOK_RECORD.unpack(payload)
+
+
+class RedisPublisher:
+    """Coalesces state updates per key and writes them in one pipeline per window.
+
+    ``publish``/``publish_book`` only record the key; repeated updates within ``window_ms``
+    overwrite each other, and book records are encoded from the store at flush time so only
+    the latest top of book is serialised. One flush runs at a time, which keeps per-key
+    writes ordered.
+    """
+
+    def __init__(self, client: Any, store: OrderBookStore | None = None, window_ms: float = 5.0):
+        self.client = client
+        self.store = store
+        self.window = window_ms / 1000
+        self.flushes = 0
+        self.published = 0
+        self.coalesced = 0
+        self.last_batch = 0
+        self._values: Dict[str, bytes] = {}
+        self._books: Dict[str, int] = {}
+        self._handle: asyncio.TimerHandle | None = None
+        self._flushing: asyncio.Task | None = None
+        self._closed = False
+
+    @classmethod
+    def from_settings(cls, store: OrderBookStore | None = None) -> "RedisPublisher":
+        settings = get_settings()
+        client = redis.from_url(settings.redis_url, decode_responses=False)
+        return cls(client, store, settings.redis_publish_window_ms)
+
+    def publish(self, key: str, value: bytes) -> None:
+        if key in self._values:
+            self.coalesced += 1
+        self._values[key] = value
+        self._schedule()
+
+    def publish_book(self, symbol: str) -> None:
+        """Book listener: mark ``symbol`` dirty; its top of book is read when flushing."""
+        if symbol in self._books:
+            self.coalesced += 1
+        self._books[symbol] = time.time_ns()
+        self._schedule()
+
+    def attach(self) -> None:
+        if self.store is not None:
+            self.store.subscribe(self.publish_book)
+
+    def pending(self) -> int:
+        return len(self._values) + len(self._books)
+
+    def _schedule(self) -> None:
+        if self._handle is None and self._flushing is None and not self._closed:
+            self._handle = asyncio.get_running_loop().call_later(self.window, self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._handle = None
+        self._flushing = asyncio.get_running_loop().create_task(self.flush())
+
+    async def flush(self) -> int:
+        values, self._values = self._values, {}
+        books, self._books = self._books, {}
+        if self.store is not None:
+            pack = BOOK_RECORD.pack
+            for symbol, updated_ns in books.items():
+                top = self.store.top_of_book(symbol)
+                if top is None:
+                    continue
+                book = self.store.books[symbol]
+                values[BOOK_KEY_PREFIX + symbol] = pack(
+                    updated_ns, top[0], book.bid_qty[0], top[1], book.ask_qty[0]
+                )
+        try:
+            if values:
+                started = time.time_ns()
+                pipe = self.client.pipeline(transaction=False)
+                for key, value in values.items():
+                    pipe.set(key, value)
+                await pipe.execute()
+                METRICS.observe("redis_flush", started, time.time_ns())
+                self.flushes += 1
+                self.published += len(values)
+                self.last_batch = len(values)
+                METRICS.inc("redis_flushes")
+                METRICS.inc("redis_keys_published", len(values))
+        except Exception as exc:  # noqa: BLE001
+            # Latest-value state: the next update for a key supersedes the lost write.
+            METRICS.inc("redis_flush_failures")
+            log.warning("redis.flush_failed", extra={"keys": len(values), "error": str(exc)})
+        finally:
+            self._flushing = None
+            if self._values or self._books:
+                self._schedule()
+        return len(values)
+
+    async def close(self) -> None:
+        """Stop listening, write whatever is still pending and close the client."""
+        self._closed = True
+        if self.store is not None:
+            self.store.unsubscribe(self.publish_book)
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._flushing is not None:
+            await self._flushing
+        if self._values or self._books:
+            await self.flush()
+        await self.client.close()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from triarb.config import get_settings
+
+log = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("opportunities", "trades")
+
+
+def partition_name(table: str, day: date) -> str:
+    return f"{table}_p{day:%Y%m%d}"
+
+
+def partition_day(table: str, name: str) -> date | None:
+    """Inverse of ``partition_name``; None for the default partition or foreign tables."""
+    prefix = f"{table}_p"
+    if not name.startswith(prefix):
+        return None
+    try:
+        return datetime.strptime(name[len(prefix) :], "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def missing_partitions(table: str, existing: Iterable[str], today: date, premake_days: int) -> List[date]:
+    """Days from ``today`` through ``today + premake_days`` that have no partition yet."""
+    have = {partition_day(table, name) for name in existing}
+    days = (today + timedelta(days=offset) for offset in range(premake_days + 1))
+    return [day for day in days if day not in have]
+
+
+def expired_partitions(table: str, existing: Iterable[str], today: date, retain_days: int) -> List[str]:
+    """Partitions whose whole day range is older than ``retain_days``."""
+    cutoff = today - timedelta(days=retain_days)
+    expired = []
+    for name in existing:
+        day = partition_day(table, name)
+        if day is not None and day + timedelta(days=1) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+async def list_partitions(conn: AsyncConnection, table: str) -> List[str]:
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+    return [row[0] for row in result]
+
+
+async def create_partition(conn: AsyncConnection, table: str, day: date) -> None:
+    """Create the daily partition for ``day``, first moving any rows that landed in the
+    default partition for that range so the attach does not violate its constraint."""
+    name = partition_name(table, day)
+    lower, upper = day.isoformat(), (day + timedelta(days=1)).isoformat()
+    await conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)"))
+    await conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {table}_default "
+            f"WHERE created_at >= '{lower}' AND created_at < '{upper}' RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        )
+    )
+    await conn.execute(
+        text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')")
+    )
+    log.info("retention.partition_created", extra={"partition": name})
+
+
+async def maintain_partitions(
+    conn: AsyncConnection,
+    today: date,
+    retain_days: int,
+    premake_days: int,
+    tables: Sequence[str] = PARTITIONED_TABLES,
+    dry_run: bool = False,
+) -> List[str]:
+    """Premake upcoming daily partitions and drop expired ones; returns the dropped names."""
+    dropped: List[str] = []
+    cutoff = today - timedelta(days=retain_days)
+    for table in tables:
+        existing = await list_partitions(conn, table)
+        expired = expired_partitions(table, existing, today, retain_days)
+        if dry_run:
+            log.info("retention.plan", extra={"table": table, "drop": expired})
+            dropped.extend(expired)
+            continue
+        for day in missing_partitions(table, existing, today, premake_days):
+            await create_partition(conn, table, day)
+        for name in expired:
+            await conn.execute(text(f"DROP TABLE {name}"))
+            log.info("retention.partition_dropped", extra={"partition": name})
+            dropped.append(name)
+        await conn.execute(
+            text(f"DELETE FROM {table}_default WHERE created_at < :cutoff"),
+            {"cutoff": datetime.combine(cutoff, datetime.min.time())},
+        )
+    return dropped
+
+
+async def run_retention(engine: AsyncEngine, dry_run: bool = False) -> List[str]:
+    settings = get_settings()
+    async with engine.begin() as conn:
+        return await maintain_partitions(
+            conn,
+            datetime.utcnow().date(),
+            settings.partition_retention_days,
+            settings.partition_premake_days,
+            dry_run=dry_run,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Create upcoming and drop expired daily partitions.")
+    parser.add_argument("--dry-run", action="store_true", help="only report partitions that would be dropped")
+    args = parser.parse_args()
+
+    from triarb.data.db import get_engine
+
+    dropped = asyncio.run(run_retention(get_engine(), dry_run=args.dry_run))
+    print(f"{'would drop' if args.dry_run else 'dropped'} {len(dropped)} partitions: {', '.join(dropped)}")
+
+
+if __name__ == "__main__":
+    main()
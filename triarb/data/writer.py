@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from triarb.config import Settings
+from triarb.data.models import OpportunityModel, TradeModel
+from triarb.metrics import METRICS
+
+log = logging.getLogger(__name__)
+
+OPPORTUNITY_COLUMNS = ("triangle_hash", "gross_bps", "net_bps", "notional_quote", "created_at")
+TRADE_COLUMNS = ("opportunity_id", "details", "pnl_quote", "created_at")
+
+# (table name, column values in *_COLUMNS order, enqueue time in ns)
+Record = Tuple[str, Tuple[Any, ...], int]
+Sink = Callable[[str, Sequence[str], List[Tuple[Any, ...]]], Awaitable[None]]
+
+TABLES: Dict[str, Tuple[Table, Sequence[str]]] = {
+    OpportunityModel.__tablename__: (OpportunityModel.__table__, OPPORTUNITY_COLUMNS),
+    TradeModel.__tablename__: (TradeModel.__table__, TRADE_COLUMNS),
+}
+
+
+class DatabaseSink:
+    """Bulk-inserts a batch of rows in one round-trip.
+
+    On ``postgresql+asyncpg`` the batch is streamed with ``COPY``; other dialects fall back
+    to a multi-row ``INSERT``.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "asyncpg"
+
+    async def __call__(self, table: str, columns: Sequence[str], rows: List[Tuple[Any, ...]]) -> None:
+        async with self.engine.begin() as conn:
+            if self.copy:
+                raw = await conn.get_raw_connection()
+                if table == TradeModel.__tablename__:
+                    rows = [(opp_id, json.dumps(details), *rest) for opp_id, details, *rest in rows]
+                await raw.driver_connection.copy_records_to_table(table, records=rows, columns=list(columns))
+            else:
+                model, _ = TABLES[table]
+                await conn.execute(insert(model), [dict(zip(columns, row)) for row in rows])
+
+
+class WriteBehindWriter:
+    """Bounded in-memory queue of rows drained to the database by a background task.
+
+    Producers only enqueue; a single task groups queued rows per table and hands each group
+    to ``sink`` once ``flush_rows`` are waiting or ``flush_interval_ms`` has passed since the
+    first row of the batch. When the queue is full ``overflow="drop"`` sheds the row and
+    counts it, ``overflow="block"`` makes the producer wait for space.
+    """
+
+    def __init__(
+        self,
+        sink: Sink,
+        max_queue: int = 10_000,
+        flush_rows: int = 500,
+        flush_interval_ms: int = 250,
+        overflow: str = "drop",
+    ):
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"Unknown overflow policy {overflow!r}")
+        self.sink = sink
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval_ms / 1000
+        self.overflow = overflow
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_lag_ns = 0
+        self._queue: asyncio.Queue[Record | None] = asyncio.Queue(maxsize=max_queue)
+        self._task: asyncio.Task | None = None
+        self._closing = False
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Flush everything queued so far and stop the background task."""
+        if self._task is None:
+            return
+        self._closing = True
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    async def record_opportunity(
+        self, triangle_hash: str, gross: float, net: float, notional: float, created_at: datetime | None = None
+    ) -> bool:
+        row = (triangle_hash, gross, net, notional, created_at or datetime.utcnow())
+        return await self.put(OpportunityModel.__tablename__, row)
+
+    async def record_trade(
+        self, opportunity_id: int, details: dict, pnl_quote: float, created_at: datetime | None = None
+    ) -> bool:
+        row = (opportunity_id, details, pnl_quote, created_at or datetime.utcnow())
+        return await self.put(TradeModel.__tablename__, row)
+
+    async def put(self, table: str, row: Tuple[Any, ...]) -> bool:
+        """Queue ``row`` for ``table``; returns False if it was shed because the queue is full."""
+        record = (table, row, time.time_ns())
+        if self.overflow == "block":
+            await self._queue.put(record)
+            return True
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            METRICS.inc("persist_rows_dropped")
+            return False
+        return True
+
+    def _drain(self, batch: List[Record]) -> bool:
+        """Move queued records into ``batch`` without waiting; True once the sentinel is seen."""
+        queue = self._queue
+        while len(batch) < self.flush_rows:
+            try:
+                record = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return False
+            if record is None:
+                return True
+            batch.append(record)
+        return False
+
+    async def _run(self) -> None:
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            stop = self._drain(batch)
+            if not stop and not self._closing and len(batch) < self.flush_rows:
+                await asyncio.sleep(self.flush_interval)
+                stop = self._drain(batch)
+            await self._flush(batch)
+            if stop:
+                return
+
+    async def _flush(self, batch: List[Record]) -> None:
+        grouped: Dict[str, List[Tuple[Any, ...]]] = defaultdict(list)
+        for table, row, _ in batch:
+            grouped[table].append(row)
+        oldest_ns = batch[0][2]
+        for table, rows in grouped.items():
+            _, columns = TABLES[table]
+            try:
+                await self.sink(table, columns, rows)
+            except Exception as exc:  # noqa: BLE001
+                self.failed += len(rows)
+                METRICS.inc("persist_rows_failed", len(rows))
+                log.error("persist.flush_failed", extra={"table": table, "rows": len(rows), "error": str(exc)})
+                continue
+            self.written += len(rows)
+            METRICS.inc("persist_rows_written", len(rows))
+        done_ns = time.time_ns()
+        self.last_lag_ns = done_ns - oldest_ns
+        METRICS.observe("enqueue_to_persist", oldest_ns, done_ns)
+
+
+def create_writer(settings: Settings) -> WriteBehindWriter:
+    from triarb.data.db import get_engine
+
+    return WriteBehindWriter(
+        DatabaseSink(get_engine()),
+        max_queue=settings.persist_queue_size,
+        flush_rows=settings.persist_flush_rows,
+        flush_interval_ms=settings.persist_flush_ms,
+        overflow=settings.persist_overflow,
+    )
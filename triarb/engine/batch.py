@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from triarb.engine.signals import Opportunity, SignalEngine
+from triarb.engine.triangle import Triangle
+from triarb.exchange.markets import MarketRegistry
+from triarb.marketdata.orderbook import OrderBookStore
+
+
+class BatchSignalEngine(SignalEngine):
+    """Vectorised SignalEngine scoring every triangle with a handful of array ops.
+
+    Produces the same opportunities, in the same order and with bit-identical edges,
+    as the scalar ``SignalEngine.evaluate`` path.
+    """
+
+    def __init__(self, triangles: Sequence[Triangle], store: OrderBookStore, markets: MarketRegistry | None = None):
+        super().__init__(triangles, store, markets)
+        plans = self.plans
+        self.leg_idx = np.array([plan.ids for plan in plans], dtype=np.intp).reshape(-1, 3)
+        self.buy = np.array([plan.buys for plan in plans], dtype=bool).reshape(-1, 3)
+        self.keep = np.array([plan.keeps for plan in plans], dtype=np.float64).reshape(-1, 3)
+
+        rows: Dict[str, List[int]] = {}
+        for row, plan in enumerate(plans):
+            for symbol in dict.fromkeys(plan.triangle.symbols):
+                rows.setdefault(symbol, []).append(row)
+        self._rows_by_symbol = {symbol: np.array(idx, dtype=np.intp) for symbol, idx in rows.items()}
+
+    def evaluate(self) -> List[Opportunity]:
+        return self._score(None)
+
+    def evaluate_symbol(self, symbol: str) -> List[Opportunity]:
+        rows = self._rows_by_symbol.get(symbol)
+        if rows is None:
+            return []
+        return self._score(rows)
+
+    def _score(self, rows: np.ndarray | None) -> List[Opportunity]:
+        if not self.plans:
+            return []
+        leg_idx = self.leg_idx if rows is None else self.leg_idx[rows]
+        buy = self.buy if rows is None else self.buy[rows]
+        keep = self.keep if rows is None else self.keep[rows]
+        target = self.settings.target_notional_quote
+        # Zero-copy views over the store's top-of-book arrays; only held for this call so
+        # the store can keep appending symbols between evaluations.
+        bid = np.frombuffer(self.store.best_bid, dtype=np.float64)
+        ask = np.frombuffer(self.store.best_ask, dtype=np.float64)
+
+        amount = np.full(len(leg_idx), target)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for k in range(3):
+                sym = leg_idx[:, k]
+                amount = np.where(buy[:, k], amount / ask[sym], amount * bid[sym]) * keep[:, k]
+            gross = ((amount - target) / target) * 10_000
+        del bid, ask
+        net = gross - (self.settings.slippage_bps * 3)
+
+        hits = np.flatnonzero((gross >= self.settings.min_gross_edge_bps) & (net >= self.settings.min_net_edge_bps))
+        opportunities: List[Opportunity] = []
+        for hit in hits:
+            row = hit if rows is None else rows[hit]
+            opp = self._opportunity(self.plans[row], float(gross[hit]), float(net[hit]))
+            if opp is not None:
+                opportunities.append(opp)
+        return opportunities
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+from typing import Any, Awaitable, List, Protocol
+
+from triarb.engine.executor import Executor
+from triarb.engine.plan import LegPlan
+from triarb.engine.risk import RiskManager
+from triarb.engine.signals import Opportunity
+from triarb.exchange.base import ExchangeAdapter
+from triarb.exchange.markets import MarketRegistry
+from triarb.exchange.user_stream import OrderFill, UserDataStream
+from triarb.marketdata.orderbook import OrderBookStore
+from triarb.metrics import METRICS
+
+log = logging.getLogger(__name__)
+
+
+class OrderSender(Protocol):
+    def create_order(
+        self, symbol: str, side: str, amount: float, client_order_id: str | None = None, quote_amount: bool = False
+    ) -> Awaitable[Any]: ...
+
+
+class ChainedExecutor(Executor):
+    """Runs a cycle leg by leg, each leg fired the moment the previous fill is reported.
+
+    The first leg is sized from the opportunity; every later leg trades exactly what the
+    previous one returned, net of commission (``quoteOrderQty`` for buys, base quantity for
+    sells), so a short fill shrinks the rest of the cycle instead of mis-sizing it. REST
+    responses are not awaited between legs: fills come from ``fills`` (the user data
+    stream) and a REST error only serves to fail the leg early. Every leg must clear the
+    symbol's minimum notional before it is sent. A cycle that fails after a fill does not
+    trade back: a timed-out order may still fill, so the asset and amount left over are
+    logged and kept on the ``CycleRecord`` for the operator instead.
+    """
+
+    def __init__(
+        self,
+        adapter: ExchangeAdapter,
+        store: OrderBookStore,
+        risk: RiskManager,
+        markets: MarketRegistry | None,
+        orders: OrderSender,
+        fills: UserDataStream,
+        fill_timeout_ms: float = 2_000,
+    ):
+        super().__init__(adapter, store, risk, markets)
+        self.orders = orders
+        self.fills = fills
+        self.fill_timeout = fill_timeout_ms / 1000
+        self._cycles = itertools.count(1)
+        # Client order ids must be unique per account for a while: [A-Za-z0-9_-]{1,36}.
+        self._id_prefix = f"tri{os.getpid() % 100_000}{int(time.time()) % 1_000_000}"
+
+    async def execute(self, opportunity: Opportunity) -> None:
+        started_ns = time.time_ns()
+        notional = opportunity.notional_quote
+        if not self.risk.allow_cycle(notional):
+            log.info("risk.reject", extra={"reason": "limits"})
+            self._record(opportunity, "rejected", started_ns)
+            return
+        plan = self._plan(opportunity.triangle)
+        if plan is None:
+            self.risk.release_cycle()
+            self._record(opportunity, "invalid", started_ns, "Cycle does not return to quote asset.")
+            return
+
+        if self._below_min_notional(plan.legs[0], notional):
+            self.risk.release_cycle()
+            self._record(opportunity, "invalid", started_ns, f"Order below min notional for {plan.legs[0].symbol}")
+            return
+
+        tick = opportunity.tick
+        cycle = next(self._cycles)
+        holdings = notional
+        held = self.settings.quote
+        fills: List[OrderFill] = []
+        try:
+            for idx, leg in enumerate(plan.legs):
+                if idx and self._below_min_notional(leg, holdings):
+                    raise ValueError(f"Order below min notional for {leg.symbol}")
+                submit_ns = time.time_ns()
+                if fills:
+                    METRICS.inc("orders_submitted")
+                    METRICS.observe("fill_to_next_leg", fills[-1].recv_ns, submit_ns)
+                else:
+                    METRICS.on_submitted(tick, submit_ns)
+                side = "buy" if leg.buy else "sell"
+                fill = await self._leg(leg.symbol, side, holdings, f"{self._id_prefix}-{cycle}-{idx}", leg.buy)
+                METRICS.observe("submit_to_fill", submit_ns, fill.recv_ns)
+                fills.append(fill)
+                base, quote = leg.symbol.split("/")
+                received = fill.received(base, quote)
+                if received <= 0:
+                    raise RuntimeError(f"No fill on {leg.symbol} ({fill.status})")
+                holdings, held = received, base if leg.buy else quote
+        except Exception as exc:  # noqa: BLE001
+            residual_asset = held if fills else None
+            residual = holdings if fills else 0.0
+            log.error(
+                "executor.chain_failed",
+                extra={
+                    "error": str(exc),
+                    "legs_filled": len(fills),
+                    "residual_asset": residual_asset,
+                    "residual_amount": residual,
+                },
+            )
+            self.risk.register_failure()
+            self._record(opportunity, "failed", started_ns, str(exc), residual_asset, residual)
+            return
+        log.info(
+            "cycle.executed",
+            extra={"net_bps": opportunity.net_bps, "returned_quote": holdings, "pnl_quote": holdings - notional},
+        )
+        self.risk.release_cycle()
+        self._record(opportunity, "executed", started_ns)
+
+    def _below_min_notional(self, leg: LegPlan, holdings: float) -> bool:
+        """Buys spend ``holdings`` of the quote currency; sells are valued at the best bid."""
+        if self.markets is None:
+            return False
+        value = holdings if leg.buy else holdings * self.store.best_bid[leg.symbol_id]
+        return value < self.markets.min_notional(leg.symbol)
+
+    async def _leg(self, symbol: str, side: str, amount: float, client_order_id: str, by_quote: bool) -> OrderFill:
+        """Send one order and return its final fill, whichever of fill or REST reply comes first."""
+        waiter = self.fills.expect(client_order_id)
+        request = asyncio.ensure_future(self.orders.create_order(symbol, side, amount, client_order_id, by_quote))
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.fill_timeout
+        pending = {waiter, request}
+        try:
+            while not waiter.done():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    raise TimeoutError(f"No fill for {client_order_id} on {symbol}")
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if request in done and request.exception() is not None:
+                    raise request.exception()  # type: ignore[misc]
+            return waiter.result()
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+                self.fills.forget(client_order_id)
+            if not request.done():
+                request.add_done_callback(_log_late_failure)
+
+
+def _log_late_failure(request: asyncio.Future) -> None:
+    if not request.cancelled() and request.exception() is not None:
+        log.warning("executor.late_order_error", extra={"error": str(request.exception())})
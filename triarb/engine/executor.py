@@ -2,28 +2,65 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, Dict, List
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
 
 from triarb.config import get_settings
+from triarb.engine.plan import TrianglePlan, compile_plan
 from triarb.engine.risk import RiskManager
 from triarb.engine.signals import Opportunity
+from triarb.engine.triangle import Triangle, TriangleLeg
 from triarb.exchange.base import ExchangeAdapter
+from triarb.exchange.markets import MarketRegistry
 from triarb.marketdata.orderbook import OrderBookStore
+from triarb.metrics import METRICS
+from triarb.utils.ring import RingBuffer
 
 log = logging.getLogger(__name__)
 
 
+@dataclass
+class CycleRecord:
+    """Outcome of one ``Executor.execute`` call, as kept in ``Executor.journal``."""
+
+    triangle: Triangle
+    net_bps: float
+    notional_quote: float
+    status: str  # executed | failed | rejected | invalid
+    started_ns: int
+    finished_ns: int
+    error: str | None = None
+    # What a cycle that failed part-way left on the account instead of the quote asset.
+    residual_asset: str | None = None
+    residual_amount: float = 0.0
+
+
 class Executor:
-    def __init__(self, adapter: ExchangeAdapter, store: OrderBookStore, risk: RiskManager):
+    def __init__(
+        self,
+        adapter: ExchangeAdapter,
+        store: OrderBookStore,
+        risk: RiskManager,
+        markets: MarketRegistry | None = None,
+    ):
         self.adapter = adapter
         self.store = store
         self.risk = risk
         self.settings = get_settings()
+        self.markets = markets
+        # Without a registry, fall back to whatever fee schedule the adapter knows.
+        self.fee_rate = markets.taker_fee if markets is not None else adapter.fee_rate
+        self._plans: Dict[Tuple[TriangleLeg, ...], TrianglePlan | None] = {}
+        # Optional log of recent cycles for the admin API; set by the engine.
+        self.journal: RingBuffer[CycleRecord] | None = None
 
     async def execute(self, opportunity: Opportunity) -> None:
+        started_ns = time.time_ns()
         notional = opportunity.notional_quote
         if not self.risk.allow_cycle(notional):
             log.info("risk.reject", extra={"reason": "limits"})
+            self._record(opportunity, "rejected", started_ns)
             return
 
         try:
@@ -31,11 +68,18 @@ class Executor:
         except ValueError as exc:
             log.warning("executor.build_failed", extra={"error": str(exc)})
             self.risk.release_cycle()
+            self._record(opportunity, "invalid", started_ns, str(exc))
             return
 
+        tick = opportunity.tick
+
         async def submit(order: Dict[str, Any]):
             log.info("order.submit", extra=order)
-            return await self.adapter.create_bulk_orders([order])
+            submit_ns = time.time_ns()
+            METRICS.on_submitted(tick, submit_ns)
+            result = await self.adapter.create_bulk_orders([order])
+            METRICS.on_acknowledged(tick, submit_ns, time.time_ns())
+            return result
 
         tasks = [submit(order) for order in instructions]
 
@@ -45,37 +89,68 @@ class Executor:
         except Exception as exc:  # noqa: BLE001
             log.error("executor.failed", extra={"error": str(exc)})
             self.risk.register_failure()
+            self._record(opportunity, "failed", started_ns, str(exc))
         else:
             self.risk.release_cycle()
+            self._record(opportunity, "executed", started_ns)
+
+    def _record(
+        self,
+        opportunity: Opportunity,
+        status: str,
+        started_ns: int,
+        error: str | None = None,
+        residual_asset: str | None = None,
+        residual_amount: float = 0.0,
+    ) -> None:
+        if self.journal is not None:
+            self.journal.append(
+                CycleRecord(
+                    opportunity.triangle,
+                    opportunity.net_bps,
+                    opportunity.notional_quote,
+                    status,
+                    started_ns,
+                    time.time_ns(),
+                    error,
+                    residual_asset,
+                    residual_amount,
+                )
+            )
+
+    def _plan(self, triangle: Triangle) -> TrianglePlan | None:
+        key = triangle.legs
+        if key not in self._plans:
+            self._plans[key] = compile_plan(triangle, self.store, self.settings.quote, self.fee_rate)
+        return self._plans[key]
 
     def _build_instructions(self, opportunity: Opportunity) -> List[Dict[str, Any]]:
+        plan = self._plan(opportunity.triangle)
+        if plan is None:
+            raise ValueError("Cycle does not return to quote asset.")
         holdings = opportunity.notional_quote
-        asset = self.settings.quote
         instructions: List[Dict[str, Any]] = []
-        fee_rate = self.adapter.fee_rate("")
         slippage = self.settings.slippage_bps / 10_000
+        bids = self.store.best_bid
+        asks = self.store.best_ask
+        min_notional = self.markets.min_notional if self.markets is not None else None
 
-        for leg in opportunity.triangle.legs:
-            bid, ask = self.store.best_bid_ask(leg.symbol)
-            if not (bid and ask):
+        for leg in plan.legs:
+            bid = bids[leg.symbol_id]
+            ask = asks[leg.symbol_id]
+            if bid != bid:  # NaN: one side of the book is empty
                 raise ValueError(f"Missing book for {leg.symbol}")
-            base, quote = leg.symbol.split("/")
-            if asset == quote and leg.from_asset == quote:
-                price = ask.price * (1 + slippage)
+            if leg.buy:
+                price = ask * (1 + slippage)
                 qty = holdings / price
                 instructions.append({"symbol": leg.symbol, "side": "buy", "type": "market", "amount": qty})
-                holdings = qty * (1 - fee_rate)
-                asset = base
-            elif asset == base and leg.from_asset == base:
-                price = bid.price * (1 - slippage)
+                holdings = qty * leg.keep
+            else:
+                price = bid * (1 - slippage)
                 qty = holdings
                 instructions.append({"symbol": leg.symbol, "side": "sell", "type": "market", "amount": qty})
-                holdings = qty * price * (1 - fee_rate)
-                asset = quote
-            else:
-                raise ValueError(f"Asset mismatch for {leg.symbol}")
-
-        if asset != self.settings.quote:
-            raise ValueError("Cycle does not return to quote asset.")
+                holdings = qty * price * leg.keep
+            if min_notional is not None and qty * price < min_notional(leg.symbol):
+                raise ValueError(f"Order below min notional for {leg.symbol}")
 
         return instructions
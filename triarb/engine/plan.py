@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import Callable, List, Sequence, Tuple
+
+from triarb.engine.triangle import Triangle
+from triarb.marketdata.orderbook import OrderBookStore
+
+
+class LegPlan:
+    """One leg resolved to a store symbol id, a direction and a precomputed fee multiplier."""
+
+    __slots__ = ("symbol", "symbol_id", "buy", "keep")
+
+    def __init__(self, symbol: str, symbol_id: int, buy: bool, keep: float):
+        self.symbol = symbol
+        self.symbol_id = symbol_id
+        self.buy = buy
+        self.keep = keep  # fraction of the proceeds left after fees (and slippage, if folded in)
+
+
+class TrianglePlan:
+    """A triangle compiled for the hot loops: no string splitting or asset comparisons.
+
+    ``ids``/``buys``/``keeps`` repeat the leg fields as flat tuples for unpacking in loops.
+    """
+
+    __slots__ = ("triangle", "legs", "ids", "buys", "keeps")
+
+    def __init__(self, triangle: Triangle, legs: Sequence[LegPlan]):
+        self.triangle = triangle
+        self.legs: Tuple[LegPlan, ...] = tuple(legs)
+        self.ids = tuple(leg.symbol_id for leg in self.legs)
+        self.buys = tuple(leg.buy for leg in self.legs)
+        self.keeps = tuple(leg.keep for leg in self.legs)
+
+
+def leg_directions(triangle: Triangle, quote: str) -> List[bool] | None:
+    """Buy flag per leg for a cycle starting and ending in ``quote``; None if it does not chain."""
+    holdings_asset = quote
+    directions: List[bool] = []
+    for leg in triangle.legs:
+        base, leg_quote = leg.symbol.split("/")
+        if leg.from_asset == leg_quote and holdings_asset == leg_quote:
+            directions.append(True)
+            holdings_asset = base
+        elif leg.from_asset == base and holdings_asset == base:
+            directions.append(False)
+            holdings_asset = leg_quote
+        else:
+            return None
+    if holdings_asset != quote:
+        return None
+    return directions
+
+
+def compile_plan(
+    triangle: Triangle,
+    store: OrderBookStore,
+    quote: str,
+    fee_rate: Callable[[str], float],
+    slip: float = 0.0,
+) -> TrianglePlan | None:
+    """Compile ``triangle`` against ``store`` symbol ids; None if it is not a ``quote`` cycle.
+
+    Each leg keeps ``1 - (fee_rate(symbol) + slip)``, the same expression the scalar path
+    used per evaluation, so compiled scores are bit-identical.
+    """
+    directions = leg_directions(triangle, quote)
+    if directions is None:
+        return None
+    legs = [
+        LegPlan(leg.symbol, store.symbol_id(leg.symbol), buy, 1 - (fee_rate(leg.symbol) + slip))
+        for leg, buy in zip(triangle.legs, directions)
+    ]
+    return TrianglePlan(triangle, legs)
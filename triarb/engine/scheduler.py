@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Set, Tuple
+
+from triarb.engine.signals import Opportunity
+from triarb.engine.triangle import Triangle, TriangleLeg
+from triarb.metrics import METRICS
+
+log = logging.getLogger(__name__)
+
+TriangleKey = Tuple[TriangleLeg, ...]
+
+
+class OpportunityScheduler:
+    """Sits between the signal engine and the executor.
+
+    Submitted opportunities wait in a max-heap on net edge; a newer signal for the same
+    triangle replaces the queued one. The dispatcher always takes the best queued
+    opportunity, drops it if it is older than ``ttl_ms`` (measured from the signal stamp
+    when the opportunity carries a tick, otherwise from submission) or if that triangle is
+    already executing, and runs at most ``max_concurrency`` cycles at once. ``cancel``
+    withdraws queued opportunities whose edge the signal engine has since seen disappear.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[Opportunity], Awaitable[None]],
+        max_concurrency: int,
+        ttl_ms: float,
+    ):
+        self.execute = execute
+        self.max_concurrency = max(1, max_concurrency)
+        self.ttl_ns = int(ttl_ms * 1_000_000)
+        self.dispatched = 0
+        self.expired = 0
+        self.superseded = 0
+        self.skipped = 0
+        self.cancelled = 0
+        self._heap: List[Tuple[float, int, int, Opportunity]] = []
+        self._latest: Dict[TriangleKey, int] = {}
+        self._seq = 0
+        self._in_flight: Set[TriangleKey] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._runner: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._runner is None:
+            self._runner = asyncio.create_task(self.run())
+
+    async def close(self) -> None:
+        """Stop dispatching and wait for cycles already in flight."""
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def queued(self) -> int:
+        return len(self._latest)
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def submit(self, opportunities: Iterable[Opportunity]) -> None:
+        now = time.time_ns()
+        latest = self._latest
+        for opp in opportunities:
+            key = opp.triangle.legs
+            if key in latest:
+                self.superseded += 1
+            tick = opp.tick
+            born = tick.signal_ns if tick is not None and tick.signal_ns else now
+            self._seq += 1
+            heapq.heappush(self._heap, (-opp.net_bps, self._seq, born, opp))
+            latest[key] = self._seq
+        self._wakeup.set()
+
+    def cancel(self, triangles: Iterable[Triangle]) -> None:
+        """Drop queued opportunities on ``triangles``; their heap entries are skipped by ``pop``."""
+        latest = self._latest
+        for triangle in triangles:
+            if latest.pop(triangle.legs, None) is not None:
+                self.cancelled += 1
+                METRICS.inc("opportunities_cancelled")
+
+    def pop(self) -> Opportunity | None:
+        """Best fresh opportunity whose triangle is not executing, discarding the rest on the way."""
+        heap = self._heap
+        cutoff = time.time_ns() - self.ttl_ns
+        while heap:
+            _, seq, born, opp = heapq.heappop(heap)
+            key = opp.triangle.legs
+            if self._latest.get(key) != seq:
+                continue  # replaced by a newer signal for the same triangle
+            del self._latest[key]
+            if born < cutoff:
+                self.expired += 1
+                METRICS.inc("opportunities_expired")
+                continue
+            if key in self._in_flight:
+                self.skipped += 1
+                continue
+            return opp
+        return None
+
+    async def run(self) -> None:
+        while True:
+            if len(self._tasks) >= self.max_concurrency or not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            opp = self.pop()
+            if opp is None:
+                continue
+            key = opp.triangle.legs
+            self._in_flight.add(key)
+            self._tasks.add(asyncio.create_task(self._dispatch(key, opp)))
+
+    async def _dispatch(self, key: TriangleKey, opp: Opportunity) -> None:
+        self.dispatched += 1
+        METRICS.inc("opportunities_dispatched")
+        try:
+            await self.execute(opp)
+        except Exception as exc:  # noqa: BLE001
+            log.error("scheduler.execute_failed", extra={"error": str(exc)})
+        finally:
+            # Free the slot before waking the dispatcher so it sees the capacity.
+            self._tasks.discard(asyncio.current_task())  # type: ignore[arg-type]
+            self._in_flight.discard(key)
+            self._wakeup.set()
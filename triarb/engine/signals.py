@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Sequence
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Sequence, Set
 
 from triarb.config import get_settings
-from triarb.engine.fees import taker_fee
+from triarb.engine.plan import TrianglePlan, compile_plan
+from triarb.engine.sizing import LegLadder, SizingResult, optimal_size
 from triarb.engine.triangle import Triangle
+from triarb.exchange.markets import MarketRegistry
 from triarb.marketdata.orderbook import OrderBookStore
+from triarb.metrics import METRICS, Tick
 from triarb.utils.math import bps_to_ratio
+from triarb.utils.ring import RingBuffer
 
 
 @dataclass
@@ -16,60 +22,160 @@ class Opportunity:
     gross_bps: float
     net_bps: float
     notional_quote: float
+    expected_profit_quote: float = 0.0
+    tick: Tick | None = field(default=None, compare=False, repr=False)
 
 
 class SignalEngine:
-    def __init__(self, triangles: Sequence[Triangle], store: OrderBookStore):
+    def __init__(self, triangles: Sequence[Triangle], store: OrderBookStore, markets: MarketRegistry | None = None):
         self.triangles = triangles
         self.store = store
         self.settings = get_settings()
-        self.fee = taker_fee(self.settings.exchange)
+        self.markets = markets if markets is not None else MarketRegistry.from_settings(self.settings)
+        self.fee = self.markets.default_taker
         self.slip = bps_to_ratio(self.settings.slippage_bps)
+        # Triangles that cannot form a quote cycle never score, so they are not compiled.
+        self.plans: List[TrianglePlan] = []
+        self._plans_by_triangle: Dict[int, TrianglePlan] = {}
+        self._by_symbol: Dict[str, List[TrianglePlan]] = {}
+        for triangle in triangles:
+            plan = compile_plan(triangle, store, self.settings.quote, self.markets.taker_fee, self.slip)
+            if plan is None:
+                continue
+            self.plans.append(plan)
+            self._plans_by_triangle[id(triangle)] = plan
+            for symbol in dict.fromkeys(triangle.symbols):
+                self._by_symbol.setdefault(symbol, []).append(plan)
+        self._pending: Dict[int, Opportunity] = {}
+        # Triangles signalled since their edge was last seen gone (ids), and who to tell
+        # when it goes: the scheduler may still be holding them after the drain.
+        self._signalled: Set[int] = set()
+        self.on_invalidate: Callable[[List[Triangle]], None] | None = None
+        self._ready = asyncio.Event()
+        self._listening = False
+        # Optional log of recent opportunities for the admin API; set by the engine.
+        self.journal: RingBuffer[Opportunity] | None = None
 
     def evaluate(self) -> List[Opportunity]:
+        return self._evaluate(self.plans)
+
+    def evaluate_symbol(self, symbol: str) -> List[Opportunity]:
+        """Re-score only the triangles that have a leg on ``symbol``."""
+        return self._evaluate(self._by_symbol.get(symbol, ()))
+
+    def listen(self) -> None:
+        """Switch to event-driven mode: re-score on every book update from the store."""
+        if not self._listening:
+            self.store.subscribe(self._on_book_update)
+            self._listening = True
+
+    def close(self) -> None:
+        if self._listening:
+            self.store.unsubscribe(self._on_book_update)
+            self._listening = False
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def wait_opportunities(self) -> List[Opportunity]:
+        """Block until book updates produced opportunities, then drain them.
+
+        Repeated signals on the same triangle are coalesced to the latest one.
+        """
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        opportunities = list(self._pending.values())
+        self._pending.clear()
+        self._ready.clear()
+        return opportunities
+
+    def _on_book_update(self, symbol: str) -> None:
+        opportunities = self.evaluate_symbol(symbol)
+        if self._signalled:
+            self._drop_stale(symbol, opportunities)
+        if not opportunities:
+            return
+        tick = self.store.tick
+        if tick is not None:
+            tick.signal_ns = time.time_ns()
+            METRICS.observe("store_to_signal", tick.store_ns, tick.signal_ns)
+        METRICS.inc("opportunities", len(opportunities))
+        for opp in opportunities:
+            opp.tick = tick
+            key = id(opp.triangle)
+            self._pending[key] = opp
+            self._signalled.add(key)
+        self._ready.set()
+
+    def _drop_stale(self, symbol: str, opportunities: List[Opportunity]) -> None:
+        """Withdraw signals of triangles just re-scored on ``symbol`` that no longer qualify."""
+        live = {id(opp.triangle) for opp in opportunities}
+        signalled = self._signalled
+        stale: List[Triangle] = []
+        for plan in self._by_symbol.get(symbol, ()):
+            key = id(plan.triangle)
+            if key in signalled and key not in live:
+                signalled.discard(key)
+                self._pending.pop(key, None)
+                stale.append(plan.triangle)
+        if stale and self.on_invalidate is not None:
+            self.on_invalidate(stale)
+
+    def _evaluate(self, plans: Iterable[TrianglePlan]) -> List[Opportunity]:
         opportunities: List[Opportunity] = []
-        target = self.settings.target_notional_quote
-
-        for triangle in self.triangles:
-            amount = target
-            holdings_asset = self.settings.quote
-            viable = True
-
-            for leg in triangle.legs:
-                bid, ask = self.store.best_bid_ask(leg.symbol)
-                if not (bid and ask):
-                    viable = False
-                    break
-
-                base, quote = leg.symbol.split("/")
-                fee_slip = self.fee + self.slip
-
-                if leg.from_asset == quote and holdings_asset == quote:
-                    price = ask.price
-                    amount = (amount / price) * (1 - fee_slip)
-                    holdings_asset = base
-                elif leg.from_asset == base and holdings_asset == base:
-                    price = bid.price
-                    amount = (amount * price) * (1 - fee_slip)
-                    holdings_asset = quote
-                else:
-                    viable = False
-                    break
-
-            if not viable or holdings_asset != self.settings.quote:
-                continue
+        settings = self.settings
+        target = settings.target_notional_quote
+        min_gross = settings.min_gross_edge_bps
+        min_net = settings.min_net_edge_bps
+        slip_bps = settings.slippage_bps * 3
+        # Empty books are NaN in the store arrays, which fails both edge comparisons.
+        bids = self.store.best_bid
+        asks = self.store.best_ask
+
+        for plan in plans:
+            (i0, i1, i2), (b0, b1, b2), (k0, k1, k2) = plan.ids, plan.buys, plan.keeps
+            amount = ((target / asks[i0]) if b0 else (target * bids[i0])) * k0
+            amount = ((amount / asks[i1]) if b1 else (amount * bids[i1])) * k1
+            amount = ((amount / asks[i2]) if b2 else (amount * bids[i2])) * k2
 
             gross_edge = ((amount - target) / target) * 10_000
-            net_edge = gross_edge - (self.settings.slippage_bps * 3)
-
-            if gross_edge >= self.settings.min_gross_edge_bps and net_edge >= self.settings.min_net_edge_bps:
-                opportunities.append(
-                    Opportunity(
-                        triangle=triangle,
-                        gross_bps=gross_edge,
-                        net_bps=net_edge,
-                        notional_quote=min(self.settings.max_leg_notional_quote, target),
-                    )
-                )
+            net_edge = gross_edge - slip_bps
+
+            if gross_edge >= min_gross and net_edge >= min_net:
+                opp = self._opportunity(plan, gross_edge, net_edge)
+                if opp is not None:
+                    opportunities.append(opp)
 
         return opportunities
+
+    def _opportunity(self, plan: TrianglePlan, gross_bps: float, net_bps: float) -> Opportunity | None:
+        if not self.settings.depth_sizing:
+            notional = min(self.settings.max_leg_notional_quote, self.settings.target_notional_quote)
+            opp = Opportunity(triangle=plan.triangle, gross_bps=gross_bps, net_bps=net_bps, notional_quote=notional)
+        else:
+            sized = self._size(plan)
+            if sized.notional_quote <= 0:
+                return None
+            opp = Opportunity(
+                triangle=plan.triangle,
+                gross_bps=gross_bps,
+                net_bps=net_bps,
+                notional_quote=sized.notional_quote,
+                expected_profit_quote=sized.profit_quote,
+            )
+        if self.journal is not None:
+            self.journal.append(opp)
+        return opp
+
+    def size(self, triangle: Triangle) -> SizingResult:
+        """Walk the depth of all three legs for the profit-maximising starting notional."""
+        plan = self._plans_by_triangle.get(id(triangle))
+        if plan is None:
+            return SizingResult(0.0, 0.0)
+        return self._size(plan)
+
+    def _size(self, plan: TrianglePlan) -> SizingResult:
+        books = self.store.books
+        ladders = [LegLadder.from_book(books[leg.symbol], leg.buy, leg.keep) for leg in plan.legs]
+        return optimal_size(ladders, self.settings.max_leg_notional_quote)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import List, NamedTuple, Sequence
+
+from triarb.marketdata.orderbook import OrderBook
+
+
+class SizingResult(NamedTuple):
+    notional_quote: float
+    profit_quote: float
+
+
+class LegLadder:
+    """Piecewise-linear conversion curve of one leg, built from prefix sums over book levels.
+
+    ``in_cum``/``out_cum`` hold cumulative input/output amounts at each level boundary;
+    ``rates`` is the output per unit of input inside each level, net of ``keep``.
+    """
+
+    __slots__ = ("in_cum", "out_cum", "rates")
+
+    def __init__(self, in_cum: List[float], out_cum: List[float], rates: List[float]):
+        self.in_cum = in_cum
+        self.out_cum = out_cum
+        self.rates = rates
+
+    @classmethod
+    def from_book(cls, book: OrderBook, buy: bool, keep: float) -> "LegLadder":
+        if buy:
+            prices, qtys, count = book.ask_px, book.ask_qty, book.n_asks
+        else:
+            prices, qtys, count = book.bid_px, book.bid_qty, book.n_bids
+        in_cum = [0.0]
+        out_cum = [0.0]
+        rates: List[float] = []
+        spent = received = 0.0
+        for idx in range(count):
+            price, qty = prices[idx], qtys[idx]
+            if buy:
+                spent += price * qty
+                received += qty * keep
+                rates.append(keep / price)
+            else:
+                spent += qty
+                received += price * qty * keep
+                rates.append(price * keep)
+            in_cum.append(spent)
+            out_cum.append(received)
+        return cls(in_cum, out_cum, rates)
+
+    @property
+    def capacity(self) -> float:
+        return self.in_cum[-1]
+
+    def forward(self, amount: float) -> float:
+        if amount <= 0:
+            return 0.0
+        idx = min(bisect_left(self.in_cum, amount), len(self.rates))
+        return self.out_cum[idx - 1] + (amount - self.in_cum[idx - 1]) * self.rates[idx - 1]
+
+    def inverse(self, output: float) -> float:
+        if output <= 0:
+            return 0.0
+        idx = min(bisect_left(self.out_cum, output), len(self.rates))
+        return self.in_cum[idx - 1] + (output - self.out_cum[idx - 1]) / self.rates[idx - 1]
+
+
+def optimal_size(ladders: Sequence[LegLadder], max_notional: float) -> SizingResult:
+    """Find the starting notional maximising ``output - input`` across chained legs.
+
+    Chaining concave piecewise-linear legs gives a concave profit curve whose kinks are the
+    level boundaries of each leg mapped back to the starting asset, so only those
+    (at most three times the book depth) plus the cap need evaluating.
+    """
+    if not ladders or any(not ladder.rates for ladder in ladders):
+        return SizingResult(0.0, 0.0)
+
+    def to_start(leg: int, amount: float) -> float:
+        for ladder in reversed(ladders[:leg]):
+            amount = ladder.inverse(amount)
+        return amount
+
+    cap = max_notional
+    candidates: List[float] = []
+    for leg, ladder in enumerate(ladders):
+        cap = min(cap, to_start(leg, ladder.capacity))
+        candidates.extend(to_start(leg, boundary) for boundary in ladder.in_cum[1:])
+    candidates.append(cap)
+
+    best = SizingResult(0.0, 0.0)
+    for notional in candidates:
+        if notional <= 0 or notional > cap:
+            continue
+        amount = notional
+        for ladder in ladders:
+            amount = ladder.forward(amount)
+        profit = amount - notional
+        if profit > best.profit_quote:
+            best = SizingResult(notional, profit)
+    return best
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
+import os
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
 
 from triarb.config import get_settings
 
+log = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
 
 @dataclass(frozen=True)
 class TriangleLeg:
@@ -33,12 +42,124 @@ def build_triangles(quote: str, bases: List[str]) -> List[Triangle]:
             legs = (
                 TriangleLeg(symbol=f"{a}/{quote}", from_asset=quote, to_asset=a),
                 TriangleLeg(symbol=f"{b}/{a}", from_asset=a, to_asset=b),
-                TriangleLeg(symbol=f"{quote}/{b}", from_asset=b, to_asset=quote),
+                TriangleLeg(symbol=f"{b}/{quote}", from_asset=b, to_asset=quote),
             )
             triangles.append(Triangle(legs))
     return triangles
 
 
+def discover_triangles(quote: str, markets: Iterable[Mapping[str, Any]]) -> List[Triangle]:
+    """Enumerate every quote -> A -> B -> quote cycle over the listed spot markets.
+
+    Each market may be traversed in either direction; leg orientation follows the real
+    ``BASE/QUOTE`` symbol, so a leg converting from the market quote is a buy.
+    """
+    adjacency: Dict[str, List[TriangleLeg]] = {}
+    for market in _tradable(markets):
+        symbol, base, mquote = market["symbol"], market["base"], market["quote"]
+        adjacency.setdefault(mquote, []).append(TriangleLeg(symbol, from_asset=mquote, to_asset=base))
+        adjacency.setdefault(base, []).append(TriangleLeg(symbol, from_asset=base, to_asset=mquote))
+
+    triangles: List[Triangle] = []
+    for leg1 in adjacency.get(quote, []):
+        for leg2 in adjacency.get(leg1.to_asset, []):
+            if leg2.to_asset in (quote, leg1.to_asset):
+                continue
+            for leg3 in adjacency.get(leg2.to_asset, []):
+                if leg3.to_asset == quote:
+                    triangles.append(Triangle((leg1, leg2, leg3)))
+    return triangles
+
+
+def load_triangle_index(quote: str, markets: Iterable[Mapping[str, Any]], cache_path: Path) -> List[Triangle]:
+    """Return discovered triangles, reusing ``cache_path`` while the market list is unchanged."""
+    listed = _tradable(markets)
+    fingerprint = _market_fingerprint(quote, listed)
+    cached = _read_cache(cache_path, fingerprint)
+    if cached is not None:
+        log.info("triangles.cache_hit", extra={"triangles": len(cached), "path": str(cache_path)})
+        return cached
+
+    triangles = discover_triangles(quote, listed)
+    _write_cache(cache_path, fingerprint, triangles)
+    log.info("triangles.discovered", extra={"triangles": len(triangles), "markets": len(listed)})
+    return triangles
+
+
+def _tradable(markets: Iterable[Mapping[str, Any]]) -> List[Mapping[str, Any]]:
+    listed = [
+        market
+        for market in markets
+        if market.get("symbol")
+        and market.get("base")
+        and market.get("quote")
+        and market.get("active", True) is not False
+        and market.get("spot", True) is not False
+    ]
+    listed.sort(key=lambda market: market["symbol"])
+    return listed
+
+
+def _market_fingerprint(quote: str, markets: List[Mapping[str, Any]]) -> str:
+    digest = hashlib.sha256(f"v{CACHE_VERSION}:{quote}".encode())
+    for market in markets:
+        digest.update(f"|{market['symbol']}:{market['base']}:{market['quote']}".encode())
+    return digest.hexdigest()
+
+
+def _read_cache(path: Path, fingerprint: str) -> List[Triangle] | None:
+    try:
+        payload = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("fingerprint") != fingerprint:
+        return None
+    try:
+        return _decode_cache(payload)
+    except (KeyError, IndexError, TypeError, ValueError) as exc:
+        # A damaged cache only costs a rebuild; it must never stop startup.
+        log.warning("triangles.cache_invalid", extra={"path": str(path), "error": repr(exc)})
+        return None
+
+
+def _decode_cache(payload: Dict[str, Any]) -> List[Triangle]:
+    # Legs are packed as symbol_index * 2 + is_buy against the symbol table.
+    symbols: List[str] = payload["symbols"]
+    triangles: List[Triangle] = []
+    for packed in payload["triangles"]:
+        if len(packed) != 3:
+            raise ValueError(f"Triangle with {len(packed)} legs")
+        legs = []
+        for code in packed:
+            if not isinstance(code, int) or code < 0:
+                raise ValueError(f"Bad leg code {code!r}")
+            symbol = symbols[code >> 1]
+            base, quote = symbol.split("/")
+            if code & 1:
+                legs.append(TriangleLeg(symbol, from_asset=quote, to_asset=base))
+            else:
+                legs.append(TriangleLeg(symbol, from_asset=base, to_asset=quote))
+        triangles.append(Triangle(tuple(legs)))  # type: ignore[arg-type]
+    return triangles
+
+
+def _write_cache(path: Path, fingerprint: str, triangles: List[Triangle]) -> None:
+    symbols = sorted({symbol for triangle in triangles for symbol in triangle.symbols})
+    ids = {symbol: idx for idx, symbol in enumerate(symbols)}
+    packed = [
+        [ids[leg.symbol] * 2 + int(leg.from_asset == leg.symbol.split("/")[1]) for leg in triangle.legs]
+        for triangle in triangles
+    ]
+    payload = {"version": CACHE_VERSION, "fingerprint": fingerprint, "symbols": symbols, "triangles": packed}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")))
+        os.replace(tmp, path)
+    except OSError as exc:
+        log.warning("triangles.cache_write_failed", extra={"error": str(exc)})
+
+
 def triangle_edge(
     triangle: Triangle,
     book_data: Dict[str, Dict[str, float]],
@@ -18,6 +18,10 @@ class ExchangeAdapter(abc.ABC):
     async def create_bulk_orders(self, orders: Sequence[Dict[str, Any]]) -> Sequence[Any]:
         raise NotImplementedError
 
+    async def load_markets(self) -> Dict[str, Dict[str, Any]]:
+        """Return exchange market metadata keyed by unified symbol (ccxt layout)."""
+        raise NotImplementedError
+
     @abc.abstractmethod
     def fee_rate(self, symbol: str) -> float:
         raise NotImplementedError
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Dict, Sequence
-
-import ccxt.async_support as ccxt
+from typing import TYPE_CHECKING, Any, Dict, Sequence
 
 from triarb.config import get_settings
 from triarb.exchange.base import ExchangeAdapter
+from triarb.exchange.markets import MarketRegistry
+
+if TYPE_CHECKING:
+    from triarb.exchange.binance_rest import BinanceRestClient
 
 
 class BinanceAdapter(ExchangeAdapter):
@@ -14,25 +16,75 @@ class BinanceAdapter(ExchangeAdapter):
         super().__init__(config)
         settings = get_settings()
         self.paper = settings.paper_mode
-        self._fee_table = settings.fee_table.get("binance", {"taker": 0.0004})
-        self._client = ccxt.binance({
-            "apiKey": settings.binance_api_key,
-            "secret": settings.binance_api_secret,
-            "enableRateLimit": True,
-        })
-        self._markets_ready = asyncio.create_task(self._client.load_markets())
+        # Fee-table defaults until the engine installs the loaded registry.
+        self.markets = MarketRegistry.from_settings(settings)
+        self._ccxt: Any = None
+        self._markets_ready: asyncio.Task | None = None
+        self.rest: BinanceRestClient | None = None
+
+    async def connect_orders(self) -> None:
+        """Open warm REST order connections when live trading with ``ORDER_TRANSPORT=rest``.
+
+        Call after the loaded registry is installed: the client rounds quantities with it.
+        """
+        settings = get_settings()
+        if self.paper or settings.order_transport != "rest" or self.rest is not None:
+            return
+        from triarb.exchange.binance_rest import BinanceRestClient
+
+        self.rest = BinanceRestClient(
+            settings.binance_api_key or "",
+            settings.binance_api_secret or "",
+            settings.binance_rest_url,
+            self.markets,
+            recv_window_ms=settings.rest_recv_window_ms,
+            pool_size=settings.rest_pool_size,
+        )
+        await self.rest.warm()
+
+    async def close(self) -> None:
+        if self.rest is not None:
+            await self.rest.close()
+            self.rest = None
+        if self._ccxt is not None:
+            await self._ccxt.close()
+
+    @property
+    def _client(self) -> Any:
+        # ccxt takes longer to import than the rest of the engine; paper mode never needs it.
+        if self._ccxt is None:
+            import ccxt.async_support as ccxt
+
+            settings = get_settings()
+            self._ccxt = ccxt.binance({
+                "apiKey": settings.binance_api_key,
+                "secret": settings.binance_api_secret,
+                "enableRateLimit": True,
+            })
+        return self._ccxt
+
+    def _markets_loaded(self) -> asyncio.Task:
+        # ccxt only needs its market table for live REST calls; fetch it once, on first use.
+        if self._markets_ready is None:
+            self._markets_ready = asyncio.create_task(self._client.load_markets())
+        return self._markets_ready
+
+    async def load_markets(self) -> Dict[str, Dict[str, Any]]:
+        return await self._markets_loaded()
 
     async def fetch_balances(self) -> Dict[str, float]:
-        await self._markets_ready
         if self.paper:
             return {"USDT": 1_000_000}
+        await self._markets_loaded()
         balances = await self._client.fetch_balance()
         return {asset: float(entry["free"]) for asset, entry in balances["total"].items()}
 
     async def create_bulk_orders(self, orders: Sequence[Dict[str, Any]]) -> Sequence[Any]:
-        await self._markets_ready
         if self.paper:
             return [{"id": f"paper-{idx}", **order} for idx, order in enumerate(orders)]
+        if self.rest is not None:
+            return await self.rest.create_orders(orders)
+        await self._markets_loaded()
 
         tasks = [
             self._client.create_order(order["symbol"], order["type"], order["side"], order["amount"])
@@ -41,4 +93,4 @@ class BinanceAdapter(ExchangeAdapter):
         return await asyncio.gather(*tasks)
 
     def fee_rate(self, symbol: str) -> float:
-        return float(self._fee_table.get("taker", 0.0004))
+        return self.markets.taker_fee(symbol)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, Sequence
+
+import aiohttp
+
+from triarb.exchange.markets import MarketRegistry
+from triarb.marketdata.decoder import resolve_loads
+
+log = logging.getLogger(__name__)
+
+ORDER_PATH = "/api/v3/order"
+PING_PATH = "/api/v3/ping"
+KEEPALIVE_TIMEOUT_S = 60
+LISTEN_KEY_PATH = "/api/v3/userDataStream"
+SIDES = {"buy": "BUY", "sell": "SELL"}
+
+
+class BinanceRestError(RuntimeError):
+    def __init__(self, status: int, code: int | None, message: str):
+        super().__init__(f"HTTP {status} code={code}: {message}")
+        self.status = status
+        self.code = code
+
+
+def floor_8(value: float) -> str:
+    """``value`` with 8 decimals (the exchange maximum), truncated toward zero."""
+    return f"{math.floor(value * 1e8) / 1e8:.8f}"
+
+
+def step_decimals(step: float) -> int:
+    """Decimal places needed to print multiples of ``step`` exactly (0.001 -> 3)."""
+    if step <= 0 or step >= 1:
+        return 0
+    return max(0, -math.floor(math.log10(step) + 1e-9))
+
+
+class BinanceRestClient:
+    """Minimal signed order-entry client for Binance spot.
+
+    Keeps one ``aiohttp`` session with keep-alive connections that ``warm`` opens ahead of
+    the first order and then pings every ``keep_warm_s`` so quiet periods do not let them
+    expire, signs with an HMAC whose key schedule is computed once and copied per
+    request, rounds quantities to the cached lot step and builds the form body by hand.
+    Spot has no batch order endpoint, so ``create_orders`` sends the legs concurrently over
+    the pooled connections.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        base_url: str,
+        markets: MarketRegistry,
+        recv_window_ms: int = 5000,
+        pool_size: int = 8,
+        loads: Callable[[str | bytes], Any] | None = None,
+        keep_warm_s: float = KEEPALIVE_TIMEOUT_S / 2,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.markets = markets
+        self.recv_window_ms = recv_window_ms
+        self.pool_size = pool_size
+        self.keep_warm_s = keep_warm_s
+        self._headers = {"X-MBX-APIKEY": api_key, "Content-Type": "application/x-www-form-urlencoded"}
+        self._mac = hmac.new(api_secret.encode(), digestmod=hashlib.sha256)
+        self._loads = loads or resolve_loads("auto")
+        self._order_url = self.base_url + ORDER_PATH
+        # Per-symbol "symbol=BTCUSDT&side=" prefixes and quantity formats, built on first use.
+        self._prefixes: Dict[str, str] = {}
+        self._formats: Dict[str, str] = {}
+        self._session: aiohttp.ClientSession | None = None
+        self._keeper: asyncio.Task | None = None
+        self.pings = 0
+
+    async def start(self) -> None:
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size, keepalive_timeout=KEEPALIVE_TIMEOUT_S, ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(connector=connector, headers=self._headers)
+
+    async def warm(self, connections: int = 3) -> None:
+        """Open ``connections`` keep-alive connections (TCP + TLS) and keep them open until ``close``."""
+        await self.start()
+        await self._ping(connections)
+        if self._keeper is None:
+            self._keeper = asyncio.create_task(self._keep_warm(connections))
+
+    async def _ping(self, connections: int) -> None:
+        session = self._session
+        assert session is not None
+
+        async def ping() -> None:
+            async with session.get(self.base_url + PING_PATH) as resp:
+                await resp.read()
+
+        await asyncio.gather(*(ping() for _ in range(connections)))
+        self.pings += connections
+
+    async def _keep_warm(self, connections: int) -> None:
+        while True:
+            await asyncio.sleep(self.keep_warm_s)
+            try:
+                await self._ping(connections)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                log.warning("rest.keep_warm_failed", extra={"error": str(exc)})
+
+    async def close(self) -> None:
+        if self._keeper is not None:
+            self._keeper.cancel()
+            try:
+                await self._keeper
+            except asyncio.CancelledError:
+                pass
+            self._keeper = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def sign(self, query: str) -> str:
+        mac = self._mac.copy()
+        mac.update(query.encode())
+        return mac.hexdigest()
+
+    def order_body(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        timestamp_ms: int,
+        client_order_id: str | None = None,
+        quote_amount: bool = False,
+    ) -> str:
+        """Signed form body for a MARKET order.
+
+        ``amount`` is in the base asset, or with ``quote_amount`` the quote to spend
+        (``quoteOrderQty``), which lets a buy use exactly what the previous leg returned.
+        """
+        prefix = self._prefixes.get(symbol)
+        if prefix is None:
+            prefix = self._prefixes[symbol] = f"symbol={symbol.replace('/', '')}&type=MARKET&side="
+            step = self.markets.lot_step(symbol)
+            # Unknown lot step: round_qty passes amounts through, and "{:.0f}" would round them
+            # to whole units (possibly more than is held), so fall back to floor_8.
+            self._formats[symbol] = f"{{:.{step_decimals(step)}f}}" if step > 0 else ""
+        if quote_amount:
+            size = f"quoteOrderQty={floor_8(amount)}"
+        else:
+            qty_format = self._formats[symbol]
+            if qty_format:
+                size = f"quantity={qty_format.format(self.markets.round_qty(symbol, amount))}"
+            else:
+                size = f"quantity={floor_8(amount)}"
+        query = f"{prefix}{SIDES[side]}&{size}&newOrderRespType=ACK"
+        if client_order_id is not None:
+            query += f"&newClientOrderId={client_order_id}"
+        query += f"&recvWindow={self.recv_window_ms}&timestamp={timestamp_ms}"
+        return f"{query}&signature={self.sign(query)}"
+
+    async def create_order(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        client_order_id: str | None = None,
+        quote_amount: bool = False,
+    ) -> Dict[str, Any]:
+        body = self.order_body(symbol, side, amount, time.time_ns() // 1_000_000, client_order_id, quote_amount)
+        return await self._request("POST", self._order_url, body)
+
+    async def create_listen_key(self) -> str:
+        """Open a user data stream (API key only, no signature)."""
+        result = await self._request("POST", self.base_url + LISTEN_KEY_PATH)
+        return result["listenKey"]
+
+    async def keepalive_listen_key(self, listen_key: str) -> None:
+        await self._request("PUT", self.base_url + LISTEN_KEY_PATH, f"listenKey={listen_key}")
+
+    async def _request(self, method: str, url: str, body: str | None = None) -> Dict[str, Any]:
+        if self._session is None:
+            await self.start()
+        async with self._session.request(method, url, data=body) as resp:  # type: ignore[union-attr]
+            payload = await resp.read()
+            status = resp.status
+        result = self._loads(payload) if payload else {}
+        if status >= 400:
+            raise BinanceRestError(status, result.get("code"), result.get("msg", ""))
+        return result
+
+    async def create_orders(self, orders: Sequence[Dict[str, Any]]) -> Sequence[Dict[str, Any]]:
+        return await asyncio.gather(
+            *(self.create_order(order["symbol"], order["side"], order["amount"]) for order in orders)
+        )
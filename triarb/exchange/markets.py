@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping
+
+from triarb.config import Settings, get_settings
+
+log = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class MarketInfo:
+    symbol: str
+    base: str
+    quote: str
+    taker: float
+    tick_size: float = 0.0
+    lot_step: float = 0.0
+    min_qty: float = 0.0
+    min_notional: float = 0.0
+
+    @classmethod
+    def from_ccxt(cls, market: Mapping[str, Any], taker: float) -> "MarketInfo":
+        precision = market.get("precision") or {}
+        limits = market.get("limits") or {}
+        return cls(
+            symbol=market["symbol"],
+            base=market["base"],
+            quote=market["quote"],
+            taker=taker,
+            # ccxt reports Binance precision as tick sizes (TICK_SIZE precision mode).
+            tick_size=float(precision.get("price") or 0.0),
+            lot_step=float(precision.get("amount") or 0.0),
+            min_qty=float((limits.get("amount") or {}).get("min") or 0.0),
+            min_notional=float((limits.get("cost") or {}).get("min") or 0.0),
+        )
+
+
+class MarketRegistry:
+    """Per-symbol trading metadata (taker fee, tick size, lot step, min notional) by symbol.
+
+    Fees resolve as: a per-symbol entry under ``FEE_TABLE_JSON[exchange]["symbols"]``, then the
+    account-wide ``taker`` rate of the fee table, then the fee listed with the market.
+    Unknown symbols get the default taker rate and no filters.
+    """
+
+    def __init__(self, markets: Iterable[MarketInfo] = (), default_taker: float = 0.001):
+        self.markets: Dict[str, MarketInfo] = {market.symbol: market for market in markets}
+        self.default_taker = default_taker
+        self._taker: Dict[str, float] = {market.symbol: market.taker for market in self.markets.values()}
+
+    def __len__(self) -> int:
+        return len(self.markets)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.markets
+
+    def get(self, symbol: str) -> MarketInfo | None:
+        return self.markets.get(symbol)
+
+    def taker_fee(self, symbol: str) -> float:
+        return self._taker.get(symbol, self.default_taker)
+
+    def tick_size(self, symbol: str) -> float:
+        market = self.markets.get(symbol)
+        return market.tick_size if market is not None else 0.0
+
+    def lot_step(self, symbol: str) -> float:
+        market = self.markets.get(symbol)
+        return market.lot_step if market is not None else 0.0
+
+    def min_notional(self, symbol: str) -> float:
+        market = self.markets.get(symbol)
+        return market.min_notional if market is not None else 0.0
+
+    def round_qty(self, symbol: str, qty: float) -> float:
+        """Round ``qty`` down to the symbol's lot step (unchanged for unknown symbols)."""
+        step = self.lot_step(symbol)
+        if step <= 0:
+            return qty
+        # The final round() strips float noise from the multiplication (0.1234000000001).
+        return round(math.floor(qty / step + 1e-9) * step, 12)
+
+    def as_markets(self) -> List[Dict[str, Any]]:
+        """ccxt-shaped market dicts, enough for ``load_triangle_index``."""
+        return [{"symbol": m.symbol, "base": m.base, "quote": m.quote} for m in self.markets.values()]
+
+    @classmethod
+    def from_settings(cls, settings: Settings | None = None) -> "MarketRegistry":
+        return cls((), _fee_config(settings or get_settings()).get("taker", 0.001))
+
+    @classmethod
+    def from_ccxt(cls, markets: Iterable[Mapping[str, Any]], settings: Settings | None = None) -> "MarketRegistry":
+        fees = _fee_config(settings or get_settings())
+        overrides: Mapping[str, float] = fees.get("symbols", {})
+        account_taker = fees.get("taker")
+        infos = []
+        for market in markets:
+            if not (market.get("symbol") and market.get("base") and market.get("quote")):
+                continue
+            if market.get("active", True) is False or market.get("spot", True) is False:
+                continue
+            symbol = market["symbol"]
+            taker = overrides.get(symbol, account_taker if account_taker is not None else market.get("taker"))
+            infos.append(MarketInfo.from_ccxt(market, float(taker if taker is not None else 0.001)))
+        default = account_taker if account_taker is not None else 0.001
+        return cls(infos, float(default))
+
+    def save(self, path: Path) -> None:
+        payload = {
+            "version": CACHE_VERSION,
+            "fetched_at": time.time(),
+            "default_taker": self.default_taker,
+            "markets": [asdict(market) for market in self.markets.values()],
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_text(json.dumps(payload, separators=(",", ":")))
+            os.replace(tmp, path)
+        except OSError as exc:
+            log.warning("markets.cache_write_failed", extra={"error": str(exc)})
+
+    @classmethod
+    def load(cls, path: Path, max_age_seconds: float | None = None) -> "MarketRegistry | None":
+        """Read a cache written by ``save``; None if missing, unreadable or older than allowed."""
+        try:
+            payload = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if payload.get("version") != CACHE_VERSION:
+            return None
+        if max_age_seconds is not None and time.time() - payload.get("fetched_at", 0) > max_age_seconds:
+            return None
+        return cls((MarketInfo(**market) for market in payload["markets"]), payload["default_taker"])
+
+
+async def load_market_registry(adapter: Any, settings: Settings | None = None) -> MarketRegistry:
+    """Warm-start from the local cache; fetch from the exchange only when it is stale.
+
+    A failed fetch falls back to a stale cache, then to fee-table defaults with no filters.
+    """
+    settings = settings or get_settings()
+    path = Path(settings.market_cache_path)
+    cached = MarketRegistry.load(path, settings.market_cache_ttl_hours * 3600)
+    if cached is not None:
+        log.info("markets.cache_hit", extra={"markets": len(cached), "path": str(path)})
+        return cached
+    try:
+        markets = await adapter.load_markets()
+    except Exception as exc:  # noqa: BLE001
+        stale = MarketRegistry.load(path)
+        log.warning("markets.fetch_failed", extra={"error": str(exc), "stale_cache": stale is not None})
+        return stale if stale is not None else MarketRegistry.from_settings(settings)
+    registry = MarketRegistry.from_ccxt(markets.values(), settings)
+    registry.save(path)
+    log.info("markets.loaded", extra={"markets": len(registry)})
+    return registry
+
+
+def _fee_config(settings: Settings) -> Dict[str, Any]:
+    return settings.fee_table.get(settings.exchange, {})
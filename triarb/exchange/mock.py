@@ -0,0 +1,464 @@
+"""Local stand-in for Binance spot: market data WebSocket, signed REST orders and a matching engine.
+
+Run with ``python -m triarb.exchange.mock [--bases N] [--rate MSGS] [--latency-ms MS]`` and point
+``BINANCE_WS_BASE_URL`` / ``BINANCE_REST_URL`` at it (the command prints the settings to use).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import logging
+import random
+import time
+import urllib.parse
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Dict, List, Tuple
+
+from aiohttp import WSMsgType, web
+
+from triarb.exchange.markets import MarketInfo, MarketRegistry
+from triarb.logging import configure_logging
+from triarb.marketdata.decoder import DEPTH_CHANNEL
+from triarb.marketdata.synthetic import Levels, SyntheticMarket
+
+log = logging.getLogger(__name__)
+
+LOT_STEP = 1e-6
+MAX_BATCH = 1_000  # updates generated per scheduler wake-up before yielding to the loop
+
+
+@dataclass
+class MockOrder:
+    order_id: int
+    symbol: str
+    side: str
+    quantity: float
+    executed: float
+    quote: float
+    received_ns: int
+    filled_ns: int
+    client_order_id: str = ""
+
+
+class _Subscriber:
+    __slots__ = ("ws", "channel", "diff", "symbols")
+
+    def __init__(self, ws: web.WebSocketResponse, channel: str, symbols: List[str]):
+        self.ws = ws
+        self.channel = channel
+        self.diff = channel.startswith("depth@")
+        self.symbols = symbols
+
+
+class MockExchange:
+    """Serves ``market`` over the combined-stream WebSocket format at ``rate`` updates/second
+    and fills MARKET orders against the same simulated books after ``latency_ms`` (+ jitter).
+
+    Order and snapshot endpoints follow the Binance REST layout. With ``api_secret`` set,
+    order signatures are verified the way Binance does; otherwise any signature is accepted.
+    """
+
+    def __init__(
+        self,
+        market: SyntheticMarket,
+        rate: float = 1_000.0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        taker: float = 0.001,
+        api_secret: str | None = None,
+        history: int = 10_000,
+    ):
+        self.market = market
+        self.rate = rate
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.taker = taker
+        self._secret = api_secret.encode() if api_secret else None
+        self._raw = {symbol.replace("/", ""): symbol for symbol in market.symbols}
+        self._books: Dict[str, Tuple[Levels, Levels]] = {symbol: market.book(symbol) for symbol in market.symbols}
+        self._sequence: Dict[str, int] = dict.fromkeys(market.symbols, 1)
+        self._subscribers: Dict[str, List[_Subscriber]] = {}
+        self._user_streams: Dict[str, List[web.WebSocketResponse]] = {}
+        self._order_ids = itertools.count(1)
+        self._rng = random.Random(0)
+        self.orders: Deque[MockOrder] = deque(maxlen=history)
+        self.published = 0
+        self.frames_sent = 0
+        self.filled = 0
+        self.rejected = 0
+        self._runner: web.AppRunner | None = None
+        self._producer: asyncio.Task | None = None
+        self.host = "127.0.0.1"
+        self.port = 0
+
+    def registry(self) -> MarketRegistry:
+        """Metadata for the simulated symbols, e.g. to seed ``MARKET_CACHE_PATH``."""
+        return MarketRegistry(
+            (
+                MarketInfo(symbol, *symbol.split("/"), taker=self.taker, tick_size=1e-8, lot_step=LOT_STEP)
+                for symbol in self.market.symbols
+            ),
+            self.taker,
+        )
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/stream", self._stream)
+        app.router.add_get("/api/v3/ping", self._ping)
+        app.router.add_get("/api/v3/depth", self._depth)
+        app.router.add_post("/api/v3/order", self._order)
+        app.router.add_post("/api/v3/userDataStream", self._listen_key)
+        app.router.add_put("/api/v3/userDataStream", self._ping)
+        app.router.add_get("/ws/{listen_key}", self._user_stream)
+        app.router.add_get("/mock/stats", self._stats)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        self.host = host
+        self._producer = asyncio.create_task(self.produce())
+        log.info("mock.start", extra={"port": self.port, "symbols": len(self.market.symbols), "rate": self.rate})
+
+    async def close(self) -> None:
+        if self._producer is not None:
+            self._producer.cancel()
+            try:
+                await self._producer
+            except asyncio.CancelledError:
+                pass
+            self._producer = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    @property
+    def rest_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def stats(self) -> Dict[str, float]:
+        latencies = [(order.filled_ns - order.received_ns) / 1e6 for order in self.orders]
+        return {
+            "updates": self.published,
+            "frames_sent": self.frames_sent,
+            "subscriptions": sum(len(subs) for subs in self._subscribers.values()),
+            "orders_filled": self.filled,
+            "orders_rejected": self.rejected,
+            "avg_fill_latency_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+        }
+
+    # -- market data -----------------------------------------------------------------------
+
+    async def produce(self) -> None:
+        """Step random symbols at ``rate`` per second and push each update to its subscribers."""
+        symbols = self.market.symbols
+        pick = self.market.rng.randrange
+        start = time.perf_counter()
+        while True:
+            due = min(int((time.perf_counter() - start) * self.rate) - self.published, MAX_BATCH)
+            for _ in range(due):
+                await self._publish(symbols[pick(len(symbols))])
+            await asyncio.sleep(0 if due == MAX_BATCH else 0.001)
+
+    async def _publish(self, symbol: str) -> None:
+        previous = self._books[symbol]
+        bids, asks = self._books[symbol] = self.market.step(symbol)
+        sequence = self._sequence[symbol] = self._sequence[symbol] + 1
+        self.published += 1
+        subscribers = self._subscribers.get(symbol)
+        if not subscribers:
+            return
+        frames: Dict[str, str] = {}
+        for sub in list(subscribers):
+            frame = frames.get(sub.channel)
+            if frame is None:
+                if sub.diff:
+                    # Diff streams must also delete the levels of the previous ladder.
+                    payload = self.market.frame_payload(
+                        symbol, _with_removals(bids, previous[0]), _with_removals(asks, previous[1]),
+                        sub.channel, True, sequence,
+                    )
+                else:
+                    payload = self.market.frame_payload(symbol, bids, asks, sub.channel, False, sequence)
+                frame = frames[sub.channel] = json.dumps(payload)
+            try:
+                await sub.ws.send_str(frame)
+                self.frames_sent += 1
+            except ConnectionError:
+                self._unsubscribe(sub)
+
+    async def _stream(self, request: web.Request) -> web.WebSocketResponse:
+        symbols, channel = [], DEPTH_CHANNEL
+        for name in filter(None, request.query.get("streams", "").split("/")):
+            raw, _, channel = name.partition("@")
+            symbol = self._raw.get(raw.upper())
+            if symbol is not None:
+                symbols.append(symbol)
+        ws = web.WebSocketResponse(heartbeat=20)
+        await ws.prepare(request)
+        sub = _Subscriber(ws, channel, symbols)
+        for symbol in symbols:
+            self._subscribers.setdefault(symbol, []).append(sub)
+        try:
+            async for message in ws:
+                if message.type == WSMsgType.ERROR:
+                    break
+        finally:
+            self._unsubscribe(sub)
+        return ws
+
+    def _unsubscribe(self, sub: _Subscriber) -> None:
+        for symbol in sub.symbols:
+            subscribers = self._subscribers.get(symbol, [])
+            if sub in subscribers:
+                subscribers.remove(sub)
+
+    async def _depth(self, request: web.Request) -> web.Response:
+        symbol = self._raw.get(request.query.get("symbol", "").upper())
+        if symbol is None:
+            return _error(400, -1121, "Invalid symbol.")
+        limit = int(request.query.get("limit", 100))
+        bids, asks = self._books[symbol]
+        return web.json_response(
+            {
+                "lastUpdateId": self._sequence[symbol],
+                "bids": [[f"{p:.8f}", f"{q:.8f}"] for p, q in bids[:limit]],
+                "asks": [[f"{p:.8f}", f"{q:.8f}"] for p, q in asks[:limit]],
+            }
+        )
+
+    # -- order entry -----------------------------------------------------------------------
+
+    async def _ping(self, request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    async def _order(self, request: web.Request) -> web.Response:
+        received_ns = time.time_ns()
+        body = await request.text()
+        form = dict(urllib.parse.parse_qsl(body))
+        if self._secret is not None:
+            query, _, signature = body.rpartition("&signature=")
+            expected = hmac.new(self._secret, query.encode(), hashlib.sha256).hexdigest()
+            if not hmac.compare_digest(signature, expected):
+                self.rejected += 1
+                return _error(401, -1022, "Signature for this request is not valid.")
+        symbol = self._raw.get(form.get("symbol", "").upper())
+        side = form.get("side", "").upper()
+        if symbol is None:
+            self.rejected += 1
+            return _error(400, -1121, "Invalid symbol.")
+        if form.get("type") != "MARKET" or side not in ("BUY", "SELL"):
+            self.rejected += 1
+            return _error(400, -1116, "Invalid orderType.")
+        by_quote = "quoteOrderQty" in form
+        try:
+            quantity = float(form["quoteOrderQty" if by_quote else "quantity"])
+        except (KeyError, ValueError):
+            quantity = 0.0
+        if quantity <= 0:
+            self.rejected += 1
+            return _error(400, -1013, "Invalid quantity.")
+
+        delay_ms = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        fills = self.match(symbol, side, quantity, by_quote)
+        executed = sum(qty for _, qty in fills)
+        quote = sum(price * qty for price, qty in fills)
+        order_id = next(self._order_ids)
+        client_order_id = form.get("newClientOrderId") or f"mock-{order_id}"
+        order = MockOrder(
+            order_id, symbol, side, quantity, executed, quote, received_ns, time.time_ns(), client_order_id
+        )
+        self.orders.append(order)
+        self.filled += 1
+        complete = (quote if by_quote else executed) >= quantity * (1 - 1e-9)
+        await self._report(order, fills, "FILLED" if complete else "EXPIRED")
+
+        response = {
+            "symbol": form["symbol"],
+            "orderId": order.order_id,
+            "clientOrderId": client_order_id,
+            "transactTime": order.filled_ns // 1_000_000,
+        }
+        if form.get("newOrderRespType") != "ACK":
+            fee_asset = symbol.split("/")[0 if side == "BUY" else 1]
+            response.update(
+                {
+                    "status": "FILLED" if complete else "EXPIRED",
+                    "executedQty": f"{executed:.8f}",
+                    "cummulativeQuoteQty": f"{quote:.8f}",
+                    "fills": [
+                        {
+                            "price": f"{price:.8f}",
+                            "qty": f"{qty:.8f}",
+                            "commission": f"{self._commission(side, price, qty):.8f}",
+                            "commissionAsset": fee_asset,
+                        }
+                        for price, qty in fills
+                    ],
+                }
+            )
+        return web.json_response(response)
+
+    def match(self, symbol: str, side: str, quantity: float, by_quote: bool = False) -> Levels:
+        """Take ``quantity`` (base, or quote with ``by_quote``) from the opposite side of the
+        book; consumed depth stays gone until the symbol's next update. Returns (price, qty)
+        fills, possibly short."""
+        bids, asks = self._books[symbol]
+        levels = asks if side == "BUY" else bids
+        fills: Levels = []
+        remaining = quantity
+        rest: Levels = []
+        for price, qty in levels:
+            if remaining <= 0:
+                rest.append((price, qty))
+                continue
+            take = min(qty, remaining / price) if by_quote else min(qty, remaining)
+            fills.append((price, take))
+            remaining -= take * price if by_quote else take
+            if qty > take:
+                rest.append((price, qty - take))
+        self._books[symbol] = (bids, rest) if side == "BUY" else (rest, asks)
+        return fills
+
+    def _commission(self, side: str, price: float, qty: float) -> float:
+        # Taker fee in the asset received, as Binance charges without BNB discounts.
+        return (qty if side == "BUY" else price * qty) * self.taker
+
+    # -- user data stream ------------------------------------------------------------------
+
+    async def _listen_key(self, request: web.Request) -> web.Response:
+        listen_key = f"mock{next(self._order_ids):016d}"
+        self._user_streams.setdefault(listen_key, [])
+        return web.json_response({"listenKey": listen_key})
+
+    async def _user_stream(self, request: web.Request) -> web.WebSocketResponse:
+        streams = self._user_streams.get(request.match_info["listen_key"])
+        if streams is None:
+            raise web.HTTPNotFound()
+        ws = web.WebSocketResponse(heartbeat=20)
+        await ws.prepare(request)
+        streams.append(ws)
+        try:
+            async for message in ws:
+                if message.type == WSMsgType.ERROR:
+                    break
+        finally:
+            streams.remove(ws)
+        return ws
+
+    async def _report(self, order: MockOrder, fills: Levels, final: str) -> None:
+        """Send ``executionReport`` events for ``order``: one per trade, the last one ``final``."""
+        sockets = [ws for streams in self._user_streams.values() for ws in streams]
+        if not sockets:
+            return
+        base, quote_asset = order.symbol.split("/")
+        fee_asset = base if order.side == "BUY" else quote_asset
+        cum_qty = cum_quote = 0.0
+        events = []
+        trades = fills or [(0.0, 0.0)]
+        for idx, (price, qty) in enumerate(trades):
+            cum_qty += qty
+            cum_quote += price * qty
+            last = idx == len(trades) - 1
+            events.append(
+                json.dumps(
+                    {
+                        "e": "executionReport",
+                        "E": order.filled_ns // 1_000_000,
+                        "s": order.symbol.replace("/", ""),
+                        "c": order.client_order_id,
+                        "S": order.side,
+                        "o": "MARKET",
+                        "x": "TRADE" if qty else "EXPIRED",
+                        "X": final if last else "PARTIALLY_FILLED",
+                        "i": order.order_id,
+                        "l": f"{qty:.8f}",
+                        "z": f"{cum_qty:.8f}",
+                        "L": f"{price:.8f}",
+                        "n": f"{self._commission(order.side, price, qty):.8f}",
+                        "N": fee_asset,
+                        "T": order.filled_ns // 1_000_000,
+                        "Z": f"{cum_quote:.8f}",
+                    }
+                )
+            )
+        for ws in sockets:
+            for event in events:
+                try:
+                    await ws.send_str(event)
+                except ConnectionError:
+                    break
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats())
+
+
+def _with_removals(levels: Levels, previous: Levels) -> Levels:
+    # Compare on the wire format: distinct floats can print as the same 8-decimal price.
+    prices = {f"{price:.8f}" for price, _ in levels}
+    return list(levels) + [(price, 0.0) for price, _ in previous if f"{price:.8f}" not in prices]
+
+
+def _error(status: int, code: int, message: str) -> web.Response:
+    return web.json_response({"code": code, "msg": message}, status=status)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    market = SyntheticMarket(args.bases, levels=args.levels, seed=args.seed)
+    exchange = MockExchange(market, args.rate, args.latency_ms, args.jitter_ms, api_secret=args.api_secret)
+    await exchange.start(args.host, args.port)
+    if args.market_cache:
+        exchange.registry().save(Path(args.market_cache))
+    print(f"BINANCE_WS_BASE_URL={exchange.ws_url}")
+    print(f"BINANCE_REST_URL={exchange.rest_url}")
+    print(f"TRI_SYMBOLS={','.join(market.bases)}")
+    if args.market_cache:
+        print(f"MARKET_CACHE_PATH={args.market_cache}")
+    print("PAPER_MODE=false")
+    print("ORDER_TRANSPORT=rest")
+    try:
+        while True:
+            await asyncio.sleep(10)
+            log.info("mock.stats", extra=exchange.stats())
+    finally:
+        await exchange.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local mock exchange for load tests.")
+    parser.add_argument("--bases", type=int, default=20)
+    parser.add_argument("--levels", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rate", type=float, default=1_000.0, help="book updates per second")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="order arrival to fill")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--api-secret", default=None, help="verify order signatures with this secret")
+    parser.add_argument("--market-cache", default=None, help="write market metadata here for the engine")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    configure_logging("INFO")
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
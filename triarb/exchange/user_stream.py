@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict
+
+import websockets
+
+from triarb.marketdata.decoder import resolve_loads
+
+log = logging.getLogger(__name__)
+
+FINAL_STATUSES = frozenset({"FILLED", "EXPIRED", "CANCELED", "REJECTED", "EXPIRED_IN_MATCH"})
+KEEPALIVE_SECONDS = 30 * 60
+MAX_UNCLAIMED = 1_024
+
+
+@dataclass
+class OrderFill:
+    """Running totals of one order from its execution reports; complete once ``final``."""
+
+    symbol: str
+    client_order_id: str
+    side: str
+    status: str = "NEW"
+    filled_qty: float = 0.0
+    quote_qty: float = 0.0
+    commission: Dict[str, float] = field(default_factory=dict)
+    event_ms: int = 0
+    recv_ns: int = 0
+
+    @property
+    def final(self) -> bool:
+        return self.status in FINAL_STATUSES
+
+    def received(self, base: str, quote: str) -> float:
+        """Amount of the asset this order bought, net of commission charged in it."""
+        if self.side == "BUY":
+            return self.filled_qty - self.commission.get(base, 0.0)
+        return self.quote_qty - self.commission.get(quote, 0.0)
+
+
+class UserDataStream:
+    """Tracks execution reports by client order id and hands out final fills.
+
+    ``expect`` returns a future that resolves with the ``OrderFill`` as soon as the report
+    carrying a final status is applied. Reports for ids nobody has asked for yet are kept
+    (up to ``MAX_UNCLAIMED``) so a fill that beats its own REST response is not lost.
+    """
+
+    def __init__(self, loads: Callable[[str | bytes], Any] | None = None):
+        self._loads = loads or resolve_loads("auto")
+        self._orders: OrderedDict[str, OrderFill] = OrderedDict()
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self.reports = 0
+
+    def expect(self, client_order_id: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        fill = self._orders.get(client_order_id)
+        if fill is not None and fill.final:
+            del self._orders[client_order_id]
+            future.set_result(fill)
+        else:
+            self._waiters[client_order_id] = future
+        return future
+
+    def forget(self, client_order_id: str) -> None:
+        self._waiters.pop(client_order_id, None)
+        self._orders.pop(client_order_id, None)
+
+    def handle_message(self, message: str | bytes, recv_ns: int = 0) -> OrderFill | None:
+        event = self._loads(message)
+        if event.get("e") != "executionReport":
+            return None
+        self.reports += 1
+        client_order_id = event["c"]
+        fill = self._orders.get(client_order_id)
+        if fill is None:
+            fill = self._orders[client_order_id] = OrderFill(event["s"], client_order_id, event["S"])
+            if len(self._orders) > MAX_UNCLAIMED:
+                self._orders.popitem(last=False)
+        fill.status = event["X"]
+        fill.filled_qty = float(event["z"])
+        fill.quote_qty = float(event["Z"])
+        commission = float(event.get("n") or 0.0)
+        if commission:
+            asset = event["N"]
+            fill.commission[asset] = fill.commission.get(asset, 0.0) + commission
+        fill.event_ms = event["E"]
+        fill.recv_ns = recv_ns or time.time_ns()
+        if fill.final:
+            waiter = self._waiters.pop(client_order_id, None)
+            if waiter is not None:
+                del self._orders[client_order_id]
+                if not waiter.done():
+                    waiter.set_result(fill)
+        return fill
+
+
+class BinanceUserDataStream(UserDataStream):
+    """``UserDataStream`` fed from Binance's ``/ws/<listenKey>`` socket.
+
+    The listen key comes from ``rest`` (a ``BinanceRestClient``) and is kept alive every
+    30 minutes; the socket reconnects with a fresh key after errors.
+    """
+
+    def __init__(self, rest: Any, ws_base_url: str, loads: Callable[[str | bytes], Any] | None = None):
+        super().__init__(loads)
+        self.rest = rest
+        self.ws_base_url = ws_base_url.rstrip("/")
+        self.connected = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        backoff = 1
+        clock = time.time_ns
+        while True:
+            keepalive: asyncio.Task | None = None
+            try:
+                listen_key = await self.rest.create_listen_key()
+                keepalive = asyncio.create_task(self._keepalive(listen_key))
+                async with websockets.connect(f"{self.ws_base_url}/ws/{listen_key}", ping_interval=20) as ws:
+                    backoff = 1
+                    self.connected.set()
+                    log.info("user_stream.connected")
+                    handle = self.handle_message
+                    async for message in ws:
+                        handle(message, clock())
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                log.warning("user_stream.reconnect", extra={"error": str(exc)})
+            finally:
+                self.connected.clear()
+                if keepalive is not None:
+                    keepalive.cancel()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    async def _keepalive(self, listen_key: str) -> None:
+        while True:
+            await asyncio.sleep(KEEPALIVE_SECONDS)
+            try:
+                await self.rest.keepalive_listen_key(listen_key)
+            except Exception as exc:  # noqa: BLE001
+                log.warning("user_stream.keepalive_failed", extra={"error": str(exc)})
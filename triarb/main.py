@@ -2,45 +2,231 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from triarb.config import get_settings
 from triarb.engine.executor import Executor
 from triarb.engine.risk import RiskManager
-from triarb.engine.signals import SignalEngine
-from triarb.engine.triangle import build_triangles
+from triarb.engine.scheduler import OpportunityScheduler
+from triarb.engine.signals import Opportunity, SignalEngine
+from triarb.engine.triangle import build_triangles, load_triangle_index
 from triarb.exchange.binance import BinanceAdapter
+from triarb.exchange.markets import load_market_registry
 from triarb.logging import configure_logging
 from triarb.marketdata.aggregator import MarketDataAggregator
+from triarb.marketdata.orderbook import OrderBookStore
+from triarb.metrics import METRICS, STARTUP, start_metrics_server
+from triarb.runtime import IdleCollector, apply_profile, run_engine, track_gc_pauses
+
+if TYPE_CHECKING:
+    # SQLAlchemy, redis and the admin server load only when enabled.
+    from triarb.api.server import EmbeddedAdminServer
+    from triarb.data.redis_state import RedisPublisher
+    from triarb.data.writer import WriteBehindWriter
+    from triarb.exchange.user_stream import BinanceUserDataStream
 
 log = logging.getLogger(__name__)
 
 
 async def run() -> None:
+    STARTUP.mark("imports")
     settings = get_settings()
     configure_logging(settings.log_level)
+    STARTUP.mark("settings")
+    track_gc_pauses()
 
-    triangles = build_triangles(settings.quote, settings.base_symbols)
+    adapter = BinanceAdapter(config={})
+    registry = await load_market_registry(adapter, settings)
+    adapter.markets = registry
+    STARTUP.mark("markets")
+    if settings.triangle_source == "market":
+        triangles = load_triangle_index(settings.quote, registry.as_markets(), Path(settings.triangle_cache_path))
+    else:
+        triangles = build_triangles(settings.quote, settings.base_symbols)
     unique_symbols = sorted({symbol for triangle in triangles for symbol in triangle.symbols})
 
     market = MarketDataAggregator(unique_symbols)
+    report_startup_on_first_book(market.store)
     await market.start()
+    STARTUP.mark("marketdata_started")
+    await adapter.connect_orders()
 
-    adapter = BinanceAdapter(config={})
     risk = RiskManager()
-    signal_engine = SignalEngine(triangles, market.store)
-    executor = Executor(adapter, market.store, risk)
+    if settings.signal_backend == "numpy":
+        from triarb.engine.batch import BatchSignalEngine
+
+        signal_engine: SignalEngine = BatchSignalEngine(triangles, market.store, registry)
+    else:
+        signal_engine = SignalEngine(triangles, market.store, registry)
+    user_stream: BinanceUserDataStream | None = None
+    if settings.execution_mode == "chained" and adapter.rest is not None:
+        from triarb.engine.chained import ChainedExecutor
+        from triarb.exchange.user_stream import BinanceUserDataStream
+
+        user_stream = BinanceUserDataStream(adapter.rest, settings.binance_ws_base_url)
+        user_stream.start()
+        executor: Executor = ChainedExecutor(
+            adapter, market.store, risk, registry, adapter.rest, user_stream, settings.chain_fill_timeout_ms
+        )
+    else:
+        if settings.execution_mode == "chained":
+            log.warning("executor.chained_unavailable", extra={"reason": "needs PAPER_MODE=false, ORDER_TRANSPORT=rest"})
+        executor = Executor(adapter, market.store, risk, registry)
+    writer: WriteBehindWriter | None = None
+    if settings.persist_opportunities:
+        from triarb.data.writer import create_writer
+
+        writer = create_writer(settings)
+        writer.start()
+    publisher: RedisPublisher | None = None
+    if settings.redis_publish_books:
+        from triarb.data.redis_state import RedisPublisher
+
+        publisher = RedisPublisher.from_settings(market.store)
+        publisher.attach()
+
+    async def handle(opp: Opportunity) -> None:
+        # Orders go out first: with PERSIST_OVERFLOW=block a full queue holds this cycle's
+        # slot, never the legs.
+        try:
+            await executor.execute(opp)
+        finally:
+            if writer is not None:
+                key = ">".join(opp.triangle.symbols)
+                await writer.record_opportunity(key, opp.gross_bps, opp.net_bps, opp.notional_quote)
+
+    scheduler = OpportunityScheduler(handle, settings.max_open_cycles, settings.opportunity_ttl_ms)
+    signal_engine.on_invalidate = scheduler.cancel
+    scheduler.start()
+
+    if settings.metrics_enabled:
+        register_engine_metrics(market, signal_engine, risk, writer, publisher)
+        METRICS.gauge("opportunities_queued", "Ranked opportunities waiting for a free cycle.", scheduler.queued)
+        start_metrics_server(settings.prometheus_port)
 
-    log.info("engine.start", extra={"triangles": len(triangles)})
+    admin: EmbeddedAdminServer | None = None
+    if settings.admin_embedded:
+        from triarb.api.server import EmbeddedAdminServer
+        from triarb.api.state import EngineState
+
+        state = EngineState.create(market.store, settings.admin_ring_size)
+        signal_engine.journal = state.opportunities
+        executor.journal = state.cycles
+        state.add_stats("marketdata", market.stats)
+        state.add_stats("open_cycles", lambda: risk.open_cycles)
+        state.add_stats("opportunities_queued", scheduler.queued)
+        state.add_stats("opportunities_in_flight", scheduler.in_flight)
+        evaluate = "evaluate_symbol" if settings.signal_mode == "event" else "evaluate"
+        state.add_timing("signal_evaluate", signal_engine, evaluate)
+        state.add_timing("executor_execute", executor, "execute")
+        for client in market.clients:  # none when shard workers decode in other processes
+            state.add_timing("ws_parse", client.decoder, "decode")
+        admin = EmbeddedAdminServer(state, "0.0.0.0", settings.admin_port)
+        admin.start()
+
+    collector: IdleCollector | None = None
+    runtime = apply_profile(settings.performance_profile, settings.cpu_affinity)
+    if settings.performance_profile == "latency":
+        # Book updates and in-flight cycles both count as work; full collections wait for a gap.
+        collector = IdleCollector(
+            activity=lambda: market.store.updates,
+            busy=lambda: bool(scheduler.in_flight() or scheduler.queued()),
+        )
+        collector.start()
+        if settings.metrics_enabled:
+            METRICS.counter_source(
+                "gc_full_collections",
+                "Deferred full collections, run in an idle gap or forced after the deadline.",
+                ["trigger"],
+                collector.counts,
+            )
+
+    STARTUP.mark("engine_ready")
+    log.info(
+        "engine.start",
+        extra={"triangles": len(triangles), "mode": settings.signal_mode, "runtime": runtime},
+    )
 
     try:
-        while True:
-            opportunities = signal_engine.evaluate()
-            for opp in opportunities:
-                await executor.execute(opp)
-            await asyncio.sleep(0.25)
+        if settings.signal_mode == "event":
+            signal_engine.listen()
+            while True:
+                scheduler.submit(await signal_engine.wait_opportunities())
+        else:
+            while True:
+                scheduler.submit(signal_engine.evaluate())
+                await asyncio.sleep(settings.poll_interval_ms / 1000)
     finally:
+        signal_engine.close()
+        if collector is not None:
+            await collector.close()
+        if admin is not None:
+            await admin.close()
+        await scheduler.close()
+        if user_stream is not None:
+            await user_stream.close()
+        if writer is not None:
+            await writer.close()
+        if publisher is not None:
+            await publisher.close()
         await market.stop()
+        await adapter.close()
+
+
+def report_startup_on_first_book(store: OrderBookStore) -> None:
+    """Mark the first applied book and log the startup report (milliseconds since import)."""
+
+    def on_book(symbol: str) -> None:
+        if "first_book" in STARTUP.phases:
+            return
+        STARTUP.mark("first_book")
+        log.info("engine.startup", extra={"phases_ms": dict(STARTUP.phases)})
+        # Not from inside the store's listener loop.
+        asyncio.get_running_loop().call_soon(store.unsubscribe, on_book)
+
+    store.subscribe(on_book)
+
+
+def register_engine_metrics(
+    market: MarketDataAggregator,
+    signal_engine: SignalEngine,
+    risk: RiskManager,
+    writer: WriteBehindWriter | None = None,
+    publisher: RedisPublisher | None = None,
+) -> None:
+    METRICS.counter_source(
+        "ws_messages",
+        "WebSocket frames received per shard.",
+        ["shard"],
+        lambda: [((str(entry["shard"]),), entry.get("messages", 0)) for entry in market.stats()],
+    )
+    METRICS.labelled_gauge(
+        "ws_connected",
+        "1 while the shard's WebSocket connection is open.",
+        ["shard"],
+        lambda: [((str(entry["shard"]),), float(entry.get("connected", False))) for entry in market.stats()],
+    )
+    METRICS.labelled_gauge(
+        "startup_seconds", "Seconds from package import to each startup phase.", ["phase"], STARTUP.values
+    )
+    METRICS.gauge("opportunities_pending", "Signalled opportunities not yet picked up.", signal_engine.pending)
+    METRICS.gauge("open_cycles", "Cycles currently executing.", lambda: risk.open_cycles)
+    METRICS.gauge("ingest_queue_depth", "Updates waiting in the shard worker queue.", market.queue_depth)
+    if writer is not None:
+        METRICS.gauge("persist_queue_depth", "Rows waiting to be written.", writer.queue_depth)
+        METRICS.gauge(
+            "persist_lag_seconds",
+            "Enqueue-to-commit age of the oldest row in the last flushed batch.",
+            lambda: writer.last_lag_ns / 1e9,
+        )
+    if publisher is not None:
+        METRICS.gauge("redis_publish_pending", "Keys waiting for the next Redis flush.", publisher.pending)
+        METRICS.gauge("redis_publish_batch_keys", "Keys written by the last Redis flush.", lambda: publisher.last_batch)
+        METRICS.counter_source(
+            "redis_updates_coalesced", "Updates superseded before being written.", [], lambda: [((), publisher.coalesced)]
+        )
 
 
 if __name__ == "__main__":
-    asyncio.run(run())
+    run_engine(run(), get_settings().performance_profile)
@@ -2,33 +2,106 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Sequence
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence
 
+from triarb.config import get_settings
 from triarb.marketdata.orderbook import OrderBookStore
-from triarb.marketdata.ws_client import BinanceWsClient
+from triarb.marketdata.recorder import FrameRecorder
+from triarb.marketdata.ws_client import RATE_INTERVAL_SECONDS, BinanceWsClient
+
+if TYPE_CHECKING:
+    from triarb.marketdata.shm import SharedOrderBookStore
+    from triarb.marketdata.workers import ShardWorkerPool
 
 log = logging.getLogger(__name__)
 
 
+def shard_symbols(symbols: Sequence[str], shard_size: int) -> List[List[str]]:
+    return [list(symbols[idx : idx + shard_size]) for idx in range(0, len(symbols), shard_size)]
+
+
 class MarketDataAggregator:
-    def __init__(self, symbols: Sequence[str]):
+    """Feeds one ``OrderBookStore`` from WebSocket shards of at most ``ws_shard_size`` streams.
+
+    Shards run as tasks on the current loop, or in ``ws_shard_workers`` worker processes that
+    hand books over through a queue or, with ``ws_shard_transport=shm``, a shared memory region.
+    """
+
+    def __init__(self, symbols: Sequence[str], shard_size: int | None = None, workers: int | None = None):
+        settings = get_settings()
+        self.symbols = list(symbols)
         self.store = OrderBookStore()
-        self.ws_client = BinanceWsClient(symbols, self.store)
-        self._task: asyncio.Task | None = None
+        self.shards = shard_symbols(self.symbols, shard_size or settings.ws_shard_size)
+        workers = settings.ws_shard_workers if workers is None else workers
+        self.clients: List[BinanceWsClient] = []
+        self.pool: ShardWorkerPool | None = None
+        self.recorder: FrameRecorder | None = None
+        self.shared: SharedOrderBookStore | None = None
+        if workers > 0 and self.shards:
+            # Worker processes (and numpy, for shared memory) load only when configured.
+            from triarb.marketdata.workers import ShardWorkerPool
+
+            if settings.ws_shard_transport == "shm":
+                from triarb.marketdata.shm import SharedOrderBookStore
+
+                self.store = self.shared = SharedOrderBookStore.create(self.symbols)
+            self.pool = ShardWorkerPool(
+                self.shards, self.store, workers, poll_interval_ms=settings.shm_poll_interval_ms
+            )
+        else:
+            if settings.record_dir:
+                self.recorder = FrameRecorder(settings.record_dir)
+            self.clients = [
+                BinanceWsClient(shard, self.store, shard=idx, recorder=self.recorder)
+                for idx, shard in enumerate(self.shards)
+            ]
+        self._tasks: List[asyncio.Task] = []
 
     async def start(self) -> None:
-        if self._task is None:
-            self._task = asyncio.create_task(self.ws_client.start())
-            log.info("marketdata.start", extra={"symbols": len(self.ws_client.symbols)})
+        if self._tasks or (self.pool is not None and self.pool.running):
+            return
+        if self.pool is not None:
+            await self.pool.start()
+        else:
+            self._tasks = [asyncio.create_task(client.start()) for client in self.clients]
+            self._tasks.append(asyncio.create_task(self._sample_rates()))
+        log.info("marketdata.start", extra={"symbols": len(self.symbols), "shards": len(self.shards)})
 
     async def stop(self) -> None:
-        if self._task:
-            self._task.cancel()
+        if self.pool is not None:
+            await self.pool.stop()
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
             try:
-                await self._task
+                await task
             except asyncio.CancelledError:
                 pass
-            self._task = None
+        self._tasks = []
+        for client in self.clients:
+            await client.close()
+        if self.recorder is not None:
+            await asyncio.to_thread(self.recorder.close)
+        if self.shared is not None:
+            self.shared.close()
+
+    async def _sample_rates(self) -> None:
+        while True:
+            await asyncio.sleep(RATE_INTERVAL_SECONDS)
+            for client in self.clients:
+                client.stats.sample_rate()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        if self.pool is not None:
+            return self.pool.stats()
+        return [client.stats.snapshot() for client in self.clients]
+
+    def queue_depth(self) -> int:
+        """Decoded updates waiting to be applied (worker queue) or written (recorder)."""
+        depth = self.pool.queue_depth() if self.pool is not None else 0
+        if self.recorder is not None:
+            depth += self.recorder.backlog()
+        return depth
 
     def best_bid_ask(self, symbol: str):
         return self.store.best_bid_ask(symbol)
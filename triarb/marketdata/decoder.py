@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+Loads = Callable[[Any], Any]
+
+DEPTH_CHANNEL = "depth5@100ms"
+
+
+class BookUpdate(NamedTuple):
+    """Decoded depth or bookTicker payload: only the fields the order book store needs."""
+
+    symbol: str
+    bids: List[Tuple[float, float]]
+    asks: List[Tuple[float, float]]
+    event_time: int = 0
+    first_update_id: int = 0
+    final_update_id: int = 0
+
+
+def stream_name(symbol: str, channel: str = DEPTH_CHANNEL) -> str:
+    return f"{symbol.lower().replace('/', '')}@{channel}"
+
+
+def resolve_loads(parser: str = "auto") -> Loads:
+    """Return the JSON ``loads`` for ``parser`` ("auto", "orjson" or "json")."""
+    if parser in ("auto", "orjson"):
+        try:
+            import orjson
+        except ImportError:
+            if parser == "orjson":
+                raise
+        else:
+            return orjson.loads
+    return json.loads
+
+
+def symbol_map(raw: str) -> str:
+    raw = raw.upper()
+    quotes = ["USDT", "BTC", "ETH", "BNB"]
+    for quote in quotes:
+        if raw.endswith(quote):
+            base = raw[: -len(quote)]
+            return f"{base}/{quote}"
+    return raw
+
+
+class FrameDecoder:
+    """Decode Binance combined-stream frames into ``BookUpdate`` records.
+
+    Stream names and raw exchange symbols are resolved through lookups precomputed from the
+    subscribed symbols, so the per-frame work is one ``loads`` call plus the level floats.
+    Partial-depth payloads carry no symbol, hence the stream-name lookup.
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        channel: str = DEPTH_CHANNEL,
+        loads: Loads | None = None,
+        depth: int | None = None,
+    ):
+        self.loads = loads or resolve_loads()
+        self.depth = depth
+        self._streams: Dict[str, str] = {}
+        self._raw: Dict[str, str] = {}
+        for symbol in symbols:
+            self._streams[stream_name(symbol, channel)] = symbol
+            self._raw[symbol.replace("/", "").upper()] = symbol
+
+    def decode(self, frame: str | bytes) -> BookUpdate | None:
+        message = self.loads(frame)
+        data = message.get("data")
+        if data is None:
+            data = message
+            stream = None
+        else:
+            stream = message.get("stream")
+
+        if "bids" in data:
+            symbol = self._streams.get(stream) if stream else None
+            if symbol is None:
+                return None
+            bids, asks = data["bids"], data["asks"]
+            if self.depth is not None:
+                bids, asks = bids[: self.depth], asks[: self.depth]
+            return BookUpdate(symbol, self._levels(bids), self._levels(asks))
+
+        raw = data.get("s")
+        if not raw:
+            return None
+        symbol = self._raw.get(raw)
+        if symbol is None:
+            symbol = self._raw[raw] = symbol_map(raw)
+
+        bids = data.get("b")
+        if isinstance(bids, str):
+            # bookTicker: single best level per side.
+            return BookUpdate(
+                symbol,
+                [(float(bids), float(data["B"]))],
+                [(float(data["a"]), float(data["A"]))],
+                0,
+                data.get("u", 0),
+                data.get("u", 0),
+            )
+        return BookUpdate(
+            symbol,
+            self._levels(bids or ()),
+            self._levels(data.get("a") or ()),
+            data.get("E", 0),
+            data.get("U", 0),
+            data.get("u", 0),
+        )
+
+    @staticmethod
+    def _levels(raw: Sequence[Sequence[str]]) -> List[Tuple[float, float]]:
+        return [(float(price), float(qty)) for price, qty in raw]
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, List, Protocol, Sequence, Tuple
+
+from sortedcontainers import SortedDict
+
+from triarb.marketdata.decoder import BookUpdate
+from triarb.marketdata.orderbook import OrderBookStore
+
+log = logging.getLogger(__name__)
+
+MAX_BUFFERED_UPDATES = 2_000
+
+
+@dataclass
+class DepthSnapshot:
+    last_update_id: int
+    bids: List[Tuple[float, float]]
+    asks: List[Tuple[float, float]]
+
+
+class SnapshotThrottled(Exception):
+    """The exchange rate-limited a snapshot request (HTTP 429, or 418 once banned)."""
+
+    def __init__(self, status: int, retry_after: float):
+        super().__init__(f"HTTP {status}, retry after {retry_after:g}s")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class SnapshotSource(Protocol):
+    async def fetch(self, symbol: str, limit: int) -> DepthSnapshot: ...
+
+
+class BinanceRestSnapshotSource:
+    """Fetches ``/api/v3/depth`` snapshots over a shared keep-alive HTTP client."""
+
+    def __init__(self, base_url: str = "https://api.binance.com", timeout: float = 5.0):
+        import httpx
+
+        self._client = httpx.AsyncClient(base_url=base_url, timeout=timeout)
+
+    async def fetch(self, symbol: str, limit: int) -> DepthSnapshot:
+        response = await self._client.get(
+            "/api/v3/depth", params={"symbol": symbol.replace("/", "").upper(), "limit": limit}
+        )
+        if response.status_code in (418, 429):
+            raise SnapshotThrottled(response.status_code, float(response.headers.get("Retry-After", 1)))
+        response.raise_for_status()
+        payload = response.json()
+        return DepthSnapshot(
+            last_update_id=int(payload["lastUpdateId"]),
+            bids=[(float(p), float(q)) for p, q in payload["bids"]],
+            asks=[(float(p), float(q)) for p, q in payload["asks"]],
+        )
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class LocalOrderBook:
+    """Full-depth book in sorted maps: O(log n) per level update, O(k) top-k reads."""
+
+    __slots__ = ("bids", "asks")
+
+    def __init__(self):
+        self.bids: SortedDict = SortedDict()  # keyed by -price so iteration is best-first
+        self.asks: SortedDict = SortedDict()
+
+    def reset(self, bids: Sequence[Tuple[float, float]], asks: Sequence[Tuple[float, float]]) -> None:
+        self.bids = SortedDict({-price: qty for price, qty in bids if qty})
+        self.asks = SortedDict({price: qty for price, qty in asks if qty})
+
+    def apply(self, bids: Sequence[Tuple[float, float]], asks: Sequence[Tuple[float, float]]) -> None:
+        book = self.bids
+        for price, qty in bids:
+            if qty:
+                book[-price] = qty
+            else:
+                book.pop(-price, None)
+        book = self.asks
+        for price, qty in asks:
+            if qty:
+                book[price] = qty
+            else:
+                book.pop(price, None)
+
+    def top(self, levels: int) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        bids = [(-price, qty) for price, qty in islice(self.bids.items(), levels)]
+        asks = list(islice(self.asks.items(), levels))
+        return bids, asks
+
+
+@dataclass
+class _SymbolState:
+    book: LocalOrderBook = field(default_factory=LocalOrderBook)
+    last_update_id: int = 0
+    synced: bool = False
+    buffer: List[BookUpdate] = field(default_factory=list)
+
+
+class DiffDepthManager:
+    """Maintains local books from a diff-depth stream and publishes top levels to the store.
+
+    Follows the exchange procedure: buffer diffs, load a snapshot, drop diffs already covered
+    by it, then require each diff's first update id to continue the previous final id.
+    Any gap marks the symbol unsynced and triggers a fresh snapshot. At most
+    ``max_concurrent_snapshots`` requests are in flight, so a reconnect that unsyncs every
+    symbol does not burst the REST weight limit, and a ``Retry-After`` from the exchange
+    pauses every pending fetch, not just the one that was throttled.
+    """
+
+    def __init__(
+        self,
+        store: OrderBookStore,
+        source: SnapshotSource,
+        top_levels: int,
+        snapshot_limit: int = 1000,
+        max_concurrent_snapshots: int = 2,
+    ):
+        self.store = store
+        self.source = source
+        self.top_levels = min(top_levels, store.depth)
+        self.snapshot_limit = snapshot_limit
+        self.resyncs = 0
+        self.throttled = 0
+        self._fetch_slots = asyncio.Semaphore(max_concurrent_snapshots)
+        self._resume_at = 0.0
+        self._states: Dict[str, _SymbolState] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def on_update(self, update: BookUpdate) -> None:
+        state = self._states.get(update.symbol)
+        if state is None:
+            state = self._states[update.symbol] = _SymbolState()
+        if not state.synced:
+            if len(state.buffer) < MAX_BUFFERED_UPDATES:
+                state.buffer.append(update)
+            self._schedule_resync(update.symbol)
+            return
+        if update.final_update_id <= state.last_update_id:
+            return
+        if update.first_update_id != state.last_update_id + 1:
+            log.warning(
+                "depth.gap",
+                extra={"symbol": update.symbol, "expected": state.last_update_id + 1, "got": update.first_update_id},
+            )
+            state.synced = False
+            state.buffer = [update]
+            self._schedule_resync(update.symbol)
+            return
+        state.book.apply(update.bids, update.asks)
+        state.last_update_id = update.final_update_id
+        self._publish(update.symbol, state)
+
+    def reset(self) -> None:
+        """Drop all local state, e.g. after the stream reconnects and diffs may be missing."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._states.clear()
+
+    def is_synced(self, symbol: str) -> bool:
+        state = self._states.get(symbol)
+        return bool(state and state.synced)
+
+    def _schedule_resync(self, symbol: str) -> None:
+        task = self._tasks.get(symbol)
+        if task is None or task.done():
+            self._tasks[symbol] = asyncio.create_task(self._resync(symbol))
+
+    async def _resync(self, symbol: str) -> None:
+        backoff = 0.5
+        self.resyncs += 1
+        while True:
+            try:
+                snapshot = await self._fetch(symbol)
+            except SnapshotThrottled as exc:
+                self.throttled += 1
+                self._resume_at = max(self._resume_at, time.monotonic() + exc.retry_after)
+                log.warning("depth.snapshot_throttled", extra={"symbol": symbol, "error": str(exc)})
+                continue
+            except Exception as exc:  # noqa: BLE001
+                log.warning("depth.snapshot_failed", extra={"symbol": symbol, "error": str(exc)})
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 10)
+                continue
+            if self._load(symbol, snapshot):
+                return
+            # Buffered diffs start after the snapshot: it is too old, fetch another.
+            await asyncio.sleep(backoff)
+
+    async def _fetch(self, symbol: str) -> DepthSnapshot:
+        async with self._fetch_slots:
+            while (delay := self._resume_at - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            return await self.source.fetch(symbol, self.snapshot_limit)
+
+    def _load(self, symbol: str, snapshot: DepthSnapshot) -> bool:
+        state = self._states.setdefault(symbol, _SymbolState())
+        pending = [u for u in state.buffer if u.final_update_id > snapshot.last_update_id]
+        if pending and pending[0].first_update_id > snapshot.last_update_id + 1:
+            state.buffer = pending
+            return False
+
+        state.book.reset(snapshot.bids, snapshot.asks)
+        state.last_update_id = snapshot.last_update_id
+        state.buffer = []
+        for update in pending:
+            if update.first_update_id > state.last_update_id + 1:
+                state.buffer = [u for u in pending if u.final_update_id > state.last_update_id]
+                return False
+            state.book.apply(update.bids, update.asks)
+            state.last_update_id = update.final_update_id
+        state.synced = True
+        self._publish(symbol, state)
+        log.info("depth.synced", extra={"symbol": symbol, "last_update_id": state.last_update_id})
+        return True
+
+    def _publish(self, symbol: str, state: _SymbolState) -> None:
+        bids, asks = state.book.top(self.top_levels)
+        self.store.upsert(symbol, bids, asks)
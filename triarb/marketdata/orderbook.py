@@ -1,7 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from triarb.metrics import METRICS, Tick
+
+BookListener = Callable[[str], None]
+
+DEFAULT_DEPTH = 20
+NAN = float("nan")
 
 
 @dataclass
@@ -10,39 +19,150 @@ class Level:
     qty: float
 
 
-@dataclass
+def _write_side(
+    levels: Sequence[Tuple[float, float]],
+    prices: array,
+    qtys: array,
+    descending: bool,
+) -> int:
+    """Copy ``levels`` into the preallocated arrays in place and return the level count.
+
+    Exchange payloads are already ordered best-first, so the common case is a single pass
+    with no allocations; out-of-order input falls back to sorting.
+    """
+    depth = len(prices)
+    count = 0
+    last = None
+    for price, qty in levels:
+        if last is not None and (price > last if descending else price < last):
+            ordered = sorted(levels, key=lambda x: -x[0] if descending else x[0])
+            return _write_side(ordered, prices, qtys, descending)
+        last = price
+        if count < depth:
+            prices[count] = price
+            qtys[count] = qty
+            count += 1
+    return count
+
+
 class OrderBook:
-    symbol: str
-    bids: List[Level] = field(default_factory=list)
-    asks: List[Level] = field(default_factory=list)
+    """Fixed-depth book stored in preallocated ``array('d')`` buffers updated in place."""
+
+    __slots__ = ("symbol", "bid_px", "bid_qty", "ask_px", "ask_qty", "n_bids", "n_asks")
+
+    def __init__(self, symbol: str, depth: int = DEFAULT_DEPTH):
+        self.symbol = symbol
+        zeros = [0.0] * depth
+        self.bid_px = array("d", zeros)
+        self.bid_qty = array("d", zeros)
+        self.ask_px = array("d", zeros)
+        self.ask_qty = array("d", zeros)
+        self.n_bids = 0
+        self.n_asks = 0
 
-    def update(self, bids: List[Tuple[float, float]], asks: List[Tuple[float, float]]) -> None:
-        self.bids = [Level(price, qty) for price, qty in sorted(bids, key=lambda x: -x[0])]
-        self.asks = [Level(price, qty) for price, qty in sorted(asks, key=lambda x: x[0])]
+    @property
+    def bids(self) -> List[Level]:
+        return [Level(self.bid_px[i], self.bid_qty[i]) for i in range(self.n_bids)]
+
+    @property
+    def asks(self) -> List[Level]:
+        return [Level(self.ask_px[i], self.ask_qty[i]) for i in range(self.n_asks)]
+
+    def update(self, bids: Sequence[Tuple[float, float]], asks: Sequence[Tuple[float, float]]) -> None:
+        self.n_bids = _write_side(bids, self.bid_px, self.bid_qty, descending=True)
+        self.n_asks = _write_side(asks, self.ask_px, self.ask_qty, descending=False)
 
     def best_bid_ask(self) -> Tuple[Level | None, Level | None]:
-        bid = self.bids[0] if self.bids else None
-        ask = self.asks[0] if self.asks else None
+        bid = Level(self.bid_px[0], self.bid_qty[0]) if self.n_bids else None
+        ask = Level(self.ask_px[0], self.ask_qty[0]) if self.n_asks else None
         return bid, ask
 
     def cumulative_depth(self, side: str, levels: int) -> float:
-        book = self.bids if side == "bid" else self.asks
+        if side == "bid":
+            qtys, count = self.bid_qty, self.n_bids
+        else:
+            qtys, count = self.ask_qty, self.n_asks
         qty = 0.0
-        for level in book[:levels]:
-            qty += level.qty
+        for idx in range(min(levels, count)):
+            qty += qtys[idx]
         return qty
 
 
 class OrderBookStore:
-    def __init__(self):
+    """Symbol-keyed books plus store-wide best bid/ask arrays indexed by symbol id.
+
+    ``best_bid``/``best_ask`` hold NaN until both sides of a book are populated, which lets
+    vectorised consumers wrap them with ``numpy.frombuffer`` instead of copying.
+    """
+
+    def __init__(self, depth: int = DEFAULT_DEPTH):
+        self.depth = depth
         self.books: Dict[str, OrderBook] = {}
+        self.symbol_ids: Dict[str, int] = {}
+        self.best_bid = array("d")
+        self.best_ask = array("d")
+        self._listeners: List[BookListener] = []
+        self._empty = OrderBook("", depth=1)
+        # Latency stamps of the update being applied; set by the feed, consumed by listeners.
+        self.tick: Tick | None = None
+        # Book updates applied so far, whichever path applied them.
+        self.updates = 0
 
-    def upsert(self, symbol: str, bids: List[Tuple[float, float]], asks: List[Tuple[float, float]]) -> None:
-        book = self.books.setdefault(symbol, OrderBook(symbol))
+    def subscribe(self, listener: BookListener) -> None:
+        """Call ``listener(symbol)`` synchronously after every book update."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: BookListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def symbol_id(self, symbol: str) -> int:
+        """Return the stable integer id of ``symbol``, registering an empty book if needed."""
+        idx = self.symbol_ids.get(symbol)
+        if idx is None:
+            idx = len(self.symbol_ids)
+            self.symbol_ids[symbol] = idx
+            self.books[symbol] = OrderBook(symbol, self.depth)
+            self.best_bid.append(NAN)
+            self.best_ask.append(NAN)
+        return idx
+
+    def upsert(
+        self,
+        symbol: str,
+        bids: Sequence[Tuple[float, float]],
+        asks: Sequence[Tuple[float, float]],
+    ) -> None:
+        book = self.books.get(symbol)
+        if book is None:
+            self.symbol_id(symbol)
+            book = self.books[symbol]
         book.update(bids, asks)
+        idx = self.symbol_ids[symbol]
+        if book.n_bids and book.n_asks:
+            self.best_bid[idx] = book.bid_px[0]
+            self.best_ask[idx] = book.ask_px[0]
+        else:
+            self.best_bid[idx] = NAN
+            self.best_ask[idx] = NAN
+        self.updates += 1
+        tick = self.tick
+        if tick is not None:
+            tick.store_ns = time.time_ns()
+            METRICS.observe("parse_to_store", tick.parse_ns, tick.store_ns)
+        for listener in self._listeners:
+            listener(symbol)
+        self.tick = None
 
     def best_bid_ask(self, symbol: str) -> Tuple[Level | None, Level | None]:
-        return self.books.get(symbol, OrderBook(symbol)).best_bid_ask()
+        return self.books.get(symbol, self._empty).best_bid_ask()
+
+    def top_of_book(self, symbol: str) -> Tuple[float, float] | None:
+        """Best bid/ask prices without allocating ``Level`` objects; None if a side is empty."""
+        book = self.books.get(symbol)
+        if book is None or not (book.n_bids and book.n_asks):
+            return None
+        return book.bid_px[0], book.ask_px[0]
 
     def cumulative_depth(self, symbol: str, side: str, levels: int) -> float:
-        return self.books.get(symbol, OrderBook(symbol)).cumulative_depth(side, levels)
+        return self.books.get(symbol, self._empty).cumulative_depth(side, levels)
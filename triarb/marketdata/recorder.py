@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import gzip
+import heapq
+import logging
+import queue
+import struct
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Tuple
+
+log = logging.getLogger(__name__)
+
+RECORD_HEADER = struct.Struct("<QI")  # receive time (ns since epoch), payload length
+SEGMENT_SUFFIX = ".frames.gz"
+
+Frame = Tuple[int, bytes]
+
+
+class FrameRecorder:
+    """Appends raw WebSocket frames with receive timestamps to gzip-compressed segments.
+
+    ``append`` only enqueues; compression and file I/O run on a writer thread so the
+    receive loop is not slowed down. Segments rotate by uncompressed size or age.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        prefix: str = "ws",
+        segment_bytes: int = 256 * 1024 * 1024,
+        segment_seconds: float = 3600.0,
+        compresslevel: int = 1,
+    ):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.compresslevel = compresslevel
+        self.frames = 0
+        self._queue: "queue.SimpleQueue[Frame | None]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name=f"recorder-{prefix}", daemon=True)
+        self._thread.start()
+
+    def append(self, frame: str | bytes, recv_ns: int | None = None) -> None:
+        self._queue.put((recv_ns if recv_ns is not None else time.time_ns(), frame))  # type: ignore[arg-type]
+        self.frames += 1
+
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
+    def close(self, timeout: float = 10.0) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _open(self, recv_ns: int) -> IO[bytes]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{self.prefix}-{recv_ns:019d}{SEGMENT_SUFFIX}"
+        log.info("recorder.segment", extra={"path": str(path)})
+        return gzip.open(path, "wb", compresslevel=self.compresslevel)
+
+    def _run(self) -> None:
+        out: IO[bytes] | None = None
+        written = 0
+        opened_at = 0.0
+        pack = RECORD_HEADER.pack
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            recv_ns, frame = item
+            payload = frame.encode() if isinstance(frame, str) else frame
+            now = time.monotonic()
+            if out is None or written >= self.segment_bytes or now - opened_at >= self.segment_seconds:
+                if out is not None:
+                    out.close()
+                out = self._open(recv_ns)
+                written = 0
+                opened_at = now
+            out.write(pack(recv_ns, len(payload)))
+            out.write(payload)
+            written += RECORD_HEADER.size + len(payload)
+        if out is not None:
+            out.close()
+
+
+def read_segment(path: str | Path) -> Iterator[Frame]:
+    size = RECORD_HEADER.size
+    with gzip.open(path, "rb") as fh:
+        while True:
+            header = fh.read(size)
+            if len(header) < size:
+                return
+            recv_ns, length = RECORD_HEADER.unpack(header)
+            yield recv_ns, fh.read(length)
+
+
+def segment_paths(source: str | Path | Iterable[str | Path]) -> List[Path]:
+    if isinstance(source, (str, Path)):
+        source = Path(source)
+        if source.is_dir():
+            return sorted(source.glob(f"*{SEGMENT_SUFFIX}"))
+        return [source]
+    return sorted(Path(path) for path in source)
+
+
+def iter_frames(source: str | Path | Iterable[str | Path]) -> Iterator[Frame]:
+    """Yield recorded frames in receive-time order, merging segments of different recorders."""
+    streams: Dict[str, List[Path]] = defaultdict(list)
+    for path in segment_paths(source):
+        streams[path.name.rsplit("-", 1)[0]].append(path)
+
+    def chain(paths: List[Path]) -> Iterator[Frame]:
+        for path in paths:
+            yield from read_segment(path)
+
+    return heapq.merge(*(chain(paths) for paths in streams.values()), key=lambda frame: frame[0])
@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing as mp
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from triarb.marketdata.orderbook import DEFAULT_DEPTH, NAN, OrderBookStore, _write_side
+from triarb.metrics import METRICS, Tick
+
+# Region layout (native byte order, every section 8-byte aligned):
+#   header   magic u64, symbol count u32, depth u32, reader-waiting flag u64
+#   seq      u64 per symbol; odd while the slot is being written (seqlock)
+#   stamps   4 x i64 per symbol: exchange ms, receive ns, parse ns, store ns
+#   levels   f64 per symbol: n_bids, n_asks, bid_px[depth], bid_qty[depth], ask_px[depth], ask_qty[depth]
+HEADER = struct.Struct("=QIIQ")
+WAITING_OFFSET = 16
+MAGIC = 0x7472696172623032  # "triarb02"
+STAMPS = 4
+READ_RETRIES = 8
+# Consecutive ``sleep(0)`` turns a reader without a doorbell takes before a real sleep.
+MAX_YIELD_TURNS = 64
+
+
+def region_size(symbols: int, depth: int) -> int:
+    return HEADER.size + symbols * 8 + symbols * STAMPS * 8 + symbols * (2 + 4 * depth) * 8
+
+
+class _Region:
+    """Typed memoryviews over a shared memory block; shared by the writer and the reader."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, symbols: Sequence[str], depth: int):
+        self.shm = shm
+        self.symbols = list(symbols)
+        self.depth = depth
+        self.slots = {symbol: idx for idx, symbol in enumerate(self.symbols)}
+        count = len(self.symbols)
+        buf = shm.buf
+        self.waiting = buf[WAITING_OFFSET : WAITING_OFFSET + 8].cast("Q")
+        offset = HEADER.size
+        self.seq = buf[offset : offset + count * 8].cast("Q")
+        offset += count * 8
+        self.stamps = buf[offset : offset + count * STAMPS * 8].cast("q")
+        offset += count * STAMPS * 8
+        self.stride = 2 + 4 * depth
+        self.levels = buf[offset : offset + count * self.stride * 8].cast("d")
+        self.sides: List[Tuple[memoryview, ...]] = []
+        for idx in range(count):
+            base = idx * self.stride + 2
+            self.sides.append(
+                tuple(self.levels[base + part * depth : base + (part + 1) * depth] for part in range(4))
+            )
+
+    def release(self) -> None:
+        for views in self.sides:
+            for view in views:
+                view.release()
+        self.sides = []
+        for view in (self.waiting, self.seq, self.stamps, self.levels):
+            view.release()
+        self.shm.close()
+
+
+class SharedBookWriter:
+    """``OrderBookStore`` stand-in for ingestion processes that writes books into shared memory.
+
+    Each ``upsert`` bumps the slot's sequence to odd, writes the levels and latency stamps in
+    place, then bumps it back to even; readers retry when they see an odd or changed value.
+    With a ``doorbell`` (the write end of the reader's pipe) a write also wakes a reader that
+    flagged itself as waiting; writes while the reader is busy cost no system call.
+    """
+
+    def __init__(
+        self, name: str, symbols: Sequence[str], depth: int = DEFAULT_DEPTH, doorbell: Connection | None = None
+    ):
+        shm = shared_memory.SharedMemory(name=name)
+        magic, count, region_depth, _ = HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC or count != len(symbols) or region_depth != depth:
+            shm.close()
+            raise ValueError(f"Shared book region {name!r} does not match {len(symbols)} symbols x {depth}")
+        self.region = _Region(shm, symbols, depth)
+        self.depth = depth
+        self.dropped = 0
+        self.tick: Tick | None = None
+        self.doorbell = doorbell
+        self._bell_fd = -1
+        if doorbell is not None:
+            self._bell_fd = doorbell.fileno()
+            os.set_blocking(self._bell_fd, False)
+
+    def upsert(self, symbol: str, bids: Sequence[Tuple[float, float]], asks: Sequence[Tuple[float, float]]) -> None:
+        region = self.region
+        idx = region.slots.get(symbol)
+        if idx is None:
+            self.dropped += 1
+            return
+        seq = region.seq
+        start = seq[idx]
+        seq[idx] = start + 1
+        bid_px, bid_qty, ask_px, ask_qty = region.sides[idx]
+        base = idx * region.stride
+        levels = region.levels
+        levels[base] = _write_side(bids, bid_px, bid_qty, descending=True)
+        levels[base + 1] = _write_side(asks, ask_px, ask_qty, descending=False)
+        stamps = region.stamps
+        offset = idx * STAMPS
+        tick = self.tick
+        if tick is not None:
+            stamps[offset] = tick.exchange_ms
+            stamps[offset + 1] = tick.recv_ns
+            stamps[offset + 2] = tick.parse_ns
+        else:
+            stamps[offset] = stamps[offset + 1] = stamps[offset + 2] = 0
+        stamps[offset + 3] = time.time_ns()
+        seq[idx] = start + 2
+        self.tick = None
+        if self._bell_fd >= 0 and region.waiting[0]:
+            region.waiting[0] = 0
+            try:
+                os.write(self._bell_fd, b"\0")
+            except BlockingIOError:
+                pass  # the pipe is full of unread rings: the reader is waking anyway
+
+    def close(self) -> None:
+        self.region.release()
+
+
+class SharedOrderBookStore(OrderBookStore):
+    """Strategy-side ``OrderBookStore`` fed from a shared memory region instead of ``upsert``.
+
+    ``poll`` compares every slot's sequence with the last one seen, copies changed books into
+    the local ``OrderBook`` arrays under the seqlock and then notifies listeners exactly as
+    ``upsert`` would, so signal engines, sizing and the executor work unchanged. The
+    creating side also owns a doorbell pipe whose write end ``doorbell`` is handed to the
+    writers, so ``run`` sleeps until a write instead of polling an idle region.
+    """
+
+    def __init__(self, region: _Region, owner: bool = False):
+        super().__init__(region.depth)
+        self.region = region
+        self.owner = owner
+        self.doorbell: Connection | None = None
+        self._bell: Connection | None = None
+        if owner:
+            self._bell, self.doorbell = mp.Pipe(duplex=False)
+            os.set_blocking(self._bell.fileno(), False)
+        self.name = region.shm.name
+        self.symbols = region.symbols
+        for symbol in region.symbols:
+            self.symbol_id(symbol)
+        self._seq = np.frombuffer(region.seq, dtype=np.uint64)
+        self._seen = np.zeros(len(region.symbols), dtype=np.uint64)
+        self._local = [
+            tuple(memoryview(arr) for arr in (book.bid_px, book.bid_qty, book.ask_px, book.ask_qty))
+            for book in (self.books[symbol] for symbol in region.symbols)
+        ]
+        self.torn_reads = 0
+
+    @classmethod
+    def create(cls, symbols: Sequence[str], depth: int = DEFAULT_DEPTH) -> "SharedOrderBookStore":
+        shm = shared_memory.SharedMemory(create=True, size=region_size(len(symbols), depth))
+        HEADER.pack_into(shm.buf, 0, MAGIC, len(symbols), depth, 0)
+        return cls(_Region(shm, symbols, depth), owner=True)
+
+    @classmethod
+    def attach(cls, name: str, symbols: Sequence[str], depth: int = DEFAULT_DEPTH) -> "SharedOrderBookStore":
+        return cls(_Region(shared_memory.SharedMemory(name=name), symbols, depth))
+
+    def poll(self) -> int:
+        """Apply every slot updated since the last call; returns the number of books applied."""
+        changed = np.flatnonzero(self._seq != self._seen)
+        applied = 0
+        for idx in changed.tolist():
+            if self._read_slot(idx):
+                applied += 1
+        return applied
+
+    async def run(self, interval_ms: float) -> None:
+        """Keep applying writes until cancelled.
+
+        While books keep changing the loop polls on every turn. Once a poll finds nothing it
+        sets the region's waiting flag, polls once more (a write may have landed before the
+        flag was visible) and sleeps until a writer rings the doorbell; ``interval_ms`` only
+        bounds that sleep in case a ring is missed (the flag stays set, so the next write
+        rings again). Without a doorbell (an attached store)
+        it polls every ``interval_ms``, yielding at most ``MAX_YIELD_TURNS`` turns in a row.
+        """
+        interval = interval_ms / 1000
+        poll = self.poll
+        if self._bell is None:
+            turns = 0
+            while True:
+                if poll() and turns < MAX_YIELD_TURNS:
+                    turns += 1
+                    await asyncio.sleep(0)
+                else:
+                    turns = 0
+                    await asyncio.sleep(interval)
+
+        loop = asyncio.get_running_loop()
+        bell = self._bell.fileno()
+        rung = asyncio.Event()
+        loop.add_reader(bell, self._drain_bell, rung)
+        waiting = self.region.waiting
+        try:
+            while True:
+                if poll():
+                    await asyncio.sleep(0)
+                    continue
+                waiting[0] = 1
+                if poll():
+                    waiting[0] = 0
+                    await asyncio.sleep(0)
+                    continue
+                try:
+                    await asyncio.wait_for(rung.wait(), interval)
+                except asyncio.TimeoutError:
+                    pass
+                rung.clear()
+        finally:
+            waiting[0] = 0
+            loop.remove_reader(bell)
+
+    def _drain_bell(self, rung: asyncio.Event) -> None:
+        assert self._bell is not None
+        try:
+            while os.read(self._bell.fileno(), 4096):
+                pass
+        except BlockingIOError:
+            pass
+        rung.set()
+
+    def clear_slots(self, symbols: Sequence[str]) -> None:
+        """Empty the books of ``symbols`` after their writer died; the next ``poll`` applies it.
+
+        Only safe while no live writer owns the slots. A writer killed mid-``upsert`` leaves its
+        sequence odd, so the slot is closed out from there.
+        """
+        region = self.region
+        seq = region.seq
+        for symbol in symbols:
+            idx = region.slots.get(symbol)
+            if idx is None:
+                continue
+            start = seq[idx] + (seq[idx] & 1)
+            seq[idx] = start + 1
+            base = idx * region.stride
+            region.levels[base] = region.levels[base + 1] = 0.0
+            offset = idx * STAMPS
+            for part in range(STAMPS):
+                region.stamps[offset + part] = 0
+            seq[idx] = start + 2
+
+    def _read_slot(self, idx: int) -> bool:
+        region = self.region
+        seq = region.seq
+        base = idx * region.stride
+        offset = idx * STAMPS
+        for _ in range(READ_RETRIES):
+            start = seq[idx]
+            if start & 1:
+                continue
+            n_bids = int(region.levels[base])
+            n_asks = int(region.levels[base + 1])
+            for local, shared in zip(self._local[idx], region.sides[idx]):
+                local[:] = shared
+            exchange_ms, recv_ns, parse_ns, store_ns = region.stamps[offset : offset + STAMPS]
+            if seq[idx] == start:
+                break
+            self.torn_reads += 1
+        else:
+            return False  # writer is busy; picked up on the next poll
+
+        self._seen[idx] = start
+        symbol = region.symbols[idx]
+        book = self.books[symbol]
+        book.n_bids = n_bids
+        book.n_asks = n_asks
+        if n_bids and n_asks:
+            self.best_bid[idx] = book.bid_px[0]
+            self.best_ask[idx] = book.ask_px[0]
+        else:
+            self.best_bid[idx] = NAN
+            self.best_ask[idx] = NAN
+        self.updates += 1
+        if recv_ns:
+            tick = Tick(exchange_ms, recv_ns, parse_ns)
+            tick.store_ns = store_ns
+            METRICS.on_parsed(tick)
+            METRICS.observe("parse_to_store", parse_ns, store_ns)
+            self.tick = tick
+        for listener in self._listeners:
+            listener(symbol)
+        self.tick = None
+        return True
+
+    def close(self) -> None:
+        del self._seq
+        for views in self._local:
+            for view in views:
+                view.release()
+        self._local = []
+        shm = self.region.shm
+        self.region.release()
+        for conn in (self._bell, self.doorbell):
+            if conn is not None:
+                conn.close()
+        if self.owner:
+            shm.unlink()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import random
+from typing import Dict, Iterator, List, Tuple
+
+from triarb.engine.triangle import Triangle, build_triangles
+from triarb.marketdata.decoder import DEPTH_CHANNEL, stream_name
+from triarb.marketdata.orderbook import OrderBookStore
+
+Levels = List[Tuple[float, float]]
+
+
+class SyntheticMarket:
+    """Deterministic universe of ``bases`` assets against ``quote`` for benchmarks and load tests.
+
+    Triangles come from ``build_triangles`` so the symbol set matches what the engine would
+    subscribe to. Cross rates are consistent with per-asset USD prices up to ``noise``, which
+    leaves a few triangles with a positive edge.
+    """
+
+    def __init__(self, bases: int, quote: str = "USDT", levels: int = 5, seed: int = 0, noise: float = 0.003):
+        self.rng = random.Random(seed)
+        self.quote = quote
+        self.levels = levels
+        self.noise = noise
+        self.bases = [f"A{idx:03d}" for idx in range(bases)]
+        self.triangles: List[Triangle] = build_triangles(quote, self.bases)
+        self.symbols: List[str] = sorted({symbol for triangle in self.triangles for symbol in triangle.symbols})
+        self.usd = {base: 10 ** self.rng.uniform(-1, 4) for base in self.bases}
+        self.mids: Dict[str, float] = {symbol: self._fair(symbol) for symbol in self.symbols}
+        self._sequence: Dict[str, int] = {}
+
+    def _fair(self, symbol: str) -> float:
+        base, quote = symbol.split("/")
+        quote_usd = 1.0 if quote == self.quote else self.usd[quote]
+        return self.usd[base] / quote_usd * (1 + self.rng.uniform(-self.noise, self.noise))
+
+    def book(self, symbol: str) -> Tuple[Levels, Levels]:
+        """Return best-first bid/ask ladders around the symbol's current mid."""
+        mid = self.mids[symbol]
+        tick = mid * 0.0001
+        rng = self.rng
+        bids = [(mid - tick * (idx + 1), rng.uniform(0.1, 10)) for idx in range(self.levels)]
+        asks = [(mid + tick * (idx + 1), rng.uniform(0.1, 10)) for idx in range(self.levels)]
+        return bids, asks
+
+    def step(self, symbol: str) -> Tuple[Levels, Levels]:
+        """Random-walk the mid of ``symbol`` by a few basis points and return its new book."""
+        self.mids[symbol] *= 1 + self.rng.gauss(0, 0.0005)
+        return self.book(symbol)
+
+    def populate(self, store: OrderBookStore) -> OrderBookStore:
+        for symbol in self.symbols:
+            bids, asks = self.book(symbol)
+            store.upsert(symbol, bids, asks)
+        return store
+
+    def updates(self, count: int) -> Iterator[Tuple[str, Levels, Levels]]:
+        symbols = self.symbols
+        for _ in range(count):
+            symbol = symbols[self.rng.randrange(len(symbols))]
+            bids, asks = self.step(symbol)
+            yield symbol, bids, asks
+
+    def frames(self, count: int, channel: str = DEPTH_CHANNEL) -> Iterator[str]:
+        """Combined-stream frames in the exchange wire format (strings, as received)."""
+        diff = channel.startswith("depth@")
+        for symbol, bids, asks in self.updates(count):
+            yield json.dumps(self.frame_payload(symbol, bids, asks, channel, diff))
+
+    def frame_payload(
+        self, symbol: str, bids: Levels, asks: Levels, channel: str, diff: bool, sequence: int | None = None
+    ) -> Dict:
+        """One combined-stream message; ``sequence`` defaults to the next per-symbol update id."""
+        raw_bids = [[f"{price:.8f}", f"{qty:.8f}"] for price, qty in bids]
+        raw_asks = [[f"{price:.8f}", f"{qty:.8f}"] for price, qty in asks]
+        if sequence is None:
+            sequence = self._sequence[symbol] = self._sequence.get(symbol, 0) + 1
+        if diff:
+            data = {
+                "e": "depthUpdate",
+                "E": 1_700_000_000_000 + sequence,
+                "s": symbol.replace("/", ""),
+                "U": sequence,
+                "u": sequence,
+                "b": raw_bids,
+                "a": raw_asks,
+            }
+        else:
+            data = {"lastUpdateId": sequence, "bids": raw_bids, "asks": raw_asks}
+        return {"stream": stream_name(symbol, channel), "data": data}
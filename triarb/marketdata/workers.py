@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing as mp
+import queue
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+from triarb.marketdata.orderbook import DEFAULT_DEPTH, OrderBookStore
+from triarb.marketdata.shm import SharedBookWriter, SharedOrderBookStore
+
+log = logging.getLogger(__name__)
+
+Shard = Tuple[int, List[str]]
+# Shared memory block name and the symbol order of its slots.
+SharedRegion = Tuple[str, List[str], Any]  # name, symbols, doorbell connection
+
+STATS_INTERVAL_SECONDS = 5.0
+WATCH_INTERVAL_SECONDS = 1.0
+DRAIN_BATCH = 512
+
+
+class QueueStore:
+    """Stand-in for ``OrderBookStore`` inside a worker: forwards decoded books to the parent."""
+
+    def __init__(self, out: Any, depth: int = DEFAULT_DEPTH):
+        self.out = out
+        self.depth = depth
+        self.dropped = 0
+
+    def upsert(self, symbol: str, bids: Sequence[Tuple[float, float]], asks: Sequence[Tuple[float, float]]) -> None:
+        try:
+            self.out.put_nowait(("book", symbol, bids, asks))
+        except queue.Full:
+            self.dropped += 1
+
+
+async def _run_shards(shards: Sequence[Shard], out: Any, depth: int, region: SharedRegion | None = None) -> None:
+    from triarb.config import get_settings
+    from triarb.marketdata.recorder import FrameRecorder
+    from triarb.marketdata.ws_client import BinanceWsClient
+
+    settings = get_settings()
+    recorder = None
+    if settings.record_dir:
+        recorder = FrameRecorder(settings.record_dir, prefix=f"ws{shards[0][0]:03d}")
+    store: QueueStore | SharedBookWriter
+    if region is not None:
+        store = SharedBookWriter(region[0], region[1], depth, doorbell=region[2])
+    else:
+        store = QueueStore(out, depth)
+    clients = [
+        BinanceWsClient(symbols, store, shard=shard, recorder=recorder)  # type: ignore[arg-type]
+        for shard, symbols in shards
+    ]
+    tasks = [asyncio.create_task(client.start()) for client in clients]
+    try:
+        while True:
+            await asyncio.sleep(STATS_INTERVAL_SECONDS)
+            for client in clients:
+                client.stats.sample_rate()
+                snapshot = client.stats.snapshot()
+                snapshot["dropped"] = store.dropped
+                try:
+                    out.put_nowait(("stats", client.stats.shard, snapshot))
+                except queue.Full:
+                    store.dropped += 1
+    finally:
+        for task in tasks:
+            task.cancel()
+        for client in clients:
+            await client.close()
+        if recorder is not None:
+            recorder.close()
+        if isinstance(store, SharedBookWriter):
+            store.close()
+
+
+def _worker_main(shards: Sequence[Shard], out: Any, depth: int, region: SharedRegion | None = None) -> None:
+    try:
+        asyncio.run(_run_shards(shards, out, depth, region))
+    except KeyboardInterrupt:
+        pass
+
+
+class ShardWorkerPool:
+    """Runs WebSocket shards in worker processes and applies their updates to one store.
+
+    Workers decode frames off the main interpreter's GIL. With a plain store, a reader
+    thread in the parent drains the shared queue in batches and hands them to the event
+    loop; with a ``SharedOrderBookStore`` workers write books straight into its shared memory
+    region and the parent polls it, leaving the queue for shard stats only. A worker that
+    exits is logged, its symbols' books are emptied so nothing trades on them, and it is
+    started again.
+    """
+
+    def __init__(
+        self,
+        shards: Sequence[List[str]],
+        store: OrderBookStore,
+        processes: int,
+        queue_size: int = 100_000,
+        poll_interval_ms: float = 5.0,
+    ):
+        self.store = store
+        self.poll_interval_ms = poll_interval_ms
+        self._poller: asyncio.Task | None = None
+        self._watcher: asyncio.Task | None = None
+        self._region: SharedRegion | None = None
+        self.restarts = 0
+        self.processes = max(1, min(processes, len(shards)))
+        self._ctx = mp.get_context("spawn")
+        self._queue = self._ctx.Queue(maxsize=queue_size)
+        numbered: List[Shard] = list(enumerate(shards))
+        self._assignments = [numbered[idx :: self.processes] for idx in range(self.processes)]
+        self._workers: List[Any] = []
+        self._reader: threading.Thread | None = None
+        self._stats: Dict[int, Dict[str, Any]] = {
+            shard: {"shard": shard, "streams": len(symbols), "connected": False} for shard, symbols in numbered
+        }
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if isinstance(self.store, SharedOrderBookStore):
+            self._region = (self.store.name, self.store.symbols, self.store.doorbell)
+            self._poller = asyncio.create_task(self.store.run(self.poll_interval_ms))
+        self._workers = [self._spawn(assignment) for assignment in self._assignments]
+        self._reader = threading.Thread(target=self._drain, args=(loop,), name="shard-reader", daemon=True)
+        self._reader.start()
+        self._watcher = asyncio.create_task(self._watch())
+        log.info("marketdata.workers_started", extra={"processes": len(self._workers)})
+
+    async def stop(self) -> None:
+        for task in (self._watcher, self._poller):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._watcher = self._poller = None
+        for worker in self._workers:
+            worker.terminate()
+        for worker in self._workers:
+            await asyncio.to_thread(worker.join, 5)
+        self._workers.clear()
+        if self._reader is not None:
+            self._queue.put(None)
+            await asyncio.to_thread(self._reader.join, 5)
+            self._reader = None
+
+    def _spawn(self, assignment: Sequence[Shard]) -> Any:
+        worker = self._ctx.Process(
+            target=_worker_main, args=(assignment, self._queue, self.store.depth, self._region), daemon=True
+        )
+        worker.start()
+        return worker
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL_SECONDS)
+            for idx, worker in enumerate(self._workers):
+                if not worker.is_alive():
+                    self._restart(idx)
+
+    def _restart(self, idx: int) -> None:
+        assignment = self._assignments[idx]
+        log.error(
+            "marketdata.worker_exited",
+            extra={"exitcode": self._workers[idx].exitcode, "shards": [shard for shard, _ in assignment]},
+        )
+        symbols = [symbol for _, shard_symbols in assignment for symbol in shard_symbols]
+        if isinstance(self.store, SharedOrderBookStore):
+            self.store.clear_slots(symbols)
+        else:
+            for symbol in symbols:
+                self.store.upsert(symbol, (), ())
+        for shard, _ in assignment:
+            self._stats[shard]["connected"] = False
+        self.restarts += 1
+        self._workers[idx] = self._spawn(assignment)
+
+    def queue_depth(self) -> int:
+        try:
+            return self._queue.qsize()
+        except NotImplementedError:  # macOS has no sem_getvalue
+            return 0
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [dict(snapshot) for _, snapshot in sorted(self._stats.items())]
+
+    def _drain(self, loop: asyncio.AbstractEventLoop) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < DRAIN_BATCH:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    loop.call_soon_threadsafe(self.apply, batch)
+                    return
+                batch.append(item)
+            loop.call_soon_threadsafe(self.apply, batch)
+
+    def apply(self, batch: Sequence[Tuple[Any, ...]]) -> None:
+        upsert = self.store.upsert
+        for item in batch:
+            if item[0] == "book":
+                upsert(item[1], item[2], item[3])
+            else:
+                self._stats[item[1]] = item[2]
@@ -1,45 +1,133 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-from typing import Sequence
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Sequence
 
 import websockets
 from websockets.exceptions import InvalidStatusCode
 
 from triarb.config import get_settings
+from triarb.metrics import METRICS, STARTUP, Tick
+from triarb.marketdata.decoder import DEPTH_CHANNEL, FrameDecoder, resolve_loads, stream_name, symbol_map
+from triarb.marketdata.local_book import BinanceRestSnapshotSource, DiffDepthManager, SnapshotSource
 from triarb.marketdata.orderbook import OrderBookStore
+from triarb.marketdata.recorder import FrameRecorder
+
+__all__ = ["BinanceWsClient", "ShardStats", "symbol_map"]
 
 log = logging.getLogger(__name__)
 
+DIFF_DEPTH_CHANNEL = "depth@100ms"
+RATE_INTERVAL_SECONDS = 5.0
+
+
+@dataclass
+class ShardStats:
+    """Health and throughput counters for one WebSocket connection.
+
+    ``msg_per_sec`` only moves when ``sample_rate`` runs, which a single owner (the aggregator
+    or the shard worker) does every ``RATE_INTERVAL_SECONDS``. ``snapshot`` never touches the
+    window, so any number of readers see the same rate.
+    """
+
+    shard: int
+    streams: int
+    messages: int = 0
+    reconnects: int = 0
+    connected: bool = False
+    last_message: float = 0.0
+    msg_per_sec: float = 0.0
+    _window_start: float = field(default_factory=time.monotonic, repr=False)
+    _window_messages: int = field(default=0, repr=False)
+
+    def sample_rate(self) -> float:
+        """Close the current rate window and start the next one."""
+        now = time.monotonic()
+        elapsed = max(now - self._window_start, 1e-9)
+        self.msg_per_sec = (self.messages - self._window_messages) / elapsed
+        self._window_start = now
+        self._window_messages = self.messages
+        return self.msg_per_sec
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "shard": self.shard,
+            "streams": self.streams,
+            "connected": self.connected,
+            "messages": self.messages,
+            "reconnects": self.reconnects,
+            "msg_per_sec": self.msg_per_sec,
+            # ``last_message`` is a receive timestamp (wall clock), like the latency stamps.
+            "idle_seconds": time.time() - self.last_message if self.last_message else None,
+        }
+
 
 class BinanceWsClient:
-    def __init__(self, symbols: Sequence[str], store: OrderBookStore):
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        store: OrderBookStore,
+        shard: int = 0,
+        snapshot_source: SnapshotSource | None = None,
+        recorder: FrameRecorder | None = None,
+        depth_stream: str | None = None,
+    ):
         self.symbols = symbols
         self.store = store
+        self.recorder = recorder
         self.settings = get_settings()
-        streams = "/".join([f"{symbol.lower().replace('/', '')}@depth5@100ms" for symbol in symbols])
+        self.stats = ShardStats(shard=shard, streams=len(symbols))
+        self.depth_manager: DiffDepthManager | None = None
+        self._owned_source: BinanceRestSnapshotSource | None = None
+        channel = DEPTH_CHANNEL
+        if (depth_stream or self.settings.depth_stream) == "diff":
+            channel = DIFF_DEPTH_CHANNEL
+            source = snapshot_source
+            if source is None:
+                source = self._owned_source = BinanceRestSnapshotSource(self.settings.binance_rest_url)
+            self.depth_manager = DiffDepthManager(
+                store,
+                source,
+                self.settings.top_levels,
+                self.settings.depth_snapshot_limit,
+                self.settings.depth_snapshot_concurrency,
+            )
+        streams = "/".join([stream_name(symbol, channel) for symbol in symbols])
+        self.decoder = FrameDecoder(
+            symbols, channel, loads=resolve_loads(self.settings.ws_json_parser), depth=store.depth
+        )
         self._uris = [f"{base}/stream?streams={streams}" for base in self.settings.binance_ws_urls]
         self._uri_index = 0
         self._task: asyncio.Task | None = None
 
     async def start(self) -> None:
         backoff = 1
+        stats = self.stats
+        clock = time.time_ns
         while True:
             try:
                 uri = self._current_uri
                 async with websockets.connect(uri, ping_interval=20, ping_timeout=20) as ws:
                     backoff = 1
+                    stats.connected = True
+                    STARTUP.mark("ws_connected")
+                    if self.depth_manager is not None:
+                        self.depth_manager.reset()
+                    handle = self.handle_message
+                    recorder = self.recorder
                     async for message in ws:
-                        data = json.loads(message)
-                        payload = data.get("data", {})
-                        symbol = payload.get("s")
-                        if not symbol:
-                            continue
-                        bids = [(float(p), float(q)) for p, q in payload.get("b", [])]
-                        asks = [(float(p), float(q)) for p, q in payload.get("a", [])]
-                        self.store.upsert(symbol_map(symbol), bids, asks)
+                        recv_ns = clock()
+                        stats.messages += 1
+                        stats.last_message = recv_ns / 1e9
+                        if recorder is not None:
+                            recorder.append(message, recv_ns)
+                        handle(message, recv_ns)
+            except asyncio.CancelledError:
+                stats.connected = False
+                raise
             except InvalidStatusCode as exc:
                 log.warning("WebSocket reconnect due to HTTP %s (%s)", exc.status_code, self._current_uri)
                 if exc.status_code == 451 and self._advance_uri():
@@ -47,9 +135,37 @@ class BinanceWsClient:
             except Exception as exc:  # noqa: BLE001
                 log.warning("WebSocket reconnect due to %s (%s)", exc, self._current_uri)
 
+            stats.connected = False
+            stats.reconnects += 1
             await asyncio.sleep(backoff)
             backoff = min(backoff * 2, 30)
 
+    async def close(self) -> None:
+        """Stop pending snapshot fetches and close the snapshot HTTP client this client opened."""
+        if self.depth_manager is not None:
+            self.depth_manager.reset()
+        if self._owned_source is not None:
+            await self._owned_source.close()
+            self._owned_source = None
+
+    def handle_message(self, message: str | bytes, recv_ns: int = 0) -> None:
+        """Decode one frame and apply it to the store (or the diff-depth manager).
+
+        With ``recv_ns`` set, a ``Tick`` is attached to the store update for latency tracking.
+        """
+        update = self.decoder.decode(message)
+        if update is None:
+            return
+        if recv_ns:
+            tick = Tick(update.event_time, recv_ns, time.time_ns())
+            METRICS.on_parsed(tick)
+            self.store.tick = tick
+        if self.depth_manager is not None:
+            self.depth_manager.on_update(update)
+            self.store.tick = None
+        else:
+            self.store.upsert(update.symbol, update.bids, update.asks)
+
     @property
     def _current_uri(self) -> str:
         return self._uris[self._uri_index]
@@ -60,12 +176,3 @@ class BinanceWsClient:
         self._uri_index = (self._uri_index + 1) % len(self._uris)
         return True
 
-
-def symbol_map(raw: str) -> str:
-    raw = raw.upper()
-    quotes = ["USDT", "BTC", "ETH", "BNB"]
-    for quote in quotes:
-        if raw.endswith(quote):
-            base = raw[: -len(quote)]
-            return f"{base}/{quote}"
-    return raw
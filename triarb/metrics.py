@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import logging
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from triarb import STARTED_NS
+
+log = logging.getLogger(__name__)
+
+STAGES = (
+    "exchange_to_receive",
+    "receive_to_parse",
+    "parse_to_store",
+    "store_to_signal",
+    "signal_to_submit",
+    "submit_to_ack",
+    "tick_to_trade",
+    "exchange_to_ack",
+    "submit_to_fill",
+    "fill_to_next_leg",
+    "enqueue_to_persist",
+    "redis_flush",
+    "gc_pause",
+)
+
+# Bucket upper bounds in nanoseconds: 1-2.5-5 steps from 1 µs to 10 s.
+BUCKETS_NS: Tuple[int, ...] = tuple(
+    int(base * 10**exp) for exp in range(3, 10) for base in (1, 2.5, 5)
+) + (10_000_000_000,)
+
+LabelledValues = Iterable[Tuple[Sequence[str], float]]
+
+
+class Tick:
+    """Per-update wall-clock stamps (ns since epoch) carried from the socket to the executor."""
+
+    __slots__ = ("exchange_ms", "recv_ns", "parse_ns", "store_ns", "signal_ns")
+
+    def __init__(self, exchange_ms: int, recv_ns: int, parse_ns: int):
+        self.exchange_ms = exchange_ms
+        self.recv_ns = recv_ns
+        self.parse_ns = parse_ns
+        self.store_ns = 0
+        self.signal_ns = 0
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram: one bisect and two additions per observation, no locking.
+
+    The engine records from a single event loop thread; scrapes only read the counters.
+    """
+
+    __slots__ = ("counts", "sum_ns", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_NS) + 1)
+        self.sum_ns = 0
+        self.count = 0
+
+    def observe_ns(self, value_ns: int) -> None:
+        if value_ns < 0:
+            value_ns = 0
+        self.counts[bisect_left(BUCKETS_NS, value_ns)] += 1
+        self.sum_ns += value_ns
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound (ns) of the bucket holding the ``q`` quantile; 0 when empty.
+
+        Quantiles past the last bucket report its bound, so results stay valid JSON.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        running = 0
+        for bound, count in zip(BUCKETS_NS, self.counts):
+            running += count
+            if running >= rank:
+                return float(bound)
+        return float(BUCKETS_NS[-1])
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        buckets: List[Tuple[str, int]] = []
+        running = 0
+        for bound, count in zip(BUCKETS_NS, self.counts):
+            running += count
+            buckets.append((repr(bound / 1e9), running))
+        buckets.append(("+Inf", self.count))
+        return buckets
+
+
+class EngineMetrics:
+    """Stage latency histograms, counters and scrape-time gauges exposed to Prometheus.
+
+    Implements the ``prometheus_client`` collector protocol, so nothing is formatted or
+    locked on the hot path; gauges and external counters are pulled when scraped.
+    """
+
+    def __init__(self, namespace: str = "triarb"):
+        self.namespace = namespace
+        self.stages: Dict[str, LatencyHistogram] = {stage: LatencyHistogram() for stage in STAGES}
+        self.counters: Dict[str, int] = {}
+        self._gauges: Dict[str, Tuple[str, Sequence[str], Callable[[], LabelledValues]]] = {}
+        self._counter_sources: Dict[str, Tuple[str, Sequence[str], Callable[[], LabelledValues]]] = {}
+
+    def observe(self, stage: str, start_ns: int, end_ns: int) -> None:
+        if start_ns:
+            self.stages[stage].observe_ns(end_ns - start_ns)
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name: str, documentation: str, fn: Callable[[], float]) -> None:
+        self._gauges[name] = (documentation, (), lambda: [((), fn())])
+
+    def labelled_gauge(
+        self, name: str, documentation: str, labels: Sequence[str], fn: Callable[[], LabelledValues]
+    ) -> None:
+        self._gauges[name] = (documentation, labels, fn)
+
+    def counter_source(
+        self, name: str, documentation: str, labels: Sequence[str], fn: Callable[[], LabelledValues]
+    ) -> None:
+        """Expose a counter maintained elsewhere (e.g. ``ShardStats.messages``) at scrape time."""
+        self._counter_sources[name] = (documentation, labels, fn)
+
+    def on_parsed(self, tick: Tick) -> None:
+        if tick.exchange_ms:
+            self.stages["exchange_to_receive"].observe_ns(tick.recv_ns - tick.exchange_ms * 1_000_000)
+        self.stages["receive_to_parse"].observe_ns(tick.parse_ns - tick.recv_ns)
+
+    def on_submitted(self, tick: Tick | None, submit_ns: int) -> None:
+        self.inc("orders_submitted")
+        if tick is not None:
+            self.observe("signal_to_submit", tick.signal_ns, submit_ns)
+            self.observe("tick_to_trade", tick.recv_ns, submit_ns)
+
+    def on_acknowledged(self, tick: Tick | None, submit_ns: int, ack_ns: int) -> None:
+        self.inc("orders_acknowledged")
+        self.stages["submit_to_ack"].observe_ns(ack_ns - submit_ns)
+        if tick is not None and tick.exchange_ms:
+            self.stages["exchange_to_ack"].observe_ns(ack_ns - tick.exchange_ms * 1_000_000)
+
+    def collect(self) -> Iterator:
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+
+        ns = self.namespace
+        family = HistogramMetricFamily(
+            f"{ns}_stage_latency_seconds", "Latency between tick-to-trade pipeline stages.", labels=["stage"]
+        )
+        for stage, hist in self.stages.items():
+            family.add_metric([stage], hist.cumulative(), hist.sum_ns / 1e9)
+        yield family
+
+        for name, value in sorted(self.counters.items()):
+            counter = CounterMetricFamily(f"{ns}_{name}", f"Total {name.replace('_', ' ')}.")
+            counter.add_metric([], value)
+            yield counter
+
+        for name, (doc, labels, fn) in self._counter_sources.items():
+            counter = CounterMetricFamily(f"{ns}_{name}", doc, labels=list(labels))
+            for label_values, value in fn():
+                counter.add_metric(list(label_values), value)
+            yield counter
+
+        for name, (doc, labels, fn) in self._gauges.items():
+            gauge = GaugeMetricFamily(f"{ns}_{name}", doc, labels=list(labels))
+            for label_values, value in fn():
+                gauge.add_metric(list(label_values), value)
+            yield gauge
+
+
+class StartupReport:
+    """Milliseconds from package import to each startup milestone; the first mark of a phase wins."""
+
+    def __init__(self, origin_ns: int):
+        self.origin_ns = origin_ns
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        if phase not in self.phases:
+            self.phases[phase] = (time.perf_counter_ns() - self.origin_ns) / 1e6
+
+    def values(self) -> LabelledValues:
+        return [((phase,), elapsed / 1e3) for phase, elapsed in self.phases.items()]
+
+
+METRICS = EngineMetrics()
+STARTUP = StartupReport(STARTED_NS)
+
+
+def start_metrics_server(port: int) -> None:
+    from prometheus_client import REGISTRY, start_http_server
+
+    REGISTRY.register(METRICS)
+    start_http_server(port)
+    log.info("metrics.start", extra={"port": port})
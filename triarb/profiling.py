@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from types import FrameType
+from typing import Any, Callable, Dict, Generator, List, Tuple
+
+MAX_DEPTH = 128
+
+
+def frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}"
+
+
+def collapse_stack(frame: FrameType | None) -> str:
+    """Root-first ``module:function`` names joined by ``;``, as flame graph tools expect."""
+    names: List[str] = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        names.append(frame_label(frame))
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+class StackSampler:
+    """Samples one thread's Python stack every ``interval_ms`` from a helper thread.
+
+    Nothing is installed in the sampled thread: each sample reads
+    ``sys._current_frames()`` while holding the GIL for a few microseconds, so the
+    overhead is proportional to the sampling rate, not to the work being profiled. While the
+    thread holds the GIL, samples come at most every ``sys.getswitchinterval()`` (5 ms). Time the
+    event loop spends waiting for I/O shows up as stacks ending in the loop's ``select``
+    (or in ``Runner.run`` on uvloop, whose loop has no Python frames).
+    """
+
+    def __init__(self, thread_id: int, interval_ms: float = 5):
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+
+    def run(self, seconds: float) -> Counter[str]:
+        """Sample for ``seconds`` (blocking; run it off the sampled thread)."""
+        thread_id, stacks, interval = self.thread_id, self.stacks, self.interval
+        deadline = time.monotonic() + seconds
+        next_sample = time.monotonic()
+        while next_sample < deadline:
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                break
+            stacks[collapse_stack(frame)] += 1
+            self.samples += 1
+            del frame
+            # Waiting on the GIL delays samples; skip the missed slots rather than firing a
+            # burst of catch-up samples at whatever runs next.
+            next_sample = max(next_sample + interval, time.monotonic())
+            time.sleep(max(0.0, next_sample - time.monotonic()))
+        return stacks
+
+    def collapsed(self) -> str:
+        """``stack count`` lines for ``flamegraph.pl``, speedscope or inferno."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+@dataclass
+class SectionTiming:
+    calls: int = 0
+    wall_ns: int = 0
+    cpu_ns: int = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        calls = self.calls or 1
+        return {
+            "calls": self.calls,
+            "wall_ms": self.wall_ns / 1e6,
+            "cpu_ms": self.cpu_ns / 1e6,
+            "wall_us_per_call": self.wall_ns / calls / 1e3,
+            "cpu_us_per_call": self.cpu_ns / calls / 1e3,
+        }
+
+
+class SectionTimers:
+    """Wall and CPU time of chosen engine methods, patched in only while profiling.
+
+    ``add(label, owner, attribute)`` names a bound method to time; ``install`` shadows it
+    with a timing wrapper on the instance and ``remove`` deletes the shadow, so outside a
+    profiling window the engine runs its own methods untouched. Coroutine methods are
+    timed per step: wall time covers the whole await, CPU time only the steps the
+    coroutine itself ran on the loop thread.
+    """
+
+    def __init__(self):
+        self.targets: List[Tuple[str, Any, str]] = []
+        self.timings: Dict[str, SectionTiming] = {}
+        self._installed: List[Tuple[Any, str]] = []
+
+    def add(self, label: str, owner: Any, attribute: str) -> None:
+        self.targets.append((label, owner, attribute))
+
+    def install(self) -> None:
+        self.timings = {label: SectionTiming() for label, _, _ in self.targets}
+        for label, owner, attribute in self.targets:
+            method = getattr(owner, attribute)
+            timing = self.timings[label]
+            if inspect.iscoroutinefunction(method):
+                wrapper = _timed_coroutine_function(method, timing)
+            else:
+                wrapper = _timed_function(method, timing)
+            setattr(owner, attribute, wrapper)
+            self._installed.append((owner, attribute))
+
+    def remove(self) -> None:
+        for owner, attribute in self._installed:
+            try:
+                delattr(owner, attribute)
+            except AttributeError:
+                pass
+        self._installed.clear()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {label: timing.as_dict() for label, timing in self.timings.items()}
+
+
+def _timed_function(fn: Callable[..., Any], timing: SectionTiming) -> Callable[..., Any]:
+    perf, cpu = time.perf_counter_ns, time.thread_time_ns
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        wall_start, cpu_start = perf(), cpu()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timing.cpu_ns += cpu() - cpu_start
+            timing.wall_ns += perf() - wall_start
+            timing.calls += 1
+
+    return wrapper
+
+
+def _timed_coroutine_function(fn: Callable[..., Any], timing: SectionTiming) -> Callable[..., Any]:
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        wall_start = time.perf_counter_ns()
+        try:
+            return await _CpuTimed(fn(*args, **kwargs), timing)
+        finally:
+            timing.wall_ns += time.perf_counter_ns() - wall_start
+            timing.calls += 1
+
+    return wrapper
+
+
+class _CpuTimed:
+    """Awaitable that drives ``coro`` step by step and adds the CPU time of each step."""
+
+    def __init__(self, coro: Any, timing: SectionTiming):
+        self.coro = coro
+        self.timing = timing
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        steps = self.coro.__await__()
+        cpu, timing = time.thread_time_ns, self.timing
+        send: Any = None
+        error: BaseException | None = None
+        while True:
+            start = cpu()
+            try:
+                yielded = steps.throw(error) if error is not None else steps.send(send)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                timing.cpu_ns += cpu() - start
+            try:
+                send, error = (yield yielded), None
+            except BaseException as exc:  # noqa: BLE001 - forwarded into the coroutine
+                send, error = None, exc
+
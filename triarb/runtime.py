@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import logging
+import os
+import time
+from typing import Any, Callable, Coroutine, List, Set
+
+from triarb.metrics import METRICS, LabelledValues
+
+log = logging.getLogger(__name__)
+
+# Young collections stay automatic but run ~15x less often than the default (700); they
+# only walk objects allocated since the last one. Full collections are deferred to idle
+# gaps by ``IdleCollector`` (a threshold this high never trips on its own).
+GEN0_THRESHOLD = 10_000
+GEN1_THRESHOLD = 20
+GEN2_THRESHOLD = 1_000_000
+
+
+def run_engine(main: Coroutine[Any, Any, None], profile: str = "off") -> None:
+    """``asyncio.run(main)`` on uvloop when ``profile`` is ``latency`` and uvloop is installed."""
+    loop_factory = new_event_loop_factory(profile)
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main)
+
+
+def new_event_loop_factory(profile: str) -> Callable[[], asyncio.AbstractEventLoop] | None:
+    if profile != "latency":
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        return None  # reported by ``apply_profile``, once logging is configured
+    return uvloop.new_event_loop
+
+
+def loop_name() -> str:
+    return type(asyncio.get_running_loop()).__module__.split(".")[0]
+
+
+def parse_cpu_list(spec: str) -> Set[int]:
+    """``"2,3"`` or ``"2-5,8"`` to a set of core ids; empty means no pinning."""
+    cores: Set[int] = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cores.update(range(int(lo), int(hi) + 1))
+        else:
+            cores.add(int(part))
+    return cores
+
+
+def pin_cpus(cores: Set[int]) -> bool:
+    if not cores:
+        return False
+    setter = getattr(os, "sched_setaffinity", None)
+    if setter is None:
+        log.warning("runtime.affinity_unsupported", extra={"cores": sorted(cores)})
+        return False
+    try:
+        setter(0, cores)
+    except OSError as exc:
+        log.warning("runtime.affinity_failed", extra={"cores": sorted(cores), "error": str(exc)})
+        return False
+    return True
+
+
+def freeze_startup_objects() -> int:
+    """Collect once, then move every surviving object out of the collector's reach.
+
+    Settings, the market registry, triangle plans and imported modules live for the whole
+    run; after ``gc.freeze()`` no collection traverses them again.
+    """
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def track_gc_pauses() -> None:
+    """Record every collection's duration as the ``gc_pause`` stage."""
+    if _on_gc not in gc.callbacks:
+        gc.callbacks.append(_on_gc)
+
+
+_gc_started_ns = 0
+
+
+def _on_gc(phase: str, info: dict) -> None:
+    global _gc_started_ns
+    if phase == "start":
+        _gc_started_ns = time.perf_counter_ns()
+    else:
+        METRICS.observe("gc_pause", _gc_started_ns, time.perf_counter_ns())
+
+
+class IdleCollector:
+    """Runs the full (generation 2) collection in gaps between bursts of work.
+
+    Automatic full collections are pushed out of reach (``GEN2_THRESHOLD``); every
+    ``interval_ms`` the collector reads ``activity`` (any counter that moves while the engine
+    is working) and, when it has not moved since the previous check and nothing is ``busy``,
+    runs the pending full collection. If no gap shows up within ``max_defer_s`` the
+    collection runs anyway so memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        activity: Callable[[], int],
+        busy: Callable[[], bool] = lambda: False,
+        interval_ms: float = 5,
+        max_defer_s: float = 60,
+    ):
+        self.activity = activity
+        self.busy = busy
+        self.interval = interval_ms / 1000
+        self.max_defer = max_defer_s
+        self.idle_collections = 0
+        self.forced_collections = 0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            gc.set_threshold(GEN0_THRESHOLD, GEN1_THRESHOLD, GEN2_THRESHOLD)
+            self._task = asyncio.create_task(self.run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def counts(self) -> LabelledValues:
+        return [(("idle",), self.idle_collections), (("forced",), self.forced_collections)]
+
+    async def run(self) -> None:
+        last_activity = self.activity()
+        last_full = time.monotonic()
+        while True:
+            await asyncio.sleep(self.interval)
+            current = self.activity()
+            quiet = current == last_activity and not self.busy()
+            last_activity = current
+            # A generation-1 collection since the last full one means gen-2 work is pending.
+            if not gc.get_count()[2]:
+                last_full = time.monotonic()
+                continue
+            overdue = time.monotonic() - last_full >= self.max_defer
+            if quiet or overdue:
+                gc.collect(2)
+                last_full = time.monotonic()
+                if quiet:
+                    self.idle_collections += 1
+                else:
+                    self.forced_collections += 1
+
+
+def apply_profile(profile: str, cpu_affinity: str = "") -> List[str]:
+    """Process-wide parts of the ``latency`` profile, applied once startup objects exist.
+
+    Returns what was applied, for the ``engine.start`` log line.
+    """
+    applied: List[str] = [f"loop={loop_name()}"]
+    if profile != "latency":
+        return applied
+    if applied[0] != "loop=uvloop":
+        log.warning("runtime.uvloop_unavailable", extra={"hint": "pip install 'triarb[speedups]'"})
+    cores = parse_cpu_list(cpu_affinity)
+    if pin_cpus(cores):
+        applied.append(f"cpus={','.join(str(core) for core in sorted(cores))}")
+    applied.append(f"frozen={freeze_startup_objects()}")
+    return applied
+
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Generic, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class RingBuffer(Generic[T]):
+    """Fixed-capacity log written by the trading loop; the oldest entries are overwritten.
+
+    ``append`` stores a reference in a preallocated slot and never waits. Readers take the
+    newest entries (``latest``) or everything after a sequence cursor (``since``), and can
+    ``wait`` for the next append without polling.
+    """
+
+    __slots__ = ("capacity", "seq", "_items", "_event", "_waiters")
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.seq = 0  # entries appended so far; the next entry gets this number
+        self._items: List[T | None] = [None] * self.capacity
+        self._event: asyncio.Event | None = None
+        self._waiters = 0
+
+    def __len__(self) -> int:
+        return min(self.seq, self.capacity)
+
+    def append(self, item: T) -> None:
+        self._items[self.seq % self.capacity] = item
+        self.seq += 1
+        if self._waiters:
+            self._event.set()  # type: ignore[union-attr]
+
+    def latest(self, n: int | None = None) -> List[T]:
+        """Up to ``n`` newest entries, newest first."""
+        count = len(self) if n is None else max(0, min(n, len(self)))
+        items, capacity, seq = self._items, self.capacity, self.seq
+        return [items[(seq - 1 - idx) % capacity] for idx in range(count)]  # type: ignore[misc]
+
+    def since(self, cursor: int) -> Tuple[int, List[T]]:
+        """Entries appended after ``cursor`` (oldest first) and the new cursor.
+
+        Entries already overwritten are skipped, so a slow reader loses the oldest ones.
+        """
+        seq = self.seq
+        start = max(cursor, seq - self.capacity)
+        items, capacity = self._items, self.capacity
+        return seq, [items[idx % capacity] for idx in range(start, seq)]  # type: ignore[misc]
+
+    async def wait(self, cursor: int) -> None:
+        """Return once an entry has been appended after ``cursor``."""
+        if self._event is None:
+            self._event = asyncio.Event()
+        self._waiters += 1
+        try:
+            while self.seq <= cursor:
+                self._event.clear()
+                await self._event.wait()
+        finally:
+            self._waiters -= 1